@@ -1,15 +1,55 @@
 import streamlit as st
-import sys
 import os
 from datetime import datetime, timedelta
 import pandas as pd
 from streamlit_option_menu import option_menu
 
-# Import config and placeholder data
-from config import DEMO_STUDENTS, DEMO_PROFESSORS, DEMO_COURSES
+# Import config and the course catalog
+from config import (
+    ADMIN_MODE,
+    CALENDAR_SERVER_ENABLED,
+    CHECKIN_CLOSE_AFTER_MINUTES,
+    CHECKIN_OPEN_BEFORE_MINUTES,
+    CHECKIN_RADIUS_METERS,
+    CHECKIN_SERVER_ENABLED,
+    CHECKIN_TOKEN_PERIOD,
+    QR_FORMAT,
+)
+from components.catalog import get_catalog
+
+# Import attendance store
+from components.attendance import (
+    get_course_attendance,
+    get_course_attendance_summary,
+    get_student_attendance,
+    get_student_attendance_summary,
+    record_attendance_bulk,
+)
+from components.attendance_matrix import AT_RISK_STREAK, AT_RISK_THRESHOLD, get_at_risk_students
+from components.calendar_feed import feed_url, get_calendar_feed
+from components.checkin import ACCEPTED, DUPLICATE, get_checkin_ingestor
+from components.checkin_queue import get_checkin_queue
+from components.conflicts import get_conflict_engine
+from components.geolocation import classroom_for_course, format_location
+from components.schedule import DAY_NAMES, format_meeting_days, format_meeting_time, format_minutes, get_schedule_index
+from components.sessions import get_upcoming_sessions, remaining_sessions, term_sessions
+from components.notifications import (
+    get_notification_preferences,
+    get_unread_count,
+    get_user_notifications,
+    mark_notifications_read,
+    send_notifications,
+    set_notification_preferences,
+    start_reminder_scheduler,
+)
 
-# Import chatbot component
-from components.chatbot import answer_policy_question, setup_chatbot
+# Email delivery
+from utils.email_sender import department_email, send_email, send_emails, student_email
+
+# Rerun profiling
+from utils.profiling import profiled_rerun, set_rerun_label, show_profiler_panel, span, timed
+from utils.qr_codes import get_checkin_qr
+from utils.time_utils import academic_calendar, current_term, get_time_until, get_times_until
 
 # Configure page
 st.set_page_config(
@@ -23,6 +63,7 @@ st.set_page_config(
 )
 
 # Load custom CSS
+@timed()
 def load_css():
     css_path = os.path.join('static', 'css', 'style.css')
     if os.path.exists(css_path):
@@ -70,6 +111,7 @@ def load_css():
         with open(css_path, 'r') as f:
             st.markdown(f'<style>{f.read()}</style>', unsafe_allow_html=True)
 
+@profiled_rerun
 def main():
     # Initialize session state for demo
     if 'role' not in st.session_state:
@@ -82,6 +124,16 @@ def main():
     if 'chat_history' not in st.session_state:
         st.session_state.chat_history = []
     
+    # Check-in endpoint for QR scans (started once per process)
+    if CHECKIN_SERVER_ENABLED:
+        from components.checkin_server import start_checkin_server
+        start_checkin_server()
+    
+    # Calendar feed endpoint for .ics subscriptions (started once per process)
+    if CALENDAR_SERVER_ENABLED:
+        from components.calendar_server import start_calendar_server
+        start_calendar_server()
+    
     # Apply global styling for text inputs and dark theme
     st.markdown("""
     <style>
@@ -170,6 +222,8 @@ def main():
     except Exception as e:
         st.error(f"Error loading CSS: {e}")
     
+    catalog = get_catalog()
+    
     # Sidebar for role selection
     with st.sidebar:
         st.title("ClassTracker Demo")
@@ -181,32 +235,44 @@ def main():
         
         if selected_role == "Student":
             st.session_state.role = "student"
-            student_options = [f"{student['name']} ({student['student_id']})" for student in DEMO_STUDENTS]
-            selected_student = st.selectbox("Select Student", student_options)
-            student_idx = student_options.index(selected_student)
-            st.session_state.user_id = DEMO_STUDENTS[student_idx]['id']
-            st.session_state.user_name = DEMO_STUDENTS[student_idx]['name']
-            st.session_state.user_details = DEMO_STUDENTS[student_idx]
+            student = st.selectbox(
+                "Select Student",
+                catalog.students,
+                format_func=lambda s: f"{s['name']} ({s['student_id']})"
+            )
+            st.session_state.user_id = student['id']
+            st.session_state.user_name = student['name']
+            st.session_state.user_details = student
         
         elif selected_role == "Professor":
             st.session_state.role = "professor"
-            professor_options = [f"{professor['name']} ({professor['department']})" for professor in DEMO_PROFESSORS]
-            selected_professor = st.selectbox("Select Professor", professor_options)
-            professor_idx = professor_options.index(selected_professor)
-            st.session_state.user_id = DEMO_PROFESSORS[professor_idx]['id']
-            st.session_state.user_name = DEMO_PROFESSORS[professor_idx]['name']
-            st.session_state.user_details = DEMO_PROFESSORS[professor_idx]
+            professor = st.selectbox(
+                "Select Professor",
+                catalog.professors,
+                format_func=lambda p: f"{p['name']} ({p['department']})"
+            )
+            st.session_state.user_id = professor['id']
+            st.session_state.user_name = professor['name']
+            st.session_state.user_details = professor
         
         else:
             st.session_state.role = None
             st.session_state.user_id = None
+        
+        # Rerun timings for administrators
+        if ADMIN_MODE:
+            show_profiler_panel()
+            show_checkin_queue_panel()
     
     # Main content area
     if st.session_state.role is None:
         show_welcome_screen()
     else:
+        # Class reminders (started once per process, on the first signed-in page rather than the welcome screen)
+        start_reminder_scheduler()
         show_navigation()
 
+@timed()
 def show_welcome_screen():
     """Display welcome screen with app info"""
     st.title("Welcome to ClassTracker")
@@ -259,6 +325,21 @@ def show_welcome_screen():
         - Institution-wide analytics
         """)
 
+@timed()
+def show_checkin_queue_panel():
+    """Display check-in queue depth and commit latency (admin only)"""
+    metrics = get_checkin_queue().metrics()
+    with st.expander("Check-in queue (admin)"):
+        col1, col2 = st.columns(2)
+        col1.metric("Queue depth", f"{metrics['depth']} / {metrics['capacity']}")
+        col2.metric("Max depth", metrics['max_depth'])
+        col1.metric("Committed", metrics['committed'])
+        col2.metric("Pushed back", metrics['rejected'])
+        col1.metric("p50 commit", f"{metrics['p50_commit_ms']:.1f} ms")
+        col2.metric("p99 commit", f"{metrics['p99_commit_ms']:.1f} ms")
+
+
+@timed()
 def show_navigation():
     """Show navigation menu and handle page routing"""
     # User info display
@@ -280,6 +361,8 @@ def show_navigation():
         }
     )
     
+    set_rerun_label(f"{st.session_state.role}/{selected}")
+    
     # Display different content based on selection
     if selected == "Dashboard":
         if st.session_state.role == "student":
@@ -302,10 +385,14 @@ def show_navigation():
     elif selected == "Settings":
         show_settings()
 
+@timed()
 def show_student_dashboard():
     """Display the student dashboard"""
     st.title("Student Dashboard")
     
+    catalog = get_catalog()
+    student_courses = catalog.courses_for_student(st.session_state.user_id)
+    
     # Create layout
     col1, col2 = st.columns([7, 3])
     
@@ -313,26 +400,24 @@ def show_student_dashboard():
         # Upcoming classes
         st.subheader("Today's Classes")
         
-        # Generate dummy class data for today
+        # The rest of today's sessions, from the student's sorted upcoming sessions
         now = datetime.now()
+        upcoming = get_upcoming_sessions("student", st.session_state.user_id)
         today_classes = []
         
-        for course_id in st.session_state.user_details['courses']:
-            course = next((c for c in DEMO_COURSES if c['id'] == course_id), None)
-            if course:
-                start_time = now.replace(hour=9 + course_id*2, minute=0)
-                end_time = now.replace(hour=10 + course_id*2, minute=30)
-                
-                # Only show classes that haven't ended yet
-                if end_time > now:
-                    today_classes.append({
-                        "course_code": course['code'],
-                        "title": course['title'],
-                        "start_time": start_time,
-                        "end_time": end_time,
-                        "location": f"Building {course_id}, Room {101 + course_id*10}",
-                        "status": "Upcoming" if start_time > now else "In Progress"
-                    })
+        remaining = upcoming.remaining_today(now)
+        countdowns = get_times_until([m['start_time'] for m in remaining], now)
+        for meeting, countdown in zip(remaining, countdowns):
+            course = meeting['course']
+            today_classes.append({
+                "course_id": course['id'],
+                "course_code": course['code'],
+                "title": course['title'],
+                "start_time": meeting['start_time'],
+                "end_time": meeting['end_time'],
+                "location": format_location(course),
+                "status": "In Progress" if meeting['in_progress'] else f"Upcoming (in {countdown})"
+            })
         
         if today_classes:
             for cls in today_classes:
@@ -352,39 +437,40 @@ def show_student_dashboard():
                 """, unsafe_allow_html=True)
                 
                 # Add check-in button outside HTML using Streamlit's native button
-                st.button("Check-in", key=f"checkin_{cls['course_code']}")
+                if st.button("Check-in", key=f"checkin_{cls['course_code']}"):
+                    outcome, message = get_checkin_ingestor().check_in(
+                        st.session_state.user_id, cls['course_id'], wait=1.0
+                    )
+                    if outcome == ACCEPTED:
+                        st.success(message)
+                    elif outcome == DUPLICATE:
+                        st.info(message)
+                    else:
+                        st.warning(message)
         else:
             st.info("No more classes scheduled for today.")
+            next_class = upcoming.next_class(now)
+            if next_class:
+                st.caption(f"Next class: {next_class['course']['code']} on "
+                           f"{next_class['start_time']:%A at %I:%M %p} (in {get_time_until(next_class['start_time'])})")
         
         # Attendance overview
         st.subheader("Attendance Overview")
         
-        # Generate dummy attendance data
-        attendance_data = []
-        
-        for course_id in st.session_state.user_details['courses']:
-            course = next((c for c in DEMO_COURSES if c['id'] == course_id), None)
-            if course:
-                # Random attendance data for demo
-                import random
-                total_classes = 15
-                attended = random.randint(int(total_classes * 0.7), total_classes)
-                absences = total_classes - attended
-                attendance_rate = (attended / total_classes) * 100
-                
-                attendance_data.append({
-                    "Course": course['code'],
-                    "Course Name": course['title'],
-                    "Attended": attended,
-                    "Absences": absences,
-                    "Total Classes": total_classes,
-                    "Attendance Rate": attendance_rate,
-                    "Max Absences": course['max_absences']
-                })
-        
-        # Create a DataFrame and display
-        import pandas as pd
-        df = pd.DataFrame(attendance_data)
+        # Per-course counts come pre-aggregated from the attendance store
+        summary = get_student_attendance_summary(st.session_state.user_id).set_index('course_id')
+        counts = summary.reindex([c['id'] for c in student_courses], fill_value=0)
+        
+        with span("dataframe:attendance_overview"):
+            df = pd.DataFrame({
+                "Course": [c['code'] for c in student_courses],
+                "Course Name": [c['title'] for c in student_courses],
+                "Attended": (counts['Total'] - counts['Absent']).to_numpy(),
+                "Absences": counts['Absent'].to_numpy(),
+                "Total Classes": counts['Total'].to_numpy(),
+                "Attendance Rate": counts['Attendance Rate'].to_numpy(),
+                "Max Absences": [c['max_absences'] for c in student_courses]
+            })
         
         # Custom styles based on absence warning with black text
         def highlight_absences(row):
@@ -393,100 +479,92 @@ def show_student_dashboard():
             
             if absences >= max_absences:
                 return ['background-color: #FFCCCB; color: black'] * len(row)
-            elif absences >= max_absences * 0.75:
+            elif absences >= max_absences * AT_RISK_THRESHOLD:
                 return ['background-color: #FFFFCC; color: black'] * len(row)
             return ['color: black'] * len(row)
         
-        # Apply styling and display
-        styled_df = df.style.apply(highlight_absences, axis=1)
-        
         # Add a class to the container for specific styling
         st.markdown('<div class="attendance-overview-table">', unsafe_allow_html=True)
         
-        st.dataframe(
-            styled_df,
-            column_config={
-                "Course": st.column_config.TextColumn("Course Code"),
-                "Course Name": st.column_config.TextColumn("Course Name"),
-                "Attended": st.column_config.NumberColumn("Classes Attended"),
-                "Absences": st.column_config.NumberColumn("Absences"),
-                "Total Classes": st.column_config.NumberColumn("Total Classes"),
-                "Attendance Rate": st.column_config.ProgressColumn(
-                    "Attendance Rate", 
-                    format="%.1f%%",
-                    min_value=0,
-                    max_value=100
-                ),
-                "Max Absences": st.column_config.NumberColumn("Max Allowed")
-            },
-            hide_index=True,
-            use_container_width=True
-        )
+        # Apply styling and display
+        with span("styler:attendance_overview"):
+            styled_df = df.style.apply(highlight_absences, axis=1)
+            st.dataframe(
+                styled_df,
+                column_config={
+                    "Course": st.column_config.TextColumn("Course Code"),
+                    "Course Name": st.column_config.TextColumn("Course Name"),
+                    "Attended": st.column_config.NumberColumn("Classes Attended"),
+                    "Absences": st.column_config.NumberColumn("Absences"),
+                    "Total Classes": st.column_config.NumberColumn("Total Classes"),
+                    "Attendance Rate": st.column_config.ProgressColumn(
+                        "Attendance Rate", 
+                        format="%.1f%%",
+                        min_value=0,
+                        max_value=100
+                    ),
+                    "Max Absences": st.column_config.NumberColumn("Max Allowed")
+                },
+                hide_index=True,
+                use_container_width=True
+            )
         
         # Close the container div
         st.markdown('</div>', unsafe_allow_html=True)
         
         # Show warning if approaching absence limit
-        for idx, row in df.iterrows():
-            if row['Absences'] >= row['Max Absences'] * 0.75:
-                warn_class = "warning-threshold" if row['Absences'] >= row['Max Absences'] else ""
-                st.markdown(f"""
-                <div class="notification-item">
-                    <p class="{warn_class}">Warning: You have {row['Absences']} absences in {row['Course']} ({row['Course Name']}). 
-                    Maximum allowed: {row['Max Absences']}.</p>
-                </div>
-                """, unsafe_allow_html=True)
+        at_risk = get_at_risk_students([c['id'] for c in student_courses], student_id=st.session_state.user_id)
+        for row in at_risk.itertuples():
+            course = catalog.get_course(row.course_id)
+            warn_class = "warning-threshold" if row.absences >= row.max_absences else ""
+            if row.absences >= row.max_absences * AT_RISK_THRESHOLD:
+                text = (f"Warning: You have {row.absences} absences in {course['code']} ({course['title']}). "
+                        f"Maximum allowed: {row.max_absences}.")
+            else:
+                # Flagged only by the missed-streak rule
+                text = (f"Warning: You missed the last {AT_RISK_STREAK} sessions of {course['code']} "
+                        f"({course['title']}). Absences so far: {row.absences} of {row.max_absences} allowed.")
+            st.markdown(f"""
+            <div class="notification-item">
+                <p class="{warn_class}">{text}</p>
+            </div>
+            """, unsafe_allow_html=True)
     
     with col2:
-        # Notifications section
-        st.subheader("Notifications")
-        
-        # Generate dummy notifications
-        now = datetime.now()
-        notifications = [
-            {
-                "id": 1,
-                "title": "Class Reminder",
-                "message": f"Your {DEMO_COURSES[0]['code']} class starts in 30 minutes.",
-                "time": now - timedelta(minutes=30),
-                "read": False
-            },
-            {
-                "id": 2,
-                "title": "Attendance Warning",
-                "message": f"You have missed 2 classes in {DEMO_COURSES[1]['code']}. Maximum allowed: 4.",
-                "time": now - timedelta(days=1),
-                "read": True
-            },
-            {
-                "id": 3,
-                "title": "Professor Announcement",
-                "message": f"Tomorrow's {DEMO_COURSES[2]['code']} class will be held online.",
-                "time": now - timedelta(days=2),
-                "read": False
-            }
-        ]
-        
-        # Display notifications
-        for notification in notifications:
-            read_status = "" if notification['read'] else "🔵 "
-            time_str = notification['time'].strftime("%m/%d %I:%M %p")
-            
-            with st.container():
-                st.markdown(f"""
+        # Notifications section: first page of the inbox only
+        unread = get_unread_count(st.session_state.user_id, role=st.session_state.role)
+        st.subheader(f"Notifications ({unread} unread)" if unread else "Notifications")
+        
+        notifications, _ = get_user_notifications(st.session_state.user_id, role=st.session_state.role)
+        if notifications:
+            # Display notifications as one block
+            items = []
+            for notification in notifications:
+                read_status = "" if notification['read'] else "🔵 "
+                repeats = f" (×{notification['repeats'] + 1})" if notification['repeats'] else ""
+                time_str = notification['time'].strftime("%m/%d %I:%M %p")
+                items.append(f"""
                 <div class="notification-item" style="opacity: {'0.7' if notification['read'] else '1.0'}">
-                    <h4>{read_status}{notification['title']}</h4>
+                    <h4>{read_status}{notification['title']}{repeats}</h4>
                     <p>{notification['message']}</p>
                     <small>{time_str}</small>
                 </div>
-                """, unsafe_allow_html=True)
+                """)
+            st.markdown("".join(items), unsafe_allow_html=True)
+            
+            if unread and st.button("Mark all as read", key="mark_notifications_read"):
+                mark_notifications_read(st.session_state.user_id, role=st.session_state.role)
+                st.rerun()
+        else:
+            st.info("No notifications yet.")
         
         # Quick access to AI assistant
         st.subheader("Ask About Attendance Policy")
         policy_question = st.text_input("Type your question here...")
         if st.button("Ask"):
             if policy_question:
-                # Use the RAG-based policy assistant
+                # Use the RAG-based policy assistant (loaded on first question)
+                from components.chatbot import answer_policy_question
                 with st.spinner("Analyzing attendance policy..."):
                     response = answer_policy_question(policy_question)
                     
@@ -503,16 +581,14 @@ def show_student_dashboard():
                 # Show the response
                 st.success("Question answered! See full conversation in the AI Assistant tab.")
 
+@timed()
 def show_professor_dashboard():
     """Display the professor dashboard"""
     st.title("Professor Dashboard")
     
     # Get courses taught by this professor
-    professor_courses = []
-    for course_id in st.session_state.user_details['courses']:
-        course = next((c for c in DEMO_COURSES if c['id'] == course_id), None)
-        if course:
-            professor_courses.append(course)
+    catalog = get_catalog()
+    professor_courses = catalog.courses_for_professor(st.session_state.user_id)
     
     # Create layout
     col1, col2 = st.columns([7, 3])
@@ -531,18 +607,23 @@ def show_professor_dashboard():
             # Today's class
             st.subheader("Today's Class")
             
-            # Generate dummy class data
+            # Next session of this course, from the professor's sorted upcoming sessions
             now = datetime.now()
-            start_time = now.replace(hour=9 + course_id*2, minute=0)
-            end_time = now.replace(hour=10 + course_id*2, minute=30)
+            next_session = get_upcoming_sessions("professor", st.session_state.user_id).next_class(now, course_id)
+            if next_session:
+                next_text = (f"{next_session['start_time']:%a %m/%d %I:%M %p} "
+                             f"(in {get_time_until(next_session['start_time'])})")
+            else:
+                next_text = "None scheduled"
             
             # Display the card without buttons
             st.markdown(f"""
             <div class="attendance-card">
                 <h3>{course['code']}: {course['title']}</h3>
-                <p><strong>Time:</strong> {start_time.strftime('%I:%M %p')} - {end_time.strftime('%I:%M %p')}</p>
-                <p><strong>Location:</strong> Building {course_id}, Room {101 + course_id*10}</p>
-                <p><strong>Students Enrolled:</strong> {len([s for s in DEMO_STUDENTS if course_id in s['courses']])}</p>
+                <p><strong>Time:</strong> {format_meeting_days(course)} {format_meeting_time(course)}</p>
+                <p><strong>Next Session:</strong> {next_text}</p>
+                <p><strong>Location:</strong> {format_location(course)}</p>
+                <p><strong>Students Enrolled:</strong> {catalog.enrollment_count(course_id)}</p>
             </div>
             """, unsafe_allow_html=True)
             
@@ -556,64 +637,54 @@ def show_professor_dashboard():
             # Attendance analytics
             st.subheader("Attendance Analytics")
             
-            # Generate dummy attendance data for chart
-            import pandas as pd
             import plotly.express as px
             
-            # Students in this course
-            course_students = [s for s in DEMO_STUDENTS if course_id in s['courses']]
-            
-            # Create dummy data - attendance percentage for last 5 sessions
-            class_dates = [(now - timedelta(days=i*7)).strftime('%m/%d') for i in range(5)]
-            class_dates.reverse()  # Chronological order
-            
-            # Attendance data
-            attendance_data = []
-            
-            # Overall attendance per session (dummy data)
-            import random
-            attendance_rates = [random.uniform(0.7, 1.0) for _ in range(5)]
-            
-            for i, date in enumerate(class_dates):
-                attendance_data.append({
-                    "Date": date,
-                    "Attendance Rate": attendance_rates[i] * 100
+            # Attendance percentage for the last 5 sessions up to the latest one with marks
+            # (held this term or recorded in an earlier one), gaps shown for unmarked sessions
+            with span("dataframe:attendance_trend"):
+                marks = pd.DataFrame(get_course_attendance(course_id), columns=["session_date", "status"])
+                rates = (marks["status"] != "Absent").groupby(pd.to_datetime(marks["session_date"])).mean() * 100
+                held = pd.to_datetime(term_sessions([course_id])[1], unit="D").union(rates.index)
+                if len(rates):
+                    held = held[held <= rates.index.max()]
+                held = held[-5:]
+                df = pd.DataFrame({
+                    "Date": held.strftime('%m/%d'),
+                    "Attendance Rate": rates.reindex(held).to_numpy()
                 })
             
-            df = pd.DataFrame(attendance_data)
-            
-            # Create chart
-            fig = px.line(
-                df, 
-                x="Date", 
-                y="Attendance Rate",
-                markers=True,
-                title="Class Attendance Trend"
-            )
-            fig.update_layout(
-                yaxis_range=[50, 100],
-                paper_bgcolor="#2a2a3a",
-                plot_bgcolor="#2a2a3a",
-                font=dict(color="white")
-            )
-            st.plotly_chart(fig, use_container_width=True)
+            with span("chart:attendance_trend"):
+                # Create chart
+                fig = px.line(
+                    df, 
+                    x="Date", 
+                    y="Attendance Rate",
+                    markers=True,
+                    title="Class Attendance Trend"
+                )
+                fig.update_layout(
+                    yaxis_range=[50, 100],
+                    paper_bgcolor="#2a2a3a",
+                    plot_bgcolor="#2a2a3a",
+                    font=dict(color="white")
+                )
+                st.plotly_chart(fig, use_container_width=True)
             
             # Students at risk
             st.subheader("Students at Risk")
             
-            # Generate dummy data for students with attendance issues
+            # Students approaching or over the absence limit, from the course's bitset matrix
             at_risk_data = []
-            for student in course_students:
-                # Random attendance data
-                absences = random.randint(0, 5)
-                if absences >= course['max_absences'] * 0.75:
-                    at_risk_data.append({
-                        "Student ID": student['student_id'],
-                        "Name": student['name'],
-                        "Absences": absences,
-                        "Max Allowed": course['max_absences'],
-                        "Last Attended": (now - timedelta(days=random.randint(1, 14))).strftime('%m/%d/%Y')
-                    })
+            for row in get_at_risk_students([course_id]).itertuples():
+                student = catalog.get_student(row.student_id)
+                at_risk_data.append({
+                    "Student ID": student['student_id'],
+                    "Name": student['name'],
+                    "Absences": row.absences,
+                    "Max Allowed": row.max_absences,
+                    "Last Attended": row.last_attended.strftime('%m/%d/%Y') if row.last_attended else "Never",
+                    "Sessions Left": row.sessions_left
+                })
             
             if at_risk_data:
                 st.dataframe(
@@ -623,7 +694,8 @@ def show_professor_dashboard():
                         "Name": st.column_config.TextColumn("Student Name"),
                         "Absences": st.column_config.NumberColumn("Current Absences"),
                         "Max Allowed": st.column_config.NumberColumn("Maximum Allowed"),
-                        "Last Attended": st.column_config.TextColumn("Last Attended")
+                        "Last Attended": st.column_config.TextColumn("Last Attended"),
+                        "Sessions Left": st.column_config.NumberColumn("Sessions Left This Term")
                     },
                     hide_index=True,
                     use_container_width=True
@@ -632,7 +704,37 @@ def show_professor_dashboard():
                 # Action buttons
                 col_a, col_b = st.columns(2)
                 with col_a:
-                    st.button("Send Warning Notifications", key="send_warnings")
+                    if st.button("Send Warning Notifications", key="send_warnings"):
+                        warnings = [
+                            (row, f"You have {row.absences} absence(s) in {course['code']}: {course['title']}. "
+                                  f"The course allows at most {row.max_absences}."
+                             if row.absences >= row.max_absences * AT_RISK_THRESHOLD else
+                             f"You missed the last {AT_RISK_STREAK} sessions of {course['code']}: {course['title']}. "
+                             f"Absences so far: {row.absences} of {row.max_absences} allowed.")
+                            for row in get_at_risk_students([course_id]).itertuples()
+                        ]
+                        # Students warned recently are coalesced away and not emailed again
+                        delivered = send_notifications(
+                            {
+                                "user_id": row.student_id,
+                                "title": "Attendance Warning",
+                                "message": message,
+                                "kind": "attendance_warning",
+                                "course_id": course_id,
+                            }
+                            for row, message in warnings
+                        )
+                        queued = send_emails(
+                            {
+                                "recipient": student_email(catalog.get_student(n["user_id"])),
+                                "subject": f"{course['code']} attendance warning",
+                                "body": f"{n['message']} Please contact your professor if you have an excuse on file.",
+                            }
+                            for n in delivered
+                        )
+                        skipped = len(warnings) - queued
+                        st.success(f"{queued} student(s) warned in the app and by email."
+                                   + (f" {skipped} already warned recently." if skipped else ""))
                 with col_b:
                     st.button("Contact Students", key="contact_students")
             else:
@@ -651,17 +753,17 @@ def show_professor_dashboard():
         # Upcoming schedule
         st.subheader("Upcoming Schedule")
         
-        # Generate dummy schedule for the week
-        weekdays = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
+        # The professor's meetings for the week, from the schedule index
+        meetings = get_schedule_index().week([c['id'] for c in professor_courses])
         
-        for i, day in enumerate(weekdays):
-            has_class = i % 2 == 0  # Classes on alternating days for demo
+        for i, day in enumerate(DAY_NAMES[:5]):
+            day_meetings = [m for m in meetings if m['day'] == i]
             
-            if has_class and professor_courses:
-                course = professor_courses[0]
+            if day_meetings:
+                classes = ", ".join(f"{m['course']['code']} at {format_minutes(m['start'])}" for m in day_meetings)
                 st.markdown(f"""
                 <div style="padding:10px;margin-bottom:10px;border-left:3px solid #2196F3;">
-                    <strong>{day}:</strong> {course['code']} at {9 + i}:00 AM
+                    <strong>{day}:</strong> {classes}
                 </div>
                 """, unsafe_allow_html=True)
             else:
@@ -671,16 +773,13 @@ def show_professor_dashboard():
                 </div>
                 """, unsafe_allow_html=True)
 
+@timed()
 def show_student_attendance():
     """Display student attendance page"""
     st.title("My Attendance")
     
     # Get courses for this student
-    student_courses = []
-    for course_id in st.session_state.user_details['courses']:
-        course = next((c for c in DEMO_COURSES if c['id'] == course_id), None)
-        if course:
-            student_courses.append(course)
+    student_courses = get_catalog().courses_for_student(st.session_state.user_id)
     
     # Course selection
     if student_courses:
@@ -694,13 +793,14 @@ def show_student_attendance():
         # Display attendance summary for selected course
         st.subheader(f"Attendance Summary: {course['code']}")
         
-        # Generate dummy attendance data
-        import random
+        # Pre-aggregated counts for this course
+        summary = get_student_attendance_summary(st.session_state.user_id)
+        summary = summary[summary['course_id'] == course['id']]
         
-        total_classes = 15
-        attended = random.randint(int(total_classes * 0.7), total_classes)
-        absences = total_classes - attended
-        attendance_rate = (attended / total_classes) * 100
+        total_classes = int(summary['Total'].sum())
+        absences = int(summary['Absent'].sum())
+        attended = total_classes - absences
+        attendance_rate = float(summary['Attendance Rate'].iloc[0]) if len(summary) else 0.0
         
         # Create metrics
         col1, col2, col3, col4 = st.columns(4)
@@ -709,8 +809,15 @@ def show_student_attendance():
         col3.metric("Attendance Rate", f"{attendance_rate:.1f}%")
         col4.metric("Max Allowed Absences", course['max_absences'])
         
+        # Progress through the term's sessions
+        term = current_term()
+        held_days = term_sessions([course['id']])[1]
+        sessions_left = int(remaining_sessions([course['id']])[0])
+        st.caption(f"{term['period']} {term['start'].year}: {len(held_days)} of "
+                   f"{len(held_days) + sessions_left} sessions held")
+        
         # Warning if needed
-        if absences >= course['max_absences'] * 0.75:
+        if absences >= course['max_absences'] * AT_RISK_THRESHOLD:
             if absences >= course['max_absences']:
                 st.error(f"⚠️ You have reached the maximum allowed absences ({course['max_absences']}) for this course!")
             else:
@@ -719,29 +826,24 @@ def show_student_attendance():
         # Attendance history
         st.subheader("Attendance History")
         
-        # Generate dummy attendance records
-        now = datetime.now()
-        attendance_records = []
-        
-        for i in range(total_classes):
-            class_date = now - timedelta(days=i*7)
-            
-            # Determine status (mostly present, but some absences)
-            if i < absences:
-                status = "Absent"
-            else:
-                status = "Present"
-            
-            attendance_records.append({
-                "Date": class_date.strftime('%m/%d/%Y'),
-                "Day": class_date.strftime('%A'),
-                "Time": f"{9 + (course['id']*2)}:00 AM - {10 + (course['id']*2)}:30 AM",
-                "Status": status,
-                "Notes": "" if status == "Present" else "Unexcused absence"
-            })
-        
-        # Sort by date (newest first)
-        attendance_records.reverse()
+        # Every session held this term plus any recorded outside it (so the table
+        # agrees with the metrics above), newest first, with the mark recorded for it
+        marks = pd.DataFrame(
+            get_student_attendance(st.session_state.user_id, course['id']),
+            columns=["session_date", "status", "notes"]
+        )
+        marks.index = pd.to_datetime(marks["session_date"])
+        held = pd.to_datetime(held_days, unit="D").union(marks.index)[::-1]
+        marks = marks.reindex(held)
+        status = marks["status"].fillna("Not recorded")
+        notes = marks["notes"].fillna("")
+        attendance_records = pd.DataFrame({
+            "Date": held.strftime('%m/%d/%Y'),
+            "Day": held.day_name(),
+            "Time": format_meeting_time(course),
+            "Status": status.to_numpy(),
+            "Notes": notes.where((notes != "") | (status != "Absent"), "Unexcused absence").to_numpy(),
+        })
         
         # Display as table
         st.dataframe(
@@ -769,16 +871,28 @@ def show_student_attendance():
     else:
         st.info("No courses available in the demo for this student.")
 
+@st.fragment(run_every=CHECKIN_TOKEN_PERIOD)
+@timed()
+def show_checkin_qr(course, session_date):
+    """Display the rotating check-in QR code; reruns on its own as the token changes"""
+    # Rendered once per token and shared across sessions
+    with span("qr:generate"):
+        qr_image = get_checkin_qr(course['id'], session_date.strftime('%Y-%m-%d'), QR_FORMAT)
+    if QR_FORMAT == "svg":
+        qr_image = qr_image.decode("utf-8")
+    
+    st.image(qr_image, caption=f"QR Code for {course['code']} attendance", width=200)
+    st.caption(f"Code refreshes every {CHECKIN_TOKEN_PERIOD} seconds")
+
+
+@timed()
 def show_professor_attendance():
     """Display professor attendance taking page"""
     st.title("Attendance Management")
     
     # Get courses taught by this professor
-    professor_courses = []
-    for course_id in st.session_state.user_details['courses']:
-        course = next((c for c in DEMO_COURSES if c['id'] == course_id), None)
-        if course:
-            professor_courses.append(course)
+    catalog = get_catalog()
+    professor_courses = catalog.courses_for_professor(st.session_state.user_id)
     
     # Course selection
     if professor_courses:
@@ -812,18 +926,13 @@ def show_professor_attendance():
         <div class="attendance-card">
             <h3>Class Session: {formatted_date}</h3>
             <p><strong>Course:</strong> {course['code']}: {course['title']}</p>
-            <p><strong>Time:</strong> {9 + course['id']}:00 AM - {10 + course['id']}:30 AM</p>
-            <p><strong>Location:</strong> Building {course['id']}, Room {101 + course['id']*10}</p>
+            <p><strong>Time:</strong> {format_meeting_time(course)}</p>
+            <p><strong>Location:</strong> {format_location(course)}</p>
         </div>
         """, unsafe_allow_html=True)
         
         # Get students in this course
-        course_students = [s for s in DEMO_STUDENTS if course['id'] in s['courses']]
-        
-        # Generate QR code for check-in
-        import io
-        import qrcode
-        from PIL import Image
+        course_students = catalog.students_in_course(course['id'])
         
         # Create a method tab interface
         attendance_method = st.radio(
@@ -832,31 +941,10 @@ def show_professor_attendance():
         )
         
         if attendance_method == "QR Code Check-in":
-            # Generate QR code data
-            qr_data = f"classtrack:checkin:{course['id']}:{formatted_date}"
-            
-            # Create QR code
-            qr = qrcode.QRCode(
-                version=1,
-                error_correction=qrcode.constants.ERROR_CORRECT_L,
-                box_size=10,
-                border=4,
-            )
-            qr.add_data(qr_data)
-            qr.make(fit=True)
-            
-            # Create image
-            img = qr.make_image(fill_color="white", back_color="black")
-            
-            # Save to bytes
-            img_byte_arr = io.BytesIO()
-            img.save(img_byte_arr, format='PNG')
-            img_byte_arr.seek(0)
-            
             # Display
             col1, col2 = st.columns([1, 2])
             with col1:
-                st.image(img_byte_arr, caption=f"QR Code for {course['code']} attendance", width=200)
+                show_checkin_qr(course, session_date)
             
             with col2:
                 st.markdown("""
@@ -864,50 +952,48 @@ def show_professor_attendance():
                 
                 1. Display this QR code to your students
                 2. Students can scan with the ClassTracker mobile app
-                3. Check-ins are recorded automatically
+                3. Check-ins are recorded automatically; the code rotates, so photos of it expire
                 4. You can still manually update attendance below
                 """)
         
         elif attendance_method == "Geolocation Check-in":
-            st.markdown("""
+            classroom = classroom_for_course(course)
+            st.markdown(f"""
             ### Geolocation Check-in
             
             Students within the specified radius of the class location can check in using the app.
             
             **Current Settings:**
-            - Check-in radius: 100 meters
-            - Classroom location: Set based on course schedule
-            - Time window: 15 minutes before and after class start
+            - Check-in radius: {CHECKIN_RADIUS_METERS} meters
+            - Classroom location: {format_location(course)} ({classroom['lat']:.5f}, {classroom['lon']:.5f})
+            - Time window: {CHECKIN_OPEN_BEFORE_MINUTES} minutes before and {CHECKIN_CLOSE_AFTER_MINUTES} minutes after class start
             """)
             
-            # Map placeholder
-            st.image("https://via.placeholder.com/800x400?text=Campus+Map+(Demo)", use_column_width=True)
+            # Classroom and its check-in radius
+            with span("map:classroom"):
+                st.map(
+                    pd.DataFrame({"lat": [classroom["lat"]], "lon": [classroom["lon"]]}),
+                    size=CHECKIN_RADIUS_METERS,
+                    zoom=16
+                )
         
         # Attendance roster
         st.subheader("Attendance Roster")
         
         # Create attendance form
         with st.form("attendance_form"):
-            # Generate existing attendance data or defaults
+            # Load existing attendance for this session, defaulting to present
             attendance_data = []
-            
-            # For demo purposes, generate random attendance
-            import random
+            session_marks = {r['student_id']: r for r in get_course_attendance(course['id'], session_date)}
             
             for student in course_students:
-                # Default to present for today, random for other days
-                if session_option == "Today's Session":
-                    status = "Present"
-                else:
-                    statuses = ["Present", "Absent", "Late", "Excused"]
-                    weights = [0.8, 0.1, 0.05, 0.05]  # 80% chance of present
-                    status = random.choices(statuses, weights=weights, k=1)[0]
+                mark = session_marks.get(student['id'])
                 
                 attendance_data.append({
                     "student_id": student['student_id'],
                     "name": student['name'],
-                    "status": status,
-                    "notes": ""
+                    "status": mark['status'] if mark else "Present",
+                    "notes": mark['notes'] if mark else ""
                 })
             
             # Create columns for layout
@@ -943,50 +1029,44 @@ def show_professor_attendance():
                 
                 for student in attendance_data:
                     key = f"note_{student['student_id']}"
-                    student_notes[key] = st.text_input("", key=key)
+                    student_notes[key] = st.text_input("", value=student['notes'], key=key)
             
             # Submit button
             submit = st.form_submit_button("Save Attendance")
             
             if submit:
-                st.success("Attendance saved successfully! (Demo - no actual data is saved)")
+                # Save the whole roster in one write
+                roster = [
+                    {
+                        "student_id": student['id'],
+                        "status": student_statuses[f"status_{student['student_id']}"],
+                        "notes": student_notes[f"note_{student['student_id']}"]
+                    }
+                    for student in course_students
+                ]
+                changes = record_attendance_bulk(course['id'], session_date, roster)
                 
-                # In a real app, this would save to the database
+                st.success(f"Attendance saved successfully! {len(changes)} record(s) updated.")
                 st.balloons()
         
         # Attendance statistics
         st.subheader("Course Attendance Statistics")
         
-        # Generate attendance stats by student (dummy data)
-        stats_data = []
-        
-        for student in course_students:
-            # Random attendance stats for demo
-            total_sessions = 15
-            present_count = random.randint(int(total_sessions * 0.6), total_sessions)
-            absent_count = total_sessions - present_count
-            late_count = random.randint(0, min(3, absent_count))
-            absent_count -= late_count
-            excused_count = random.randint(0, min(2, absent_count))
-            absent_count -= excused_count
-            
-            # Calculate attendance rate
-            attendance_rate = ((present_count + late_count + excused_count) / total_sessions) * 100
-            
-            stats_data.append({
-                "Student ID": student['student_id'],
-                "Name": student['name'],
-                "Present": present_count,
-                "Absent": absent_count,
-                "Late": late_count,
-                "Excused": excused_count,
-                "Attendance Rate": attendance_rate
+        # Attendance stats by student, pre-aggregated by the attendance store
+        summary = get_course_attendance_summary(course['id']).set_index('student_id')
+        counts = summary.reindex([s['id'] for s in course_students], fill_value=0)
+        
+        with span("dataframe:course_stats"):
+            stats_df = pd.DataFrame({
+                "Student ID": [s['student_id'] for s in course_students],
+                "Name": [s['name'] for s in course_students],
+                "Present": counts['Present'].to_numpy(),
+                "Absent": counts['Absent'].to_numpy(),
+                "Late": counts['Late'].to_numpy(),
+                "Excused": counts['Excused'].to_numpy(),
+                "Attendance Rate": counts['Attendance Rate'].to_numpy()
             })
         
-        # Create DataFrame
-        import pandas as pd
-        stats_df = pd.DataFrame(stats_data)
-        
         # Display statistics
         st.dataframe(
             stats_df,
@@ -1018,26 +1098,25 @@ def show_professor_attendance():
                 mime="text/csv"
             )
         with col2:
-            st.button("Email Report to Department", key="email_report")
+            if st.button("Email Report to Department", key="email_report"):
+                department = catalog.get_professor(st.session_state.user_id)['department']
+                send_email(
+                    department_email(department),
+                    f"{course['code']} attendance report",
+                    f"Attendance statistics for {course['code']}: {course['title']} are attached.",
+                    attachment=(f"{course['code']}_attendance_stats.csv", stats_df.to_csv(index=False)),
+                )
+                st.success(f"Report queued for delivery to the {department} department.")
     else:
         st.info("No courses available in the demo for this professor.")
 
+@timed()
 def show_schedule():
     """Display class schedule page"""
     st.title("Class Schedule")
     
     # Get courses for current user
-    user_courses = []
-    if st.session_state.role == "student":
-        for course_id in st.session_state.user_details['courses']:
-            course = next((c for c in DEMO_COURSES if c['id'] == course_id), None)
-            if course:
-                user_courses.append(course)
-    else:  # professor
-        for course_id in st.session_state.user_details['courses']:
-            course = next((c for c in DEMO_COURSES if c['id'] == course_id), None)
-            if course:
-                user_courses.append(course)
+    user_courses = get_catalog().courses_for_user(st.session_state.role, st.session_state.user_id)
     
     # Tab view for different schedules
     tab1, tab2, tab3 = st.tabs(["Weekly Schedule", "Monthly View", "Academic Calendar"])
@@ -1045,10 +1124,12 @@ def show_schedule():
     with tab1:
         st.subheader("Weekly Schedule")
         
-        # Create a weekly schedule table
-        weekdays = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
-        time_slots = ["8:00 AM", "9:00 AM", "10:00 AM", "11:00 AM", "12:00 PM", 
-                       "1:00 PM", "2:00 PM", "3:00 PM", "4:00 PM", "5:00 PM"]
+        # Create a weekly schedule table from the user's meetings
+        weekdays = DAY_NAMES[:5]
+        meetings = get_schedule_index().week([c['id'] for c in user_courses])
+        first_hour = min([8] + [m['start'] // 60 for m in meetings])
+        last_hour = max([17] + [(m['end'] - 1) // 60 for m in meetings])
+        time_slots = [format_minutes(hour * 60) for hour in range(first_hour, last_hour + 1)]
         
         # Generate empty schedule grid
         schedule_data = []
@@ -1059,50 +1140,20 @@ def show_schedule():
                 row_data[day] = ""
             schedule_data.append(row_data)
         
-        # Fill in courses (for demo purposes)
-        for course in user_courses:
-            # Assign each course to specific days and times
-            days = []
-            time_index = 0
-            
-            # Different schedules based on course ID
-            if course['id'] == 1:  # CS101
-                days = ["Monday", "Wednesday", "Friday"]
-                time_index = 1  # 9:00 AM
-            elif course['id'] == 2:  # MATH201
-                days = ["Tuesday", "Thursday"]
-                time_index = 3  # 11:00 AM
-            elif course['id'] == 3:  # ENG105
-                days = ["Monday", "Wednesday"]
-                time_index = 6  # 2:00 PM
-            elif course['id'] == 4:  # PHYS101
-                days = ["Tuesday", "Thursday"]
-                time_index = 2  # 10:00 AM
-            elif course['id'] == 5:  # CHEM110
-                days = ["Monday", "Wednesday", "Friday"]
-                time_index = 4  # 12:00 PM
-            elif course['id'] == 6:  # BIO120
-                days = ["Tuesday", "Friday"]
-                time_index = 5  # 1:00 PM
-            elif course['id'] == 7:  # CS201
-                days = ["Monday", "Wednesday"]
-                time_index = 7  # 3:00 PM
-            elif course['id'] == 8:  # HIST101
-                days = ["Tuesday", "Thursday"]
-                time_index = 8  # 4:00 PM
-            
-            # Add course to schedule if days and time index were defined
-            if days and time_index < len(time_slots):
-                for day in days:
-                    schedule_data[time_index][day] = f"{course['code']}\n{course['title']}"
-                    
-                    # Classes are 1.5 hours long (cover next slot too)
-                    if time_index + 1 < len(time_slots):
-                        schedule_data[time_index + 1][day] = f"{course['code']} (cont.)"
+        # Fill in every hour slot a meeting overlaps; shared slots list both courses
+        for meeting in meetings:
+            if meeting['day'] >= len(weekdays):
+                continue
+            course = meeting['course']
+            day = weekdays[meeting['day']]
+            for hour in range(meeting['start'] // 60, (meeting['end'] - 1) // 60 + 1):
+                label = f"{course['code']}\n{course['title']}" if hour == meeting['start'] // 60 else f"{course['code']} (cont.)"
+                cell = schedule_data[hour - first_hour]
+                cell[day] = f"{cell[day]} / {label}" if cell[day] else label
         
         # Convert to DataFrame
-        import pandas as pd
-        schedule_df = pd.DataFrame(schedule_data)
+        with span("dataframe:weekly_schedule"):
+            schedule_df = pd.DataFrame(schedule_data)
         
         # Apply custom formatting with HTML
         st.markdown("""
@@ -1138,6 +1189,19 @@ def show_schedule():
             hide_index=True,
             use_container_width=True
         )
+        
+        # Overlapping sections, plus double-booked rooms for a professor's sections
+        engine = get_conflict_engine()
+        conflicts = engine.for_owner(st.session_state.role, st.session_state.user_id)
+        if st.session_state.role == "professor":
+            conflicts += [c for c in engine.for_sections([c['id'] for c in user_courses]) if c['kind'] == "room"]
+        for conflict in conflicts:
+            where = "in the same room " if conflict.get('kind') == "room" else ""
+            st.warning(
+                f"⚠️ Schedule conflict: {conflict['course_a']['code']} and {conflict['course_b']['code']} overlap "
+                f"{where}on {DAY_NAMES[conflict['day']]} from {format_minutes(conflict['start'])} "
+                f"to {format_minutes(conflict['end'])}."
+            )
     
     with tab2:
         st.subheader("Monthly View")
@@ -1184,17 +1248,19 @@ def show_schedule():
     with tab3:
         st.subheader("Academic Calendar")
         
-        # Display key academic dates
-        academic_calendar = [
-            {"period": "Spring Semester", "start_date": "January 15, 2025", "end_date": "May 30, 2025"},
-            {"period": "Spring Break", "start_date": "March 10, 2025", "end_date": "March 14, 2025"},
-            {"period": "Final Exams", "start_date": "June 2, 2025", "end_date": "June 13, 2025"},
-            {"period": "Summer Session", "start_date": "June 24, 2025", "end_date": "August 15, 2025"},
-            {"period": "Fall Semester", "start_date": "September 2, 2025", "end_date": "December 19, 2025"}
+        # Display key academic dates; class sessions skip the breaks listed here
+        year = current_term()["start"].year
+        academic_dates = [
+            {
+                "period": entry["period"],
+                "start_date": f"{entry['start']:%B} {entry['start'].day}, {year}",
+                "end_date": f"{entry['end']:%B} {entry['end'].day}, {year}",
+            }
+            for entry in academic_calendar(year)
         ]
         
         # Convert to DataFrame
-        calendar_df = pd.DataFrame(academic_calendar)
+        calendar_df = pd.DataFrame(academic_dates)
         
         # Display calendar
         st.dataframe(
@@ -1212,10 +1278,11 @@ def show_schedule():
         st.download_button(
             "Download Academic Calendar",
             data=calendar_df.to_csv(index=False),
-            file_name="academic_calendar_2025.csv",
+            file_name=f"academic_calendar_{year}.csv",
             mime="text/csv"
         )
 
+@timed()
 def show_ai_assistant():
     """Display AI assistant for policy questions"""
     st.title("AI Policy Assistant")
@@ -1226,7 +1293,8 @@ def show_ai_assistant():
     Ask any questions about the university's attendance policies, and our AI will provide answers based on official policy documents.
     """)
     
-    # Initialize the chatbot
+    # Initialize the chatbot; the LLM stack is only imported once this tab is opened
+    from components.chatbot import answer_policy_question, setup_chatbot
     chatbot = setup_chatbot()
     
     # Mock policy document display
@@ -1349,6 +1417,7 @@ def show_ai_assistant():
             # Rerun to update the display
             st.rerun()
 
+@timed()
 def show_settings():
     """Display settings page"""
     st.title("Settings")
@@ -1370,20 +1439,30 @@ def show_settings():
                       ["Class Reminders", "Attendance Warnings", "Professor Announcements", "Schedule Changes"],
                       default=["Class Reminders", "Attendance Warnings"])
         
-        # Advanced settings
+        # Advanced settings (used by the class reminder scheduler)
+        prefs = get_notification_preferences(st.session_state.role, st.session_state.user_id)
         with st.expander("Advanced Notification Settings"):
-            st.number_input("Class Reminder Lead Time (minutes)", min_value=5, max_value=120, value=30,
-                          help="How many minutes before class to send a reminder")
-            st.checkbox("Notify on Weekends", value=False)
-            st.checkbox("Quiet Hours", value=True)
+            lead_time = st.number_input("Class Reminder Lead Time (minutes)", min_value=5, max_value=120,
+                                        value=prefs["reminder_lead_minutes"],
+                                        help="How many minutes before class to send a reminder")
+            notify_weekends = st.checkbox("Notify on Weekends", value=prefs["notify_weekends"])
+            quiet_hours = st.checkbox("Quiet Hours", value=prefs["quiet_hours"])
             
             col1, col2 = st.columns(2)
             with col1:
-                st.time_input("Quiet Hours Start", value=datetime.strptime("22:00", "%H:%M"))
+                quiet_start = st.time_input("Quiet Hours Start", value=datetime.strptime(prefs["quiet_start"], "%H:%M"))
             with col2:
-                st.time_input("Quiet Hours End", value=datetime.strptime("07:00", "%H:%M"))
-        
-        st.button("Save Notification Settings", key="save_notifications")
+                quiet_end = st.time_input("Quiet Hours End", value=datetime.strptime(prefs["quiet_end"], "%H:%M"))
+        
+        if st.button("Save Notification Settings", key="save_notifications"):
+            set_notification_preferences(st.session_state.role, st.session_state.user_id, {
+                "reminder_lead_minutes": int(lead_time),
+                "notify_weekends": notify_weekends,
+                "quiet_hours": quiet_hours,
+                "quiet_start": quiet_start.strftime("%H:%M"),
+                "quiet_end": quiet_end.strftime("%H:%M"),
+            })
+            st.success("Notification settings saved. Upcoming class reminders have been rescheduled.")
     
     with tab2:
         st.subheader("Display Settings")
@@ -1429,10 +1508,13 @@ def show_settings():
         
         # Integrations
         with st.expander("Calendar Integration"):
-            st.checkbox("Sync with Google Calendar", value=True)
-            st.checkbox("Sync with Outlook Calendar", value=False)
-            st.checkbox("Sync with Apple Calendar", value=False)
-            st.button("Configure Calendar Integration", key="config_calendar")
+            st.write("Subscribe to this URL in Google, Outlook or Apple Calendar to see your classes and the academic calendar:")
+            st.code(feed_url(st.session_state.role, st.session_state.user_id), language=None)
+            _, feed = get_calendar_feed(st.session_state.role, st.session_state.user_id)
+            st.download_button("Download .ics", data=feed, file_name="classtracker.ics",
+                               mime="text/calendar", key="download_calendar")
+            if not CALENDAR_SERVER_ENABLED:
+                st.caption("The feed server is off in this demo; set CLASSTRACKER_CALENDAR_SERVER=1 to serve the subscription URL.")
         
         # Data export
         with st.expander("Export Data"):
@@ -0,0 +1,80 @@
+# Benchmark: saving a full attendance roster
+#
+# Compares one record_session() call per roster against one record() call per
+# student, for lecture sizes of 50, 500 and 5,000 students.
+#
+# Usage: python -m benchmarks.bench_bulk_write [--repeats 20]
+
+import argparse
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+from components.attendance import STATUSES, AttendanceStore
+
+ROSTER_SIZES = [50, 500, 5000]
+HISTORY_SESSIONS = 15
+
+
+def make_roster(size, rng):
+    """Build a roster with the usual mix of statuses"""
+    statuses = rng.choice(STATUSES, size=size, p=[0.8, 0.1, 0.05, 0.05])
+    return [{"student_id": i, "status": str(status), "notes": ""} for i, status in enumerate(statuses)]
+
+
+def percentiles(samples):
+    """Return (p50, p95) in milliseconds"""
+    samples = np.array(samples) * 1000
+    return np.percentile(samples, 50), np.percentile(samples, 95)
+
+
+def bench_size(size, repeats, rng):
+    """Time new-session saves, re-saves with a few edits, and per-student saves"""
+    store = AttendanceStore(capacity=size * HISTORY_SESSIONS)
+    first_day = date(2025, 1, 15)
+    for week in range(HISTORY_SESSIONS):
+        store.record_session(1, first_day + timedelta(days=7 * week), make_roster(size, rng))
+
+    new_session, resave, per_student = [], [], []
+    for i in range(repeats):
+        session_date = first_day + timedelta(days=7 * (HISTORY_SESSIONS + i))
+        roster = make_roster(size, rng)
+
+        start = time.perf_counter()
+        store.record_session(1, session_date, roster)
+        new_session.append(time.perf_counter() - start)
+
+        # Professor fixes ~5% of the marks and saves again
+        for record in rng.choice(roster, size=max(1, size // 20), replace=False):
+            record["status"] = "Excused"
+        start = time.perf_counter()
+        store.record_session(1, session_date, roster)
+        resave.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for record in roster:
+            store.record(record["student_id"], 2, record["status"], session_date)
+        per_student.append(time.perf_counter() - start)
+
+    return {
+        "new session": percentiles(new_session),
+        "re-save (5% edits)": percentiles(resave),
+        "per-student record()": percentiles(per_student),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark roster saves")
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'students':>8}  {'operation':<22} {'p50 ms':>9} {'p95 ms':>9}")
+    for size in ROSTER_SIZES:
+        for name, (p50, p95) in bench_size(size, args.repeats, rng).items():
+            print(f"{size:>8}  {name:<22} {p50:>9.2f} {p95:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
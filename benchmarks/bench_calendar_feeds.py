@@ -0,0 +1,93 @@
+# Benchmark: calendar feed polling
+#
+# Polls every sampled user's .ics feed over a generated catalog the way
+# calendar clients do. Times the first (cold) render, repeat polls served from
+# the feed cache, and rendering the whole feed from scratch on every poll; then
+# moves one section and re-polls to show that only its block is re-rendered.
+# With --http it also runs the feed server on a local port and compares full
+# 200 responses against If-None-Match revalidations answered with 304.
+#
+# Usage:
+#   python -m benchmarks.bench_calendar_feeds
+#   python -m benchmarks.bench_calendar_feeds --sample 20000 --http
+
+import argparse
+import http.client
+import threading
+import time
+from datetime import date
+
+from components.calendar_feed import FeedCache, feed_path
+from components.calendar_server import make_server
+from components.catalog import Catalog
+from components.sessions import SessionTable
+from utils.data_generator import generate_university
+
+TODAY = date.today()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark calendar feed polling")
+    parser.add_argument("--students", type=int, default=20000)
+    parser.add_argument("--sections", type=int, default=2000)
+    parser.add_argument("--sample", type=int, default=5000, help="Students polled")
+    parser.add_argument("--http", action="store_true", help="Also poll the feed server over HTTP")
+    parser.add_argument("--requests", type=int, default=2000, help="HTTP polls per mode")
+    args = parser.parse_args()
+
+    courses, students, professors = generate_university(args.students, args.sections)
+    catalog = Catalog(courses, students, professors)
+    table = SessionTable(courses, TODAY.year)
+    cache = FeedCache(catalog, session_table_for=lambda year: table)
+    users = [s["id"] for s in students[:args.sample]]
+
+    start = time.perf_counter()
+    etags = {user: cache.feed("student", user, TODAY)[0] for user in users}
+    cold = time.perf_counter() - start
+    print(f"cold: {len(users):,} feeds in {cold * 1000:.0f} ms "
+          f"({cache.stats['sections_rendered']:,} section blocks rendered)")
+
+    start = time.perf_counter()
+    for user in users:
+        cache.feed("student", user, TODAY)
+    cached = (time.perf_counter() - start) / len(users) * 1e6
+
+    sample = users[:min(len(users), 1000)]
+    start = time.perf_counter()
+    for user in sample:
+        FeedCache(catalog, session_table_for=lambda year: table).feed("student", user, TODAY)
+    uncached = (time.perf_counter() - start) / len(sample) * 1e6
+    print(f"per poll: feed cache {cached:.1f} us, full render {uncached:.0f} us")
+
+    # Move one section: only its block and the feeds that include it change
+    courses[0].update(start_time="07:00", end_time="08:15")
+    rendered = cache.stats["sections_rendered"]
+    changed = sum(cache.feed("student", user, TODAY)[0] != etags[user] for user in users)
+    print(f"after moving one section: {cache.stats['sections_rendered'] - rendered} block re-rendered, "
+          f"{changed:,} of {len(users):,} ETags changed")
+
+    if args.http:
+        server = make_server("127.0.0.1", 0, cache)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        conn = http.client.HTTPConnection("127.0.0.1", server.server_address[1])
+        paths = [feed_path("student", user) for user in users]
+        etags = {user: cache.feed("student", user)[0] for user in users}
+        for status, revalidate in ((200, False), (304, True)):
+            start = time.perf_counter()
+            sent = 0
+            for n in range(args.requests):
+                user = n % len(users)
+                headers = {"If-None-Match": etags[users[user]]} if revalidate else {}
+                conn.request("GET", paths[user], headers=headers)
+                response = conn.getresponse()
+                sent += len(response.read())
+                assert response.status == status
+            elapsed = time.perf_counter() - start
+            print(f"HTTP {status}: {elapsed / args.requests * 1e6:.0f} us per poll, "
+                  f"{sent / args.requests:,.0f} body bytes per poll")
+        conn.close()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
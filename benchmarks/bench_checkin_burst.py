@@ -0,0 +1,97 @@
+# Benchmark: 9:00 AM check-in burst
+#
+# Replays the check-ins of every section that starts at 9:00 AM through the
+# check-in ingestor and queue, with arrivals bunched around the start time the
+# way they are in practice (most students arrive in the few minutes either side
+# of it). The simulated half hour is compressed by --speed. Each run reports
+# commit latency percentiles, the deepest the queue got, how many check-ins were
+# pushed back and the average batch size, for group commit and for writing
+# every check-in on its own.
+#
+# Usage:
+#   python -m benchmarks.bench_checkin_burst
+#   python -m benchmarks.bench_checkin_burst --speed 600 --queue-size 2000
+
+import argparse
+import threading
+import time
+from datetime import date
+
+import numpy as np
+
+from components.attendance import AttendanceStore
+from components.catalog import Catalog
+from components.checkin import BUSY, CheckinIngestor, session_start
+from components.checkin_queue import CheckinQueue
+from config import CHECKIN_BATCH_SIZE
+from utils.data_generator import generate_university
+
+SESSION_DATE = date(2025, 3, 3)
+
+
+def _arrivals(catalog, rng):
+    """Return (offsets in seconds from 9:00, student ids, course ids) sorted by arrival"""
+    courses = [c for c in catalog.courses if session_start(c, SESSION_DATE).hour == 9]
+    pairs = [(s["id"], c["id"]) for c in courses for s in catalog.students_in_course(c["id"])]
+    students, course_ids = np.array(pairs).T
+    offsets = np.clip(rng.normal(-120, 240, size=len(pairs)), -900, 900)
+    order = np.argsort(offsets)
+    return offsets[order], students[order], course_ids[order]
+
+
+def _run(catalog, arrivals, args, max_batch):
+    """Replay the burst with `args.producers` threads and return the queue metrics"""
+    queue = CheckinQueue(AttendanceStore(), maxsize=args.queue_size, max_batch=max_batch)
+    ingestor = CheckinIngestor(catalog, queue)
+    start_ts = session_start(catalog.get_course(int(arrivals[2][0])), SESSION_DATE).timestamp()
+    offsets, students, courses = arrivals
+    busy = [0] * args.producers
+
+    def produce(worker):
+        rows = range(worker, len(offsets), args.producers)
+        t0 = time.perf_counter() - offsets[0] / args.speed
+        for i in rows:
+            delay = offsets[i] / args.speed - (time.perf_counter() - t0)
+            if delay > 0:
+                time.sleep(delay)
+            outcome, _ = ingestor.check_in(int(students[i]), int(courses[i]), start_ts + offsets[i])
+            busy[worker] += outcome == BUSY
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=produce, args=(w,)) for w in range(args.producers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    queue.flush()
+    elapsed = time.perf_counter() - started
+    queue.close()
+
+    metrics = queue.metrics()
+    metrics["elapsed"] = elapsed
+    return metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate a 9:00 AM check-in burst")
+    parser.add_argument("--students", type=int, default=20000)
+    parser.add_argument("--sections", type=int, default=1000)
+    parser.add_argument("--speed", type=float, default=120, help="Simulated seconds per real second")
+    parser.add_argument("--producers", type=int, default=8)
+    parser.add_argument("--queue-size", type=int, default=20000)
+    args = parser.parse_args()
+
+    catalog = Catalog(*generate_university(args.students, args.sections))
+    arrivals = _arrivals(catalog, np.random.default_rng(11))
+    print(f"{len(arrivals[0])} check-ins from {len(np.unique(arrivals[2]))} sections, "
+          f"30 simulated minutes at {args.speed:g}x")
+
+    print(f"\n{'mode':<16} {'p50 ms':>8} {'p99 ms':>8} {'max depth':>10} {'pushed back':>12} {'batches':>8} {'mean batch':>11}")
+    for name, max_batch in [("group commit", CHECKIN_BATCH_SIZE), ("one per write", 1)]:
+        m = _run(catalog, arrivals, args, max_batch)
+        print(f"{name:<16} {m['p50_commit_ms']:>8.1f} {m['p99_commit_ms']:>8.1f} {m['max_depth']:>10} "
+              f"{m['rejected']:>12} {m['batches']:>8} {m['mean_batch']:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
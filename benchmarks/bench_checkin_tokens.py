@@ -0,0 +1,52 @@
+# Benchmark: check-in token verification
+#
+# Measures how many check-in tokens one core can sign and verify per second:
+# valid tokens from many course sessions, tokens with a forged signature and
+# tokens from an expired rotation. Verification needs only the shared secret,
+# so this is the full authentication cost of a scan on the check-in hot path.
+#
+# Usage:
+#   python -m benchmarks.bench_checkin_tokens
+#   python -m benchmarks.bench_checkin_tokens --tokens 500000
+
+import argparse
+import time
+
+from config import CHECKIN_TOKEN_PERIOD
+from utils.checkin_tokens import make_checkin_token, verify_checkin_token
+
+
+def _rate(func, items):
+    """Call func on every item and return (calls per second, failures)"""
+    failures = 0
+    start = time.perf_counter()
+    for item in items:
+        try:
+            func(item)
+        except ValueError:
+            failures += 1
+    return len(items) / (time.perf_counter() - start), failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark check-in token signing and verification")
+    parser.add_argument("--tokens", type=int, default=200000)
+    args = parser.parse_args()
+
+    now = time.time()
+    sessions = [(i % 5000 + 1, f"2025-03-{i % 28 + 1:02d}") for i in range(args.tokens)]
+
+    sign_rate, _ = _rate(lambda s: make_checkin_token(s[0], s[1], now), sessions)
+    valid = [make_checkin_token(c, d, now) for c, d in sessions]
+    forged = [token[:-4] + "AAAA" for token in valid]
+    expired = [make_checkin_token(c, d, now - 10 * CHECKIN_TOKEN_PERIOD) for c, d in sessions]
+
+    print(f"{'case':<10} {'per second':>12} {'rejected':>10}")
+    print(f"{'sign':<10} {sign_rate:>12,.0f}")
+    for name, tokens in [("valid", valid), ("forged", forged), ("expired", expired)]:
+        rate, failures = _rate(lambda t: verify_checkin_token(t, now), tokens)
+        print(f"{name:<10} {rate:>12,.0f} {failures:>10}")
+
+
+if __name__ == "__main__":
+    main()
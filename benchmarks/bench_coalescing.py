@@ -0,0 +1,83 @@
+# Benchmark: notification coalescing
+#
+# Replays a day of bulk warning runs: professors re-send at-risk warnings for
+# their sections several times, so most students get the same warning again
+# (some with an updated absence count) within hours. Each warning goes to the
+# inbox and, if delivered, to the email outbox. Compares the number of inbox
+# rows and emails and the time taken with and without the coalescing stage.
+#
+# Usage:
+#   python -m benchmarks.bench_coalescing
+#   python -m benchmarks.bench_coalescing --students 50000 --runs 8
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from components.notifications import NotificationCoalescer, NotificationInbox
+from utils.email_sender import Outbox
+
+
+def _runs(args, rng):
+    """Return a list of warning batches, one per bulk run"""
+    batches = []
+    absences = rng.integers(3, 6, size=args.students)
+    for run in range(args.runs):
+        warned = rng.random(args.students) < args.share
+        absences = absences + (rng.random(args.students) < 0.05)  # a few more absences between runs
+        batches.append([
+            {"user_id": int(s) + 1, "title": "Attendance Warning", "kind": "attendance_warning",
+             "course_id": int(s) % 40 + 1, "message": f"You have {int(absences[s])} absences."}
+            for s in np.flatnonzero(warned)
+        ])
+    return batches
+
+
+def _replay(batches, directory, name, coalesce):
+    """Send every batch through inbox and outbox; return (seconds, inbox rows, emails)"""
+    inbox = NotificationInbox(Path(directory) / f"{name}.sqlite3")
+    outbox = Outbox(Path(directory) / f"{name}-outbox.sqlite3")
+    coalescer = NotificationCoalescer(inbox)
+    start = time.perf_counter()
+    rows = emails = 0
+    for run, batch in enumerate(batches):
+        now = 1.7e9 + run * 1800  # a run every half hour
+        if coalesce:
+            delivered = coalescer.send(batch, now=now)
+        else:
+            inbox.add(batch, now=now)
+            delivered = batch
+        rows += len(delivered)
+        emails += outbox.enqueue(
+            {"recipient": f"s{n['user_id']}@students.university.edu", "subject": n["title"], "body": n["message"]}
+            for n in delivered
+        )
+    elapsed = time.perf_counter() - start
+    inbox.close()
+    outbox.close()
+    return elapsed, rows, emails, coalescer.counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark notification coalescing in bulk warning runs")
+    parser.add_argument("--students", type=int, default=20000)
+    parser.add_argument("--runs", type=int, default=6, help="Bulk warning runs over the day")
+    parser.add_argument("--share", type=float, default=0.5, help="Share of students warned in each run")
+    args = parser.parse_args()
+
+    batches = _runs(args, np.random.default_rng(9))
+    print(f"{sum(map(len, batches)):,} warnings over {args.runs} runs")
+    print(f"\n{'mode':<14} {'seconds':>8} {'new rows':>10} {'emails':>9} {'merged':>8} {'dropped':>8}")
+    with tempfile.TemporaryDirectory() as directory:
+        for name, coalesce in [("coalesced", True), ("every send", False)]:
+            elapsed, rows, emails, counts = _replay(batches, directory, name.replace(" ", "-"), coalesce)
+            merged = counts["merged"] if coalesce else 0
+            dropped = counts["dropped"] if coalesce else 0
+            print(f"{name:<14} {elapsed:>8.2f} {rows:>10,} {emails:>9,} {merged:>8,} {dropped:>8,}")
+
+
+if __name__ == "__main__":
+    main()
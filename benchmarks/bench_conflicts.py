@@ -0,0 +1,60 @@
+# Benchmark: schedule conflict detection
+#
+# Builds the ConflictEngine over a generated university: a sweep line over all
+# weekly meetings finds every overlapping pair of sections, then every
+# student's, room's and professor's sections are checked against it. Then
+# moves random sections to new slots and rooms one at a time and times the
+# incremental re-check against rebuilding the engine from scratch.
+#
+# Usage:
+#   python -m benchmarks.bench_conflicts
+#   python -m benchmarks.bench_conflicts --students 200000 --sections 10000 --moves 500
+
+import argparse
+import time
+
+import numpy as np
+
+from components.conflicts import ConflictEngine
+from utils.data_generator import MEETING_DAYS, START_HOURS, generate_university
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark schedule conflict detection")
+    parser.add_argument("--students", type=int, default=100000)
+    parser.add_argument("--sections", type=int, default=5000)
+    parser.add_argument("--moves", type=int, default=200, help="Sections moved one at a time")
+    args = parser.parse_args()
+
+    courses, students, professors = generate_university(args.students, args.sections)
+    start = time.perf_counter()
+    engine = ConflictEngine(courses, students, professors)
+    built = time.perf_counter() - start
+    counts = engine.counts()
+    print(f"{len(courses):,} sections, {len(students):,} students: {len(engine._pairs):,} overlapping section pairs")
+    print(f"full check in {built:.2f} s: " + ", ".join(f"{n:,} {kind} conflicts" for kind, n in counts.items()))
+
+    rng = np.random.default_rng(7)
+    timings, changed = [], 0
+    for course_id in rng.choice(len(courses), size=args.moves, replace=False) + 1:
+        course = dict(courses[course_id - 1])
+        hour = int(rng.choice(START_HOURS))
+        course["meeting_days"] = list(MEETING_DAYS[rng.integers(len(MEETING_DAYS))])
+        course["start_time"], course["end_time"] = f"{hour:02d}:00", f"{hour + 1:02d}:15"
+        course["building"], course["room"] = int(rng.integers(1, 25)), int(rng.integers(101, 131))
+        start = time.perf_counter()
+        added, removed = engine.move_section(course)
+        timings.append((time.perf_counter() - start) * 1000)
+        changed += len(added) + len(removed)
+        courses[course_id - 1] = course
+    print(f"moved {args.moves} sections: p50 {np.percentile(timings, 50):.1f} ms, "
+          f"p99 {np.percentile(timings, 99):.1f} ms per re-check ({changed:,} conflicts added or removed)")
+
+    start = time.perf_counter()
+    rebuilt = ConflictEngine(courses, students, professors)
+    print(f"rebuild after the moves: {time.perf_counter() - start:.2f} s")
+    assert rebuilt.counts() == engine.counts()
+
+
+if __name__ == "__main__":
+    main()
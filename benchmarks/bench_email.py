@@ -0,0 +1,105 @@
+# Benchmark: bulk email delivery
+#
+# Queues a semester's worth of absence warnings in a fresh outbox and delivers
+# them to a local SMTP stand-in (utils.smtp_sink, in its own process) with a
+# small per-message delay and a few temporary failures. Reports messages per second and SMTP
+# connections opened for the worker pool with kept-open connections, and for
+# the same pool opening a new connection per message. The per-domain rate
+# limit is lifted so the numbers show delivery throughput.
+#
+# Usage:
+#   python -m benchmarks.bench_email
+#   python -m benchmarks.bench_email --messages 20000 --workers 8 --latency 0.002
+
+import argparse
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from config import BASE_DIR
+from utils.email_sender import DomainRateLimiter, EmailSender, Outbox
+
+DOMAINS = ["students.university.edu", "alumni.university.edu", "gmail.com", "outlook.com", "yahoo.com"]
+
+
+def _messages(count):
+    """Return `count` warning emails spread over a few recipient domains"""
+    return [
+        {
+            "recipient": f"s{n:06d}@{DOMAINS[n % len(DOMAINS)]}",
+            "subject": "Attendance warning",
+            "body": f"Student {n}: you are one absence away from the limit in CS{100 + n % 50}.",
+        }
+        for n in range(count)
+    ]
+
+
+def _wait_for_port(port, timeout=10.0):
+    """Block until something accepts connections on localhost:port"""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.05)
+
+
+def _run(args, messages_per_connection, directory):
+    """Deliver the messages once and return (seconds, sender stats)"""
+    outbox = Outbox(Path(directory) / f"outbox-{messages_per_connection}.sqlite3")
+    outbox.enqueue(_messages(args.messages))
+    sender = EmailSender(
+        outbox, host="127.0.0.1", port=args.port, workers=args.workers,
+        limiter=DomainRateLimiter(rate=1e9, burst=1e9),
+        messages_per_connection=messages_per_connection,
+        retry_base=0.05, retry_max=0.5,  # the point here is throughput, not politeness
+    )
+
+    start = time.perf_counter()
+    sender.start()
+    sender.drain()
+    elapsed = time.perf_counter() - start
+    sender.stop()
+    stats = sender.stats()
+    outbox.close()
+    return elapsed, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark bulk email delivery against a local SMTP sink")
+    parser.add_argument("--messages", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.001, help="Sink delay per message (seconds)")
+    parser.add_argument("--fail-rate", type=float, default=0.01, help="Fraction answered with a temporary 451")
+    parser.add_argument("--port", type=int, default=2599)
+    args = parser.parse_args()
+
+    sink = subprocess.Popen(
+        [sys.executable, "-m", "utils.smtp_sink", "--port", str(args.port),
+         "--latency", str(args.latency), "--fail-rate", str(args.fail_rate)],
+        cwd=BASE_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+    print(f"{args.messages} messages, {args.workers} workers, {args.latency * 1000:g} ms per message at the server, "
+          f"{args.fail_rate:.0%} temporary failures")
+    print(f"\n{'mode':<24} {'msgs/s':>8} {'connections':>12} {'retried':>8} {'failed':>7}")
+    try:
+        _wait_for_port(args.port)
+        with tempfile.TemporaryDirectory() as directory:
+            for name, per_connection in [("kept-open connections", 1000), ("connect per message", 1)]:
+                elapsed, stats = _run(args, per_connection, directory)
+                print(f"{name:<24} {stats['sent'] / elapsed:>8,.0f} {stats['connections']:>12} "
+                      f"{stats['retried']:>8} {stats['failed']:>7}")
+    finally:
+        sink.terminate()
+        sink.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# Benchmark: geolocation check-in validation
+#
+# Simulates a campus-wide class change: every section that meets that day and
+# starts at the top of the hour receives location check-ins at once, most from inside the classroom
+# radius, some from elsewhere on campus and some after the window closes. Times
+# the vectorized ClassroomIndex.validate pass against validating the same scans
+# one request at a time with a scalar haversine.
+#
+# Usage:
+#   python -m benchmarks.bench_geo_checkins
+#   python -m benchmarks.bench_geo_checkins --checkins 1000000
+
+import argparse
+import math
+import time
+from datetime import date
+
+import numpy as np
+
+from components.attendance import date_to_day
+from components.checkin import session_start, session_window
+from components.geolocation import GEO_OK, ClassroomIndex, EARTH_RADIUS_METERS, classroom_for_course
+from components.sessions import SessionTable
+from config import CHECKIN_RADIUS_METERS
+from utils.data_generator import generate_university
+
+SESSION_DATE = date(2025, 3, 3)
+
+
+def _burst(courses, table, count, rng):
+    """Return (course_ids, lats, lons, timestamps) for a top-of-the-hour burst"""
+    meeting = table.count([c["id"] for c in courses], SESSION_DATE, SESSION_DATE)
+    starting = [c for c, held in zip(courses, meeting) if held and session_start(c, SESSION_DATE).hour == 9]
+    picks = rng.integers(len(starting), size=count)
+    rooms = [classroom_for_course(c) for c in starting]
+    lat = np.array([r["lat"] for r in rooms])[picks]
+    lon = np.array([r["lon"] for r in rooms])[picks]
+
+    # Jitter: most within ~60 m, 10% anywhere within ~1 km
+    spread = np.where(rng.random(count) < 0.9, 60, 1000)
+    lat = lat + np.degrees(rng.uniform(-1, 1, count) * spread / EARTH_RADIUS_METERS)
+    lon = lon + np.degrees(rng.uniform(-1, 1, count) * spread / EARTH_RADIUS_METERS / math.cos(math.radians(lat[0])))
+
+    start = session_start(starting[0], SESSION_DATE).timestamp()
+    timestamps = (start + rng.integers(-600, 1200, size=count)).astype(np.int64)
+    course_ids = np.array([c["id"] for c in starting])[picks]
+    return course_ids, lat, lon, timestamps
+
+
+def _validate_one(courses_by_id, table, course_id, lat, lon, timestamp):
+    """Per-request validation: scalar haversine, session and window for a single scan"""
+    course = courses_by_id[course_id]
+    room = classroom_for_course(course)
+    p1, p2 = math.radians(lat), math.radians(room["lat"])
+    dp, dl = p2 - p1, math.radians(room["lon"] - lon)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    if 2 * EARTH_RADIUS_METERS * math.asin(math.sqrt(a)) > CHECKIN_RADIUS_METERS:
+        return False
+    if date_to_day(SESSION_DATE) not in table.days_for(course_id).tolist():
+        return False
+    opens, _, closes = session_window(course, SESSION_DATE)
+    return opens <= timestamp <= closes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batch geolocation check-in validation")
+    parser.add_argument("--checkins", type=int, default=200000)
+    parser.add_argument("--sections", type=int, default=5000)
+    parser.add_argument("--loop-sample", type=int, default=20000, help="Scans timed with the per-request loop")
+    args = parser.parse_args()
+
+    courses, _, _ = generate_university(students=1000, sections=args.sections)
+    table = SessionTable(courses, SESSION_DATE.year)
+    index = ClassroomIndex(courses, table_for=lambda year: table)
+    course_ids, lats, lons, timestamps = _burst(courses, table, args.checkins, np.random.default_rng(3))
+
+    start = time.perf_counter()
+    reasons, _ = index.validate(course_ids, lats, lons, timestamps)
+    vectorized = time.perf_counter() - start
+
+    sample = min(args.loop_sample, args.checkins)
+    start = time.perf_counter()
+    looped = [
+        _validate_one(index.courses_by_id, table, int(c), float(la), float(lo), int(t))
+        for c, la, lo, t in zip(course_ids[:sample], lats[:sample], lons[:sample], timestamps[:sample])
+    ]
+    per_request = (time.perf_counter() - start) / sample
+
+    agree = np.array(looped) == (reasons[:sample] == GEO_OK)
+    print(f"{args.checkins} check-ins across {len(np.unique(course_ids))} sections, {(reasons == GEO_OK).mean():.1%} accepted")
+    print(f"vectorized batch: {vectorized * 1000:.1f} ms ({args.checkins / vectorized:,.0f} check-ins/s)")
+    print(f"per-request loop: {per_request * args.checkins * 1000:.1f} ms projected ({1 / per_request:,.0f} check-ins/s)")
+    print(f"results agree on {agree.mean():.2%} of the sampled scans")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# Benchmark: notification inbox
+#
+# Fills a fresh inbox with a term's worth of reminders and warnings for many
+# users, then times what the dashboard does on every rerun (first page plus the
+# unread count) against reading the whole inbox and counting unread rows, and
+# times marking a whole inbox read.
+#
+# Usage:
+#   python -m benchmarks.bench_inbox
+#   python -m benchmarks.bench_inbox --users 5000 --per-user 400
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from components.notifications import NotificationInbox
+
+
+def _timed(fn, repeat):
+    """Return the median milliseconds of `repeat` calls"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return float(np.median(samples))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark notification inbox pages and unread counts")
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--per-user", type=int, default=300, help="Notifications per user (a term of reminders)")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        inbox = NotificationInbox(Path(directory) / "notifications.sqlite3")
+        total = args.users * args.per_user
+        start = time.perf_counter()
+        for day in range(args.per_user):
+            # One reminder per user per day, written in one batch like the scheduler does
+            inbox.add(
+                ({"user_id": user, "title": "Class Reminder", "message": f"Day {day}: class starts in 30 minutes.",
+                  "kind": "class_reminder"} for user in range(1, args.users + 1)),
+                now=1.7e9 + day * 86400,
+            )
+        print(f"stored {total:,} notifications for {args.users:,} users in {time.perf_counter() - start:.1f} s")
+
+        user = args.users // 2
+        inbox.mark_read("student", user, [n["id"] for n in inbox.page("student", user, limit=args.per_user // 2)[0]])
+
+        def first_page():
+            inbox.page("student", user)
+            inbox.unread_count("student", user)
+
+        def whole_inbox():
+            items, cursor = inbox.page("student", user, limit=10 ** 9)
+            sum(not n["read"] for n in items)
+
+        def scan_count():
+            with inbox._lock:
+                inbox._conn.execute(
+                    "SELECT COUNT(*) FROM notifications WHERE role = 'student' AND user_id = ? AND read = 0", (user,)
+                ).fetchone()
+
+        print(f"first page + unread counter: {_timed(first_page, args.repeat):.3f} ms")
+        print(f"whole inbox + count in Python: {_timed(whole_inbox, args.repeat):.3f} ms")
+        print(f"unread COUNT(*) over the inbox: {_timed(scan_count, args.repeat):.3f} ms")
+
+        start = time.perf_counter()
+        changed = inbox.mark_read("student", user + 1)
+        print(f"mark all read: {changed} notifications in {(time.perf_counter() - start) * 1000:.2f} ms, "
+              f"unread now {inbox.unread_count('student', user + 1)}")
+        inbox.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+# Benchmark: page rerun latency
+#
+# Drives app.py headlessly with Streamlit's AppTest through every role and tab
+# (student/professor x Dashboard/Attendance/Schedule/AI Assistant/Settings) at
+# several synthetic data scales. Reports p50/p95 rerun latency and peak Python
+# memory per path, and can save or compare against a baseline JSON file.
+#
+# Each scale runs in its own subprocess so module-level caches and memory peaks
+# don't leak between scales.
+#
+# Usage:
+#   python -m benchmarks.bench_pages                       # print results
+#   python -m benchmarks.bench_pages --save                # write the baseline
+#   python -m benchmarks.bench_pages --compare             # diff against the baseline
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+import types
+
+import numpy as np
+
+from config import BASE_DIR, DATA_DIR
+
+SCALES = {
+    "demo": None,
+    "1k": {"students": 1000, "sections": 50},
+    "10k": {"students": 10000, "sections": 500},
+    "100k": {"students": 100000, "sections": 5000},
+}
+ROLES = ["Student", "Professor"]
+TABS = ["Dashboard", "Attendance", "Schedule", "AI Assistant", "Settings"]
+BASELINE_PATH = BASE_DIR / "benchmarks" / "baselines" / "pages.json"
+
+
+def _dataset_dir(scale):
+    """Generate (once) and return the dataset directory for a scale"""
+    from utils.data_generator import write_university
+
+    directory = DATA_DIR / "bench" / scale
+    if not (directory / "catalog.json").exists():
+        write_university(str(directory), **SCALES[scale])
+    return directory
+
+
+def _install_menu_stub(selected):
+    """Replace the option_menu component, which AppTest cannot click, with a fixed choice"""
+    stub = types.ModuleType("streamlit_option_menu")
+    stub.option_menu = lambda *args, **kwargs: selected["tab"]
+    sys.modules["streamlit_option_menu"] = stub
+
+
+def _run_scale(runs):
+    """Benchmark every path in this process and return {path: stats}"""
+    from streamlit.testing.v1 import AppTest
+
+    selected = {"tab": TABS[0]}
+    _install_menu_stub(selected)
+    app_path = str(BASE_DIR / "app.py")
+
+    def open_app(role):
+        at = AppTest.from_file(app_path, default_timeout=600).run()
+        if role is not None:
+            at.sidebar.selectbox[0].select(role).run()
+        return at
+
+    # The first run pays for imports and for loading the catalog and store
+    start = time.perf_counter()
+    open_app(None)
+    results = {"cold start": {"first_run_ms": (time.perf_counter() - start) * 1000}}
+
+    paths = [(None, "Welcome")] + [(role, tab) for role in ROLES for tab in TABS]
+    for role, tab in paths:
+        selected["tab"] = tab
+        at = open_app(role)
+        if at.exception:
+            raise RuntimeError(f"{role}/{tab}: {at.exception[0].message}")
+
+        samples = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            at.run()
+            samples.append((time.perf_counter() - start) * 1000)
+
+        tracemalloc.start()
+        at.run()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        name = "welcome" if role is None else f"{role.lower()}/{tab}"
+        results[name] = {
+            "p50_ms": round(float(np.percentile(samples, 50)), 2),
+            "p95_ms": round(float(np.percentile(samples, 95)), 2),
+            "peak_mem_mb": round(peak / 1e6, 2),
+        }
+    return results
+
+
+def _spawn(scale, runs):
+    """Run one scale in a fresh interpreter and return its results"""
+    env = dict(os.environ)
+    env.pop("CLASSTRACKER_DATASET", None)
+    if SCALES[scale] is not None:
+        env["CLASSTRACKER_DATASET"] = str(_dataset_dir(scale))
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_pages", "--worker", "--runs", str(runs)],
+        cwd=BASE_DIR, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def _print(results, baseline):
+    """Print results, with the change against the baseline when one is given"""
+    for scale, paths in results.items():
+        print(f"\n== scale: {scale}")
+        print(f"{'path':<26} {'p50 ms':>9} {'p95 ms':>9} {'peak MB':>9}  vs baseline p50")
+        for name, stats in paths.items():
+            if "first_run_ms" in stats:
+                print(f"{name:<26} {stats['first_run_ms']:>9.1f}")
+                continue
+            line = f"{name:<26} {stats['p50_ms']:>9.2f} {stats['p95_ms']:>9.2f} {stats['peak_mem_mb']:>9.2f}"
+            base = baseline.get(scale, {}).get(name)
+            if base:
+                change = (stats["p50_ms"] - base["p50_ms"]) / base["p50_ms"] * 100 if base["p50_ms"] else 0.0
+                line += f"  {change:+.1f}%"
+            print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark app.py reruns per role and tab")
+    parser.add_argument("--scales", default="demo,1k,10k", help=f"Comma-separated subset of {', '.join(SCALES)}")
+    parser.add_argument("--runs", type=int, default=10, help="Timed reruns per path")
+    parser.add_argument("--baseline", default=str(BASELINE_PATH))
+    parser.add_argument("--save", action="store_true", help="Write results as the new baseline")
+    parser.add_argument("--compare", action="store_true", help="Show change against the baseline")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(_run_scale(args.runs)))
+        return
+
+    results = {scale: _spawn(scale, args.runs) for scale in args.scales.split(",")}
+
+    baseline = {}
+    if args.compare and os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    _print(results, baseline)
+
+    if args.save:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"\nSaved baseline to {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
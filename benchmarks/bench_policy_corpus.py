@@ -0,0 +1,72 @@
+# Benchmark: policy text per chatbot question
+#
+# Times getting the attendance policy text for a question from the shared,
+# mtime-checked policy corpus against scanning the directory and re-reading
+# the file each time, over a generated library of policy documents.
+#
+# Usage:
+#   python -m benchmarks.bench_policy_corpus
+#   python -m benchmarks.bench_policy_corpus --documents 200 --questions 20000
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from components.policies import PolicyCorpus
+from config import POLICIES_DIR
+
+
+def read_per_question(directory):
+    """Scan the directory and read the first attendance file, as every question used to"""
+    for filename in os.listdir(directory):
+        if "attendance" in filename.lower() and filename.endswith((".txt", ".md")):
+            with open(os.path.join(directory, filename), "r", encoding="utf-8") as file:
+                return file.read()
+    return ""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark policy text lookups per question")
+    parser.add_argument("--documents", type=int, default=50, help="Other policy documents in the library")
+    parser.add_argument("--questions", type=int, default=10000)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    try:
+        shutil.copy(os.path.join(POLICIES_DIR, "attendance_policy.txt"), directory)
+        with open(os.path.join(POLICIES_DIR, "attendance_policy.txt"), encoding="utf-8") as file:
+            sample = file.read()
+        for n in range(args.documents):
+            with open(os.path.join(directory, f"policy_{n:03d}.md"), "w", encoding="utf-8") as file:
+                file.write(sample * 20)
+
+        start = time.perf_counter()
+        for _ in range(args.questions):
+            read_per_question(directory)
+        uncached = (time.perf_counter() - start) / args.questions * 1e6
+
+        corpus = PolicyCorpus(directory)
+        start = time.perf_counter()
+        corpus.text("attendance")
+        first = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        for _ in range(args.questions):
+            corpus.text("attendance")
+        cached = (time.perf_counter() - start) / args.questions * 1e6
+        print(f"{args.documents + 1} documents: first load {first:.1f} ms, then {cached:.1f} us per question "
+              f"vs {uncached:.0f} us scanning and reading per question ({corpus.stats['checks']} directory checks)")
+
+        checker = PolicyCorpus(directory, recheck_seconds=0)
+        checker.text("attendance")
+        start = time.perf_counter()
+        for _ in range(args.questions):
+            checker.text("attendance")
+        print(f"checking the directory on every question: {(time.perf_counter() - start) / args.questions * 1e6:.0f} us")
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
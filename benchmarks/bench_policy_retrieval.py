@@ -0,0 +1,92 @@
+# Benchmark: policy retrieval for the assistant
+#
+# Builds a policy library of the real attendance policy plus generated
+# documents, indexes it by section, and compares sending the top-k sections
+# against sending every document: prompt size, index build time and query
+# latency for the NumPy index (and chromadb, if installed). Also checks that
+# the expected attendance section still ranks first among the distractors.
+#
+# Usage:
+#   python -m benchmarks.bench_policy_retrieval
+#   python -m benchmarks.bench_policy_retrieval --documents 100 --queries 5000
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+from components.policy_index import build_policy_index
+from config import DEMO_SEED, POLICIES_DIR, POLICY_TOP_K
+from utils.pdf_processor import load_policy_documents
+
+TOPICS = ["grading", "housing", "library", "parking", "conduct", "registration", "tuition", "privacy",
+          "research", "technology", "travel", "dining", "health", "employment", "graduation", "transfer"]
+WORDS = ("student faculty office committee request form deadline semester term department review "
+         "approval record fee credit course program campus building access account report schedule "
+         "official notice appeal document requirement eligibility period payment refund support").split()
+
+QUESTIONS = {
+    "What happens if I arrive late to class?": "4",
+    "How do I get an absence excused for illness?": "3",
+    "How many absences are allowed before I fail?": "2",
+    "When is make-up work due?": "5",
+    "Who do I appeal an attendance decision to?": "6",
+}
+
+
+def generate_library(count, seed=DEMO_SEED):
+    """Return generated policy documents with numbered sections"""
+    rng = np.random.default_rng(seed)
+    documents = []
+    for n in range(count):
+        topic = TOPICS[n % len(TOPICS)]
+        lines = [f"UNIVERSITY {topic.upper()} POLICY {n}", ""]
+        for section in range(1, 9):
+            lines += [f"{section}. {topic.title()} {rng.choice(WORDS).title()} Rules", ""]
+            for paragraph in range(1, 4):
+                words = rng.choice(WORDS + [topic] * 4, size=40)
+                lines += [f"{section}.{paragraph} " + " ".join(words) + ".", ""]
+        documents.append({"name": f"{topic}_{n:03d}.txt", "path": "", "text": "\n".join(lines)})
+    return documents
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark policy retrieval")
+    parser.add_argument("--documents", type=int, default=40, help="Generated documents besides the attendance policy")
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+
+    documents = load_policy_documents(POLICIES_DIR) + generate_library(args.documents)
+    full_prompt = sum(len(d["text"]) for d in documents)
+    questions = list(QUESTIONS)
+
+    backends = ["numpy"]
+    try:
+        import chromadb  # noqa: F401
+        backends.append("chroma")
+    except ImportError:
+        print("chromadb not installed; timing the NumPy index only")
+
+    for backend in backends:
+        start = time.perf_counter()
+        index = build_policy_index(documents, backend=backend, version=f"bench-{os.getpid()}")
+        built = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        for n in range(args.queries):
+            index.search(questions[n % len(questions)], POLICY_TOP_K)
+        query = (time.perf_counter() - start) / args.queries * 1e6
+
+        hits, prompt = 0, 0
+        for question, section in QUESTIONS.items():
+            found = index.search(question, POLICY_TOP_K)
+            prompt += sum(len(f["text"]) for f in found) / len(QUESTIONS)
+            hits += bool(found) and found[0]["document"] == "attendance_policy.txt" and found[0]["section"] == section
+        print(f"{backend}: {len(index):,} sections from {len(documents)} documents indexed in {built:.0f} ms, "
+              f"{query:.0f} us per query, expected section first for {hits}/{len(QUESTIONS)} questions")
+    print(f"prompt policy text: top {POLICY_TOP_K} sections {prompt:,.0f} chars vs whole library {full_prompt:,} chars")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# Benchmark: check-in QR code rendering
+#
+# Compares rendering a check-in QR code from scratch (what every rerun of the
+# projector view used to do) with serving it from the shared QR cache, for both
+# PNG and SVG output, and checks that a day's worth of sessions stays within
+# the cache's byte limit.
+#
+# Usage:
+#   python -m benchmarks.bench_qr_codes
+#   python -m benchmarks.bench_qr_codes --sessions 2000
+
+import argparse
+import time
+
+import numpy as np
+
+from utils.checkin_tokens import make_checkin_token
+from utils.qr_codes import QRCodeCache, QR_FORMATS, render_qr
+
+
+def _time_ms(func, repeat):
+    """Return per-call milliseconds for `repeat` calls"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return np.asarray(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark check-in QR rendering and caching")
+    parser.add_argument("--repeat", type=int, default=50, help="Timed calls per case")
+    parser.add_argument("--sessions", type=int, default=500, help="Distinct sessions for the eviction check")
+    args = parser.parse_args()
+
+    payload = make_checkin_token(1, "2025-03-03")
+    print(f"{'case':<18} {'p50 ms':>9} {'p95 ms':>9}")
+    for fmt in QR_FORMATS:
+        cache = QRCodeCache()
+        cache.get(payload, fmt)
+        for name, func in [
+            (f"{fmt} render", lambda: render_qr(payload, fmt)),
+            (f"{fmt} cache hit", lambda: cache.get(payload, fmt)),
+        ]:
+            samples = _time_ms(func, args.repeat)
+            print(f"{name:<18} {np.percentile(samples, 50):>9.3f} {np.percentile(samples, 95):>9.3f}")
+
+    # Many distinct sessions through a small cache: size must stay bounded
+    cache = QRCodeCache(max_bytes=1024 * 1024)
+    start = time.perf_counter()
+    for i in range(args.sessions):
+        cache.get(make_checkin_token(i % 5000 + 1, f"2025-03-{i % 28 + 1:02d}"))
+    elapsed = time.perf_counter() - start
+    stats = cache.stats()
+    print(f"\n{args.sessions} sessions through a 1 MB cache in {elapsed:.2f} s: "
+          f"{stats['entries']} entries, {stats['bytes'] / 1024:.0f} KB kept")
+
+
+if __name__ == "__main__":
+    main()
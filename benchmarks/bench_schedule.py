@@ -0,0 +1,73 @@
+# Benchmark: schedule index queries
+#
+# Builds the ScheduleIndex over a generated catalog and times the queries the
+# views make: a student's meetings on one date ("Today's Classes") and a
+# user's whole week (the weekly grid), plus the campus-wide "what is in session
+# right now". Each is compared with working the same answer out from the
+# course records per call.
+#
+# Usage:
+#   python -m benchmarks.bench_schedule
+#   python -m benchmarks.bench_schedule --students 200000 --sections 10000
+
+import argparse
+import time
+from datetime import date, datetime
+
+from components.schedule import ScheduleIndex, meeting_pattern, session_end, session_start
+from utils.data_generator import generate_university
+
+DAY = date(2025, 3, 3)
+NOW = datetime(2025, 3, 3, 10, 30)
+
+
+def _per_call(fn, items):
+    """Return microseconds per item"""
+    start = time.perf_counter()
+    for item in items:
+        fn(item)
+    return (time.perf_counter() - start) / len(items) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark schedule index queries")
+    parser.add_argument("--students", type=int, default=100000)
+    parser.add_argument("--sections", type=int, default=5000)
+    parser.add_argument("--sample", type=int, default=20000, help="Students queried")
+    args = parser.parse_args()
+
+    courses, students, _ = generate_university(args.students, args.sections)
+    courses_by_id = {c["id"]: c for c in courses}
+    start = time.perf_counter()
+    index = ScheduleIndex(courses)
+    print(f"indexed {len(index):,} weekly meetings of {len(courses):,} sections in "
+          f"{(time.perf_counter() - start) * 1000:.1f} ms")
+
+    sample = [s["courses"] for s in students[:args.sample]]
+
+    def today_records(course_ids):
+        meetings = []
+        for course in (courses_by_id[c] for c in course_ids):
+            if DAY.weekday() in meeting_pattern(course)["days"]:
+                meetings.append((session_start(course, DAY), session_end(course, DAY), course))
+        return sorted(meetings, key=lambda m: m[0])
+
+    print(f"today's classes: index {_per_call(lambda c: index.on_date(c, DAY), sample):.1f} us, "
+          f"from records {_per_call(today_records, sample):.1f} us per student")
+    print(f"weekly grid:     index {_per_call(index.week, sample):.1f} us per student")
+
+    def in_session_scan(when):
+        minute = when.hour * 60 + when.minute
+        return [
+            c["id"] for c in courses
+            if when.weekday() in (p := meeting_pattern(c))["days"] and p["start"] <= minute < p["end"]
+        ]
+
+    now_ids = index.meeting_now(NOW)
+    assert sorted(now_ids) == sorted(in_session_scan(NOW))
+    print(f"in session now ({len(now_ids)} sections): index {_per_call(index.meeting_now, [NOW] * 200):.1f} us, "
+          f"scan {_per_call(in_session_scan, [NOW] * 20):.1f} us")
+
+
+if __name__ == "__main__":
+    main()
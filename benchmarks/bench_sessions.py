@@ -0,0 +1,83 @@
+# Benchmark: session date materialization
+#
+# Builds a year's SessionTable over a generated catalog and compares it with
+# walking the calendar day by day per section (checking the weekday and the
+# breaks for every date). Then times the lookups the views make: one student's
+# sessions so far this term (attendance history) and held/remaining counts for
+# every section at once (stats and at-risk checks).
+#
+# Usage:
+#   python -m benchmarks.bench_sessions
+#   python -m benchmarks.bench_sessions --sections 20000 --year 2025
+
+import argparse
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+from components.schedule import meeting_pattern
+from components.sessions import SessionTable
+from utils.data_generator import generate_university
+from utils.time_utils import academic_calendar
+
+
+def _loop_sessions(course, year, calendar):
+    """Return a section's session dates by checking every day of the year"""
+    terms = [(e["start"], e["end"]) for e in calendar if e["kind"] == "term"]
+    breaks = [(e["start"], e["end"]) for e in calendar if e["kind"] == "break"]
+    days = meeting_pattern(course)["days"]
+    sessions = []
+    day = date(year, 1, 1)
+    while day.year == year:
+        if (day.weekday() in days and any(s <= day <= e for s, e in terms)
+                and not any(s <= day <= e for s, e in breaks)):
+            sessions.append(day)
+        day += timedelta(days=1)
+    return sessions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark session date materialization")
+    parser.add_argument("--students", type=int, default=20000)
+    parser.add_argument("--sections", type=int, default=5000)
+    parser.add_argument("--year", type=int, default=2025)
+    parser.add_argument("--sample", type=int, default=5000, help="Students queried")
+    args = parser.parse_args()
+
+    courses, students, _ = generate_university(args.students, args.sections)
+    calendar = academic_calendar(args.year)
+    fall = next(e for e in calendar if e["period"] == "Fall Semester")
+    today = fall["start"] + timedelta(days=45)
+
+    start = time.perf_counter()
+    table = SessionTable(courses, args.year)
+    built = time.perf_counter() - start
+    print(f"materialized {len(table):,} sessions of {len(courses):,} sections in {built * 1000:.1f} ms")
+
+    loop_courses = courses[:max(len(courses) // 20, 1)]
+    start = time.perf_counter()
+    looped = [_loop_sessions(c, args.year, calendar) for c in loop_courses]
+    per_section = (time.perf_counter() - start) / len(loop_courses)
+    print(f"day-by-day loop: {per_section * len(courses) * 1000:.0f} ms for all sections "
+          f"(extrapolated from {len(loop_courses):,})")
+    for course, dates in zip(loop_courses[:50], looped):
+        expected = np.array([(d - date(1970, 1, 1)).days for d in dates])
+        assert np.array_equal(table.days_for(course["id"]), expected)
+
+    sample = [s["courses"] for s in students[:args.sample]]
+    start = time.perf_counter()
+    for course_ids in sample:
+        table.expand(course_ids, fall["start"], today)
+    print(f"a student's sessions so far this term: {(time.perf_counter() - start) / len(sample) * 1e6:.1f} us")
+
+    ids = np.array([c["id"] for c in courses])
+    start = time.perf_counter()
+    held = table.count(ids, fall["start"], today)
+    left = table.count(ids, today + timedelta(days=1), fall["end"])
+    print(f"held/left counts for every section: {(time.perf_counter() - start) * 1000:.2f} ms "
+          f"({int(held.sum()):,} held, {int(left.sum()):,} left)")
+
+
+if __name__ == "__main__":
+    main()
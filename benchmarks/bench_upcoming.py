@@ -0,0 +1,84 @@
+# Benchmark: next-class lookups and batch countdowns
+#
+# Builds each sampled student's UpcomingSessions over a generated catalog and
+# times the dashboard questions ("rest of today", "in progress", "next class")
+# against looping over the student's courses and building today's start and
+# end times for each. Then formats countdowns for a batch of session starts
+# with get_times_until against get_time_until called once per string.
+#
+# Usage:
+#   python -m benchmarks.bench_upcoming
+#   python -m benchmarks.bench_upcoming --sample 20000 --countdowns 500000
+
+import argparse
+import time
+from datetime import datetime, timedelta
+
+from components.schedule import meeting_pattern, session_end, session_start
+from components.sessions import SessionTable, UpcomingSessions
+from utils.data_generator import generate_university
+from utils.time_utils import get_time_until, get_times_until
+
+NOW = datetime(2025, 10, 7, 11, 20)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark next-class lookups and batch countdowns")
+    parser.add_argument("--students", type=int, default=20000)
+    parser.add_argument("--sections", type=int, default=2000)
+    parser.add_argument("--sample", type=int, default=5000, help="Students queried")
+    parser.add_argument("--countdowns", type=int, default=100000, help="Countdowns formatted in one batch")
+    args = parser.parse_args()
+
+    courses, students, _ = generate_university(args.students, args.sections)
+    courses_by_id = {c["id"]: c for c in courses}
+    table = SessionTable(courses, NOW.year)
+    sample = [[courses_by_id[c] for c in s["courses"]] for s in students[:args.sample]]
+
+    start = time.perf_counter()
+    upcoming = [UpcomingSessions(user_courses, NOW.date(), table_for=lambda year: table) for user_courses in sample]
+    print(f"built {len(upcoming):,} users' upcoming sessions in "
+          f"{(time.perf_counter() - start) / len(upcoming) * 1e6:.0f} us per user")
+
+    def loop(user_courses):
+        today = []
+        for course in user_courses:
+            if NOW.weekday() in meeting_pattern(course)["days"]:
+                begins, ends = session_start(course, NOW.date()), session_end(course, NOW.date())
+                if ends > NOW:
+                    today.append((begins, course, begins <= NOW))
+        return sorted(today, key=lambda m: m[0])
+
+    start = time.perf_counter()
+    for user in upcoming:
+        user.remaining_today(NOW)
+        user.in_progress(NOW)
+        user.next_class(NOW)
+    indexed = (time.perf_counter() - start) / len(upcoming) * 1e6
+    start = time.perf_counter()
+    for user_courses in sample:
+        loop(user_courses)
+    looped = (time.perf_counter() - start) / len(sample) * 1e6
+    print(f"today / in progress / next: sorted arrays {indexed:.1f} us, course loop (today only) {looped:.1f} us per user")
+
+    starts = [NOW + timedelta(minutes=7 * n) for n in range(args.countdowns)]
+    strings = [s.strftime("%Y-%m-%d %H:%M:%S") for s in starts]
+    start = time.perf_counter()
+    batch = get_times_until(strings, NOW)
+    vectorized = time.perf_counter() - start
+    start = time.perf_counter()
+    unix = get_times_until([s.timestamp() for s in starts], NOW)
+    vectorized_unix = time.perf_counter() - start
+    assert (batch == unix).all()
+    print(f"{args.countdowns:,} countdowns: batch from strings {vectorized * 1000:.0f} ms, "
+          f"from Unix times {vectorized_unix * 1000:.0f} ms")
+    sample_size = min(args.countdowns, 20000)
+    start = time.perf_counter()
+    for value in strings[:sample_size]:
+        get_time_until(value)
+    one_by_one = (time.perf_counter() - start) / sample_size * args.countdowns
+    print(f"one at a time with strptime: {one_by_one * 1000:.0f} ms (extrapolated from {sample_size:,})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# Benchmark: cold-start import budget
+#
+# Starts a fresh interpreter, imports Streamlit's test harness as the baseline,
+# then runs app.py up to the welcome screen. Fails if any of the heavy optional
+# modules (LLM stack, QR code rendering, charting) were imported along the way,
+# or if the first run took longer than the time budget.
+#
+# Usage:
+#   python -m benchmarks.check_import_budget
+#   python -m benchmarks.check_import_budget --budget-ms 1500
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+import types
+
+from config import BASE_DIR
+
+# Modules that only the views needing them should load
+DEFERRED_MODULES = ["langchain", "langchain_core", "langchain_openai", "openai", "qrcode", "plotly.express"]
+DEFAULT_BUDGET_MS = 2000
+
+
+def _measure():
+    """Run the welcome screen once and return the timing and newly loaded modules"""
+    from streamlit.testing.v1 import AppTest
+
+    stub = types.ModuleType("streamlit_option_menu")
+    stub.option_menu = lambda *args, **kwargs: "Dashboard"
+    sys.modules["streamlit_option_menu"] = stub
+
+    before = set(sys.modules)
+    start = time.perf_counter()
+    at = AppTest.from_file(str(BASE_DIR / "app.py"), default_timeout=120).run()
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+
+    loaded = set(sys.modules) - before
+    return {
+        "elapsed_ms": round(elapsed_ms, 1),
+        "modules_loaded": len(loaded),
+        "deferred_loaded": sorted(m for m in DEFERRED_MODULES if m in loaded),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the welcome screen's cold-start import cost")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(_measure()))
+        return
+
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.check_import_budget", "--worker"],
+        cwd=BASE_DIR, capture_output=True, text=True, check=True
+    ).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+
+    print(f"Welcome screen cold start: {result['elapsed_ms']:.1f} ms, {result['modules_loaded']} modules imported")
+    failures = []
+    if result["deferred_loaded"]:
+        failures.append(f"heavy modules imported eagerly: {', '.join(result['deferred_loaded'])}")
+    if result["elapsed_ms"] > args.budget_ms:
+        failures.append(f"cold start {result['elapsed_ms']:.1f} ms is over the {args.budget_ms:.0f} ms budget")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+# Benchmark: check-in ingestion load generator
+#
+# Starts the check-in server in a separate process against a generated
+# institution, with its clock pinned to the start of the 9:00 AM sessions, then
+# replays a lecture-start burst of QR scans over many keep-alive connections:
+# every enrolled student of those sessions scans once, some scan twice, and a
+# few scans carry an expired token. Reports check-ins per second,
+# request latency percentiles and the server's outcome counters.
+#
+# Usage:
+#   python -m benchmarks.load_checkins
+#   python -m benchmarks.load_checkins --students 50000 --sections 2500 --connections 128
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from datetime import date
+
+import numpy as np
+
+# Client and server process must sign and verify tokens with the same secret
+os.environ.setdefault("CLASSTRACKER_CHECKIN_SECRET", "load-test")
+
+from config import BASE_DIR  # noqa: E402
+
+SESSION_DATE = date(2025, 3, 3)
+RESCAN_RATE = 0.1
+INVALID_RATE = 0.02
+
+
+def _open_courses(courses, session_date):
+    """Return the courses whose check-in window contains 9:00 AM on the session date"""
+    from components.checkin import session_start
+
+    return [c for c in courses if session_start(c, session_date).hour == 9]
+
+
+def _pinned_now(courses):
+    """Return the timestamp both processes treat as now: a minute after 9:00 AM"""
+    from components.checkin import session_start
+
+    return session_start(_open_courses(courses, SESSION_DATE)[0], SESSION_DATE).timestamp() + 60
+
+
+def _serve(args):
+    """Worker: run the check-in server over a fresh store with a pinned clock"""
+    from components.attendance import AttendanceStore
+    from components.catalog import Catalog
+    from components.checkin import CheckinIngestor
+    from components.checkin_queue import CheckinQueue
+    from components.checkin_server import serve
+    from utils.data_generator import generate_university
+
+    catalog = Catalog(*generate_university(args.students, args.sections))
+    store = AttendanceStore()
+    now = _pinned_now(catalog.courses)
+    ingestor = CheckinIngestor(catalog, CheckinQueue(store), clock=lambda: now)
+
+    async def run():
+        task = asyncio.create_task(serve("127.0.0.1", args.port, ingestor))
+        await asyncio.sleep(0.2)
+        print("ready", flush=True)
+        await task
+
+    asyncio.run(run())
+
+
+def _scans(args):
+    """Build the burst of (student_id, payload) scans in arrival order"""
+    from components.catalog import Catalog
+    from utils.checkin_tokens import make_checkin_token
+    from utils.data_generator import generate_university
+
+    catalog = Catalog(*generate_university(args.students, args.sections))
+    now = _pinned_now(catalog.courses)
+    rng = np.random.default_rng(7)
+    session = SESSION_DATE.isoformat()
+    courses = _open_courses(catalog.courses, SESSION_DATE)
+    scans = []
+    for course in courses:
+        payload = make_checkin_token(course["id"], session, now)
+        scans.extend((s["id"], payload) for s in catalog.students_in_course(course["id"]))
+
+    rescans = [scans[i] for i in rng.choice(len(scans), int(len(scans) * RESCAN_RATE))]
+    expired = make_checkin_token(courses[0]["id"], session, now - 600)
+    invalid = [(1, expired)] * int(len(scans) * INVALID_RATE)
+    scans = scans + rescans + invalid
+    order = rng.permutation(len(scans))
+    return [scans[i] for i in order]
+
+
+async def _client(port, queue, latencies):
+    """Send scans from the queue over one keep-alive connection"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        while True:
+            try:
+                student_id, payload = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            body = json.dumps({"student_id": student_id, "payload": payload}).encode()
+            request = (
+                f"POST /checkin HTTP/1.1\r\nHost: localhost\r\n"
+                f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+            ).encode() + body
+            start = time.perf_counter()
+            writer.write(request)
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = int(head.lower().split(b"content-length:")[1].split(b"\r\n")[0])
+            await reader.readexactly(length)
+            latencies.append((time.perf_counter() - start) * 1000)
+    finally:
+        writer.close()
+
+
+async def _health(port):
+    """Fetch the server's counters"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(b"GET /health HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n")
+    response = await reader.read()
+    writer.close()
+    return json.loads(response.split(b"\r\n\r\n", 1)[1])
+
+
+async def _burst(args, scans):
+    """Replay all scans with `connections` concurrent clients"""
+    queue = asyncio.Queue()
+    for scan in scans:
+        queue.put_nowait(scan)
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*[_client(args.port, queue, latencies) for _ in range(args.connections)])
+    elapsed = time.perf_counter() - start
+    await asyncio.sleep(0.2)  # let the committer write its last batch
+    return elapsed, np.asarray(latencies), await _health(args.port)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the check-in endpoint")
+    parser.add_argument("--students", type=int, default=20000)
+    parser.add_argument("--sections", type=int, default=1000)
+    parser.add_argument("--connections", type=int, default=64)
+    parser.add_argument("--port", type=int, default=8599)
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        _serve(args)
+        return
+
+    scans = _scans(args)
+    server = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.load_checkins", "--serve",
+         "--students", str(args.students), "--sections", str(args.sections), "--port", str(args.port)],
+        cwd=BASE_DIR, stdout=subprocess.PIPE, text=True
+    )
+    try:
+        server.stdout.readline()  # "ready"
+        elapsed, latencies, health = asyncio.run(_burst(args, scans))
+    finally:
+        server.terminate()
+        server.wait()
+
+    print(f"{len(scans)} scans over {args.connections} connections in {elapsed:.2f} s "
+          f"({len(scans) / elapsed:,.0f} check-ins/s)")
+    print(f"latency p50 {np.percentile(latencies, 50):.2f} ms, p99 {np.percentile(latencies, 99):.2f} ms")
+    queue = health["queue"]
+    print(f"accepted {health['accepted']}, duplicate {health['duplicate']}, rejected {health['rejected']}, "
+          f"busy {health['busy']}")
+    print(f"store batches {queue['batches']} (mean {queue['mean_batch']:.0f}), "
+          f"commit p99 {queue['p99_commit_ms']:.1f} ms, max queue depth {queue['max_depth']}")
+
+
+if __name__ == "__main__":
+    main()
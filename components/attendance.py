@@ -1,11 +1,509 @@
-# Attendance management component - placeholder for future implementation
+# Attendance management component
+#
+# Attendance marks are kept in an append-only event log. Every column lives in
+# its own NumPy array, and per-student / per-course lookups go through a sorted
+# index so they are slices rather than scans. A correction is just a new event
+# for the same (student, course, session); the superseded row stays in the log
+# but is no longer "current". The log is snapshotted to disk periodically and
+# reloaded when the process starts.
+#
+# Per-(student, course) status counts are materialized alongside the log and
+# kept up to date on every append, so summary tables never re-read raw marks.
 
-def record_attendance(student_id, course_id, status):
-    """Placeholder for recording attendance"""
-    # In a real implementation, this would add an attendance record to the database
+import atexit
+import os
+import threading
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from components.catalog import get_catalog
+from components.schedule import meeting_pattern
+from components.sessions import term_sessions
+from config import ATTENDANCE_SNAPSHOT_EVERY, ATTENDANCE_SNAPSHOT_PATH, DATASET_DIR, DEMO_SEED
+from utils.data_generator import iter_attendance_parts
+from utils.time_utils import midnight_timestamps
+
+STATUSES = ["Present", "Absent", "Late", "Excused"]
+STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+
+_EPOCH = date(1970, 1, 1)
+
+
+def date_to_day(value):
+    """Convert a date/datetime to days since the epoch"""
+    if isinstance(value, datetime):
+        value = value.date()
+    return (value - _EPOCH).days
+
+
+def day_to_date(day):
+    """Convert days since the epoch back to a date"""
+    return date.fromordinal(_EPOCH.toordinal() + int(day))
+
+
+def _mark_keys(student_ids, course_ids, session_days):
+    """Pack (student, course, session) into one int64 per mark.
+
+    Students get 27 bits, courses 20 and session days 16 (good until 2149).
+    """
+    return (
+        (np.asarray(student_ids, dtype=np.int64) << 36)
+        | (np.asarray(course_ids, dtype=np.int64) << 16)
+        | np.asarray(session_days, dtype=np.int64)
+    )
+
+
+def _mark_key(student_id, course_id, session_day):
+    """Pack a single (student, course, session) the same way as _mark_keys"""
+    return (int(student_id) << 36) | (int(course_id) << 16) | int(session_day)
+
+
+class AttendanceAggregates:
+    """Materialized Present/Absent/Late/Excused counts per (student, course)."""
+
+    def __init__(self, capacity=1024):
+        self._counts = np.zeros((capacity, len(STATUSES)), dtype=np.int32)
+        self._pair_students = np.empty(capacity, dtype=np.int32)
+        self._pair_courses = np.empty(capacity, dtype=np.int32)
+        self._pairs = {}            # (student, course) -> row in _counts
+        self._student_pairs = {}    # student -> [row, ...]
+        self._course_pairs = {}     # course -> [row, ...]
+
+    def _pair_row(self, student_id, course_id):
+        """Return the counts row for a pair, allocating one if needed"""
+        row = self._pairs.get((student_id, course_id))
+        if row is not None:
+            return row
+
+        row = len(self._pairs)
+        if row == len(self._counts):
+            capacity = 2 * row
+            self._counts = np.concatenate([self._counts, np.zeros_like(self._counts)])
+            self._pair_students = np.resize(self._pair_students, capacity)
+            self._pair_courses = np.resize(self._pair_courses, capacity)
+        self._pair_students[row] = student_id
+        self._pair_courses[row] = course_id
+        self._pairs[(student_id, course_id)] = row
+        self._student_pairs.setdefault(student_id, []).append(row)
+        self._course_pairs.setdefault(course_id, []).append(row)
+        return row
+
+    def apply(self, student_ids, course_ids, status_codes, previous_codes):
+        """Count new marks, uncounting the marks they replace (previous code -1 if none)"""
+        # Resolve each distinct pair in the batch once
+        pair_keys = (np.asarray(student_ids, dtype=np.int64) << 32) | np.asarray(course_ids, dtype=np.int64)
+        unique_keys, inverse = np.unique(pair_keys, return_inverse=True)
+        unique_rows = np.fromiter(
+            (self._pair_row(key >> 32, key & 0xFFFFFFFF) for key in unique_keys.tolist()),
+            dtype=np.int64, count=len(unique_keys)
+        )
+        rows = unique_rows[inverse]
+        status_codes = np.asarray(status_codes, dtype=np.int64)
+        previous_codes = np.asarray(previous_codes, dtype=np.int64)
+
+        np.add.at(self._counts, (rows, status_codes), 1)
+        corrected = previous_codes >= 0
+        np.subtract.at(self._counts, (rows[corrected], previous_codes[corrected]), 1)
+
+    def _frame(self, rows, key_name, keys):
+        """Build a summary DataFrame for the given counts rows"""
+        rows = np.asarray(rows, dtype=np.int64)
+        counts = self._counts[rows]
+        total = counts.sum(axis=1)
+        attended = total - counts[:, STATUS_CODES["Absent"]]
+        rate = np.where(total > 0, attended / np.maximum(total, 1) * 100, 0.0)
+
+        df = pd.DataFrame(counts, columns=STATUSES)
+        df.insert(0, key_name, keys[rows])
+        df["Total"] = total
+        df["Attendance Rate"] = rate
+        return df
+
+    def student_summary(self, student_id):
+        """Return one row per course the student has marks in"""
+        return self._frame(self._student_pairs.get(student_id, []), "course_id", self._pair_courses)
+
+    def course_summary(self, course_id):
+        """Return one row per student with marks in the course"""
+        return self._frame(self._course_pairs.get(course_id, []), "student_id", self._pair_students)
+
+
+class AttendanceStore:
+    """Append-only, columnar attendance event log."""
+
+    _COLUMNS = {
+        "student": np.int32,
+        "course": np.int32,
+        "session": np.int32,     # days since epoch
+        "status": np.int8,       # index into STATUSES
+        "timestamp": np.int64,   # seconds since epoch
+        "current": np.bool_,     # False once a later event supersedes the row
+    }
+
+    def __init__(self, snapshot_path=None, snapshot_every=ATTENDANCE_SNAPSHOT_EVERY, capacity=1024):
+        self.snapshot_path = snapshot_path
+        self.snapshot_every = snapshot_every
+        self.version = 0
+        self._lock = threading.RLock()
+        self._size = 0
+        self._columns = {name: np.empty(capacity, dtype=dtype) for name, dtype in self._COLUMNS.items()}
+        self._notes = {}    # row -> note (only non-empty notes are kept)
+        self._latest = {}   # packed (student, course, session) key -> row of the current mark
+        self._indexes = {}  # column -> (size, order, sorted keys)
+        self._unsaved = 0
+        self._course_versions = {}  # course -> store version of its last write
+        self.aggregates = AttendanceAggregates()
+
+    def __len__(self):
+        return self._size
+
+    # Writes
+
+    def _reserve(self, count):
+        """Grow the column arrays so that `count` more rows fit"""
+        needed = self._size + count
+        capacity = len(self._columns["student"])
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for name, column in self._columns.items():
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[:self._size] = column[:self._size]
+            self._columns[name] = grown
+
+    def append(self, student_ids, course_ids, session_days, status_codes, timestamps, notes=None):
+        """Append a batch of already-validated events and return their row numbers"""
+        count = len(student_ids)
+        if count == 0:
+            return np.empty(0, dtype=np.int64)
+
+        with self._lock:
+            self._reserve(count)
+            start, end = self._size, self._size + count
+            cols = self._columns
+            cols["student"][start:end] = student_ids
+            cols["course"][start:end] = course_ids
+            cols["session"][start:end] = session_days
+            cols["status"][start:end] = status_codes
+            cols["timestamp"][start:end] = timestamps
+            cols["current"][start:end] = True
+
+            # Supersede earlier marks for the same (student, course, session)
+            latest = self._latest
+            current = cols["current"]
+            status = cols["status"]
+            students = cols["student"][start:end]
+            courses = cols["course"][start:end]
+            keys = _mark_keys(students, courses, cols["session"][start:end])
+            rows = range(start, end)
+            if len(np.unique(keys)) == count:
+                key_list = keys.tolist()
+                previous = np.array([-1 if r is None else r for r in map(latest.get, key_list)], dtype=np.int64)
+                latest.update(zip(key_list, rows))
+            else:
+                # The batch corrects itself; resolve in order
+                previous = np.full(count, -1, dtype=np.int64)
+                for i, (row, key) in enumerate(zip(rows, keys.tolist())):
+                    previous[i] = latest.get(key, -1)
+                    latest[key] = row
+
+            superseded = previous >= 0
+            current[previous[superseded]] = False
+            previous_codes = np.full(count, -1, dtype=np.int64)
+            previous_codes[superseded] = status[previous[superseded]]
+
+            self.aggregates.apply(students, courses, status[start:end], previous_codes)
+
+            if notes:
+                for offset, note in enumerate(notes):
+                    if note:
+                        self._notes[start + offset] = note
+
+            self._size = end
+            self._unsaved += count
+            self.version += 1
+            for course_id in set(courses):
+                self._course_versions[course_id] = self.version
+
+            if self.snapshot_path and self._unsaved >= self.snapshot_every:
+                self.snapshot()
+
+            return np.arange(start, end)
+
+    def record(self, student_id, course_id, status, session_date, notes="", timestamp=None):
+        """Append a single attendance mark"""
+        if status not in STATUS_CODES:
+            raise ValueError(f"Unknown attendance status: {status}")
+        timestamp = timestamp or datetime.now()
+        return self.append(
+            [int(student_id)], [int(course_id)], [date_to_day(session_date)],
+            [STATUS_CODES[status]], [int(timestamp.timestamp())], [notes]
+        )[0]
+
+    def record_session(self, course_id, session_date, records, timestamp=None):
+        """Validate and write a whole roster for one session in a single transaction.
+
+        `records` is an iterable of dicts with "student_id", "status" and an
+        optional "notes" key. Nothing is written if any record is invalid.
+        Only rows whose status or notes changed are appended; the returned
+        diff lists those rows with their previous status (None if unmarked).
+        """
+        course_id = int(course_id)
+        session_day = date_to_day(session_date)
+
+        student_ids, codes, notes = [], [], []
+        seen = set()
+        for record in records:
+            student_id = int(record["student_id"])
+            status = record["status"]
+            if status not in STATUS_CODES:
+                raise ValueError(f"Unknown attendance status for student {student_id}: {status}")
+            if student_id in seen:
+                raise ValueError(f"Student {student_id} appears more than once in the roster")
+            seen.add(student_id)
+            student_ids.append(student_id)
+            codes.append(STATUS_CODES[status])
+            notes.append(record.get("notes") or "")
+
+        with self._lock:
+            status_column = self._columns["status"]
+            diff, changed = [], []
+            for i, student_id in enumerate(student_ids):
+                row = self._latest.get(_mark_key(student_id, course_id, session_day))
+                if row is not None and status_column[row] == codes[i] and self._notes.get(row, "") == notes[i]:
+                    continue
+                changed.append(i)
+                diff.append({
+                    "student_id": student_id,
+                    "previous_status": None if row is None else STATUSES[status_column[row]],
+                    "status": STATUSES[codes[i]],
+                    "notes": notes[i],
+                })
+
+            if changed:
+                timestamp = int((timestamp or datetime.now()).timestamp())
+                self.append(
+                    np.array(student_ids, dtype=np.int32)[changed],
+                    np.full(len(changed), course_id, dtype=np.int32),
+                    np.full(len(changed), session_day, dtype=np.int32),
+                    np.array(codes, dtype=np.int8)[changed],
+                    np.full(len(changed), timestamp, dtype=np.int64),
+                    [notes[i] for i in changed],
+                )
+            return diff
+
+    # Reads
+
+    def _index(self, column):
+        """Return (order, sorted keys) for a column, merging in the rows added since it was built"""
+        cached = self._indexes.get(column)
+        if cached is not None and cached[0] == self._size:
+            return cached[1], cached[2]
+
+        if cached is None:
+            values = self._columns[column][:self._size]
+            order = np.argsort(values, kind="stable")
+            keys = values[order]
+        else:
+            # Sort only the new tail and insert it after the equal keys, so each slice stays in append order
+            size, order, keys = cached
+            tail = self._columns[column][size:self._size]
+            tail_order = np.argsort(tail, kind="stable")
+            tail_keys = tail[tail_order]
+            positions = np.searchsorted(keys, tail_keys, side="right")
+            order = np.insert(order, positions, tail_order + size)
+            keys = np.insert(keys, positions, tail_keys)
+        self._indexes[column] = (self._size, order, keys)
+        return order, keys
+
+    def rows_for(self, column, value, current_only=True):
+        """Return row numbers whose `column` equals `value`, in append order"""
+        with self._lock:
+            order, keys = self._index(column)
+            value = keys.dtype.type(value)  # a Python int would upcast the whole key array
+            lo, hi = np.searchsorted(keys, value, side="left"), np.searchsorted(keys, value, side="right")
+            rows = order[lo:hi]
+            if current_only:
+                rows = rows[self._columns["current"][rows]]
+            return rows
+
+    def column(self, name, rows=None):
+        """Return a column (or the selected rows of it) as a NumPy array"""
+        values = self._columns[name][:self._size]
+        return values if rows is None else values[rows]
+
+    def course_version(self, course_id):
+        """Return a counter that changes whenever the course receives a write"""
+        return self._course_versions.get(int(course_id), 0)
+
+    def current_mark(self, student_id, course_id, session_date):
+        """Return the current status for a single session, or None"""
+        row = self._latest.get(_mark_key(student_id, course_id, date_to_day(session_date)))
+        return None if row is None else STATUSES[self._columns["status"][row]]
+
+    def to_records(self, rows):
+        """Materialize rows as a list of dicts, ordered by session date"""
+        cols = self._columns
+        rows = rows[np.argsort(cols["session"][rows], kind="stable")]
+        return [
+            {
+                "student_id": int(cols["student"][row]),
+                "course_id": int(cols["course"][row]),
+                "session_date": day_to_date(cols["session"][row]),
+                "status": STATUSES[cols["status"][row]],
+                "notes": self._notes.get(int(row), ""),
+                "recorded_at": datetime.fromtimestamp(int(cols["timestamp"][row])),
+            }
+            for row in rows
+        ]
+
+    # Persistence
+
+    def snapshot(self, path=None):
+        """Write the event log to disk atomically"""
+        path = path or self.snapshot_path
+        if not path:
+            return False
+
+        with self._lock:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            note_rows = np.fromiter(self._notes.keys(), dtype=np.int64, count=len(self._notes))
+            note_text = np.array(list(self._notes.values()), dtype=str)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "wb") as f:
+                np.savez(
+                    f,
+                    note_rows=note_rows,
+                    note_text=note_text,
+                    **{name: column[:self._size] for name, column in self._columns.items()}
+                )
+            os.replace(tmp_path, path)
+            self._unsaved = 0
+            return True
+
+    @classmethod
+    def load(cls, path, **kwargs):
+        """Rebuild a store from a snapshot written by `snapshot`"""
+        store = cls(snapshot_path=path, **kwargs)
+        with np.load(path) as data:
+            size = len(data["student"])
+            store._reserve(size)
+            for name in cls._COLUMNS:
+                store._columns[name][:size] = data[name]
+            store._notes = dict(zip(data["note_rows"].tolist(), data["note_text"].tolist()))
+        store._size = size
+
+        cols = store._columns
+        current_rows = np.flatnonzero(cols["current"][:size])
+        keys = _mark_keys(cols["student"][current_rows], cols["course"][current_rows], cols["session"][current_rows])
+        store._latest = dict(zip(keys.tolist(), current_rows.tolist()))
+        store._course_versions = dict.fromkeys(np.unique(cols["course"][:size]).tolist(), 1)
+        store.version = 1
+        store.aggregates.apply(
+            cols["student"][current_rows],
+            cols["course"][current_rows],
+            cols["status"][current_rows],
+            np.full(len(current_rows), -1, dtype=np.int64)
+        )
+        return store
+
+
+def seed_demo_attendance(store, seed=DEMO_SEED):
+    """Fill an empty store with demo marks for the current term's sessions before today"""
+    rng = np.random.default_rng(seed)
+
+    catalog = get_catalog()
+    pairs = np.array(
+        [(s["id"], c["id"]) for s in catalog.students for c in catalog.courses_for_student(s["id"])],
+        dtype=np.int32
+    ).reshape(-1, 2)
+    owner, sessions = term_sessions(pairs[:, 1], until=date.today() - timedelta(days=1))
+
+    # One mark per (student, course, session), mostly present, taken as class starts
+    students = pairs[owner, 0]
+    courses = pairs[owner, 1]
+    statuses = rng.choice(len(STATUSES), size=len(students), p=[0.8, 0.1, 0.05, 0.05]).astype(np.int8)
+    start_minutes = np.zeros(max(c["id"] for c in catalog.courses) + 1, dtype=np.int64)
+    for course in catalog.courses:
+        start_minutes[course["id"]] = meeting_pattern(course)["start"]
+    timestamps = midnight_timestamps(sessions) + start_minutes[courses] * 60
+
+    store.append(students, courses, sessions, statuses, timestamps)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_attendance_store():
+    """Return the process-wide attendance store shared by all sessions"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                path = str(ATTENDANCE_SNAPSHOT_PATH) if ATTENDANCE_SNAPSHOT_PATH else None
+                if path and os.path.exists(path):
+                    store = AttendanceStore.load(path)
+                elif DATASET_DIR:
+                    store = AttendanceStore(snapshot_path=path, snapshot_every=float("inf"))
+                    for batch in iter_attendance_parts(DATASET_DIR):
+                        store.append(**batch)
+                    store.snapshot_every = ATTENDANCE_SNAPSHOT_EVERY
+                    # Snapshot the loaded dataset now, so the first user write doesn't
+                    # save all of it and later starts load the snapshot instead
+                    store.snapshot()
+                else:
+                    store = AttendanceStore(snapshot_path=path)
+                    seed_demo_attendance(store)
+                if path:
+                    atexit.register(store.snapshot)
+                _store = store
+    return _store
+
+
+def record_attendance(student_id, course_id, status, session_date=None, notes=""):
+    """Record (or correct) a student's attendance for a class session"""
+    store = get_attendance_store()
+    store.record(student_id, course_id, status, session_date or date.today(), notes=notes)
     return True
 
+
+def record_attendance_bulk(course_id, session_date, records):
+    """Save a full roster for one session at once and return the changed rows"""
+    store = get_attendance_store()
+    return store.record_session(course_id, session_date, records)
+
+
 def get_student_attendance(student_id, course_id=None):
-    """Placeholder for retrieving student attendance"""
-    # In a real implementation, this would query the database
-    return []
+    """Return a student's current attendance marks, oldest session first"""
+    store = get_attendance_store()
+    rows = store.rows_for("student", int(student_id))
+    if course_id is not None:
+        rows = rows[store.column("course", rows) == int(course_id)]
+    return store.to_records(rows)
+
+
+def get_course_attendance(course_id, session_date=None):
+    """Return current attendance marks for a course, oldest session first"""
+    store = get_attendance_store()
+    rows = store.rows_for("course", int(course_id))
+    if session_date is not None:
+        rows = rows[store.column("session", rows) == date_to_day(session_date)]
+    return store.to_records(rows)
+
+
+def get_student_attendance_summary(student_id):
+    """Return per-course status counts and attendance rate for a student"""
+    store = get_attendance_store()
+    with store._lock:
+        return store.aggregates.student_summary(int(student_id))
+
+
+def get_course_attendance_summary(course_id):
+    """Return per-student status counts and attendance rate for a course"""
+    store = get_attendance_store()
+    with store._lock:
+        return store.aggregates.course_summary(int(course_id))
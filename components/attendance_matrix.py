@@ -0,0 +1,176 @@
+# Attendance matrix component
+#
+# Each course is stored as a students x sessions bit matrix with one bitplane
+# per status. Rows are the course roster, columns are the course's sessions in
+# date order, and bits are packed eight sessions to a byte. Absence counts,
+# "missed the last k sessions" and "last attended" then become popcounts and
+# bit scans over whole arrays, and matrices for many courses can be stacked to
+# answer the same questions for a whole department in one pass.
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+from components.attendance import STATUS_CODES, STATUSES, day_to_date, get_attendance_store
+from components.catalog import get_catalog
+from components.sessions import remaining_sessions
+
+# Number of set bits for every byte value
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+AT_RISK_THRESHOLD = 0.75
+AT_RISK_STREAK = 3  # consecutive missed sessions that flag a student regardless of the total
+
+
+def _popcount(packed):
+    """Count set bits per row of a packed bit matrix"""
+    return _POPCOUNT[packed].sum(axis=1, dtype=np.int32)
+
+
+class CourseMatrix:
+    """Students x sessions bitplanes for a single course."""
+
+    def __init__(self, course_id, student_ids, session_days, planes):
+        self.course_id = course_id
+        self.student_ids = student_ids    # roster order
+        self.session_days = session_days  # sorted, days since epoch
+        self.planes = planes              # status -> packed uint8 (students, ceil(sessions / 8))
+
+    @property
+    def n_sessions(self):
+        return len(self.session_days)
+
+    @classmethod
+    def build(cls, store, course_id, student_ids):
+        """Build the matrix for a course from the current marks in the store"""
+        student_ids = np.asarray(student_ids, dtype=np.int32)
+        rows = store.rows_for("course", course_id)
+        students = store.column("student", rows)
+        sessions = store.column("session", rows)
+        statuses = store.column("status", rows)
+
+        # Map students onto roster positions, dropping marks for students not on it
+        roster_order = np.argsort(student_ids)
+        sorted_ids = student_ids[roster_order]
+        pos = np.searchsorted(sorted_ids, students)
+        on_roster = (pos < len(sorted_ids)) & (sorted_ids[np.minimum(pos, len(sorted_ids) - 1)] == students)
+        student_pos = roster_order[pos[on_roster]]
+        sessions, statuses = sessions[on_roster], statuses[on_roster]
+
+        session_days, session_pos = np.unique(sessions, return_inverse=True)
+        planes = {}
+        for status, code in STATUS_CODES.items():
+            bits = np.zeros((len(student_ids), len(session_days)), dtype=bool)
+            mask = statuses == code
+            bits[student_pos[mask], session_pos[mask]] = True
+            planes[status] = np.packbits(bits, axis=1, bitorder="little")
+        return cls(course_id, student_ids, session_days, planes)
+
+
+class StackedMatrix:
+    """Several course matrices stacked row-wise so queries run over all of them at once."""
+
+    def __init__(self, matrices, max_absences):
+        width = max((m.planes["Present"].shape[1] for m in matrices), default=0)
+
+        def per_row(values, dtype):
+            parts = [np.broadcast_to(np.asarray(v, dtype=dtype), len(m.student_ids)) for m, v in zip(matrices, values)]
+            return np.concatenate(parts) if parts else np.empty(0, dtype=dtype)
+
+        def stack(status):
+            parts = [np.pad(m.planes[status], ((0, 0), (0, width - m.planes[status].shape[1]))) for m in matrices]
+            return np.vstack(parts) if parts else np.zeros((0, 0), dtype=np.uint8)
+
+        self.planes = {status: stack(status) for status in STATUSES}
+        self.student_ids = per_row([m.student_ids for m in matrices], np.int32)
+        self.course_ids = per_row([m.course_id for m in matrices], np.int32)
+        self.n_sessions = per_row([m.n_sessions for m in matrices], np.int32)
+        self.max_absences = per_row([max_absences[m.course_id] for m in matrices], np.int32)
+
+        # Per-row session day for each column, padded with -1
+        self._session_days = np.full((len(self.student_ids), width * 8), -1, dtype=np.int64)
+        offset = 0
+        for m in matrices:
+            self._session_days[offset:offset + len(m.student_ids), :m.n_sessions] = m.session_days
+            offset += len(m.student_ids)
+
+    def counts(self, status):
+        """Return the number of sessions with `status` per row"""
+        return _popcount(self.planes[status])
+
+    def attended_bits(self):
+        """Return the packed bitplane of sessions attended (present, late or excused)"""
+        return self.planes["Present"] | self.planes["Late"] | self.planes["Excused"]
+
+    def missed_last(self, k):
+        """Return True for rows absent from each of their course's last k sessions"""
+        columns = np.arange(self._session_days.shape[1])
+        start = np.maximum(self.n_sessions - k, 0)[:, None]
+        window = (columns >= start) & (columns < self.n_sessions[:, None])
+        mask = np.packbits(window, axis=1, bitorder="little")
+        missed = _popcount(self.planes["Absent"] & mask)
+        return (self.n_sessions >= k) & (missed == k)
+
+    def last_attended(self):
+        """Return the day (since epoch) each row last attended, or -1"""
+        bits = np.unpackbits(self.attended_bits(), axis=1, bitorder="little").astype(bool)
+        if bits.shape[1] == 0:
+            return np.full(len(self.student_ids), -1, dtype=np.int64)
+        last_col = bits.shape[1] - 1 - np.argmax(bits[:, ::-1], axis=1)
+        days = self._session_days[np.arange(len(last_col)), last_col]
+        return np.where(bits.any(axis=1), days, -1)
+
+
+_matrix_cache = {}   # course_id -> (store course version, CourseMatrix)
+_matrix_lock = threading.Lock()
+
+
+def get_course_matrix(course_id):
+    """Return the (cached) attendance matrix for a course"""
+    store = get_attendance_store()
+    version = store.course_version(course_id)
+    with _matrix_lock:
+        cached = _matrix_cache.get(course_id)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+    roster = [s["id"] for s in get_catalog().students_in_course(course_id)]
+    with store._lock:
+        matrix = CourseMatrix.build(store, course_id, roster)
+    with _matrix_lock:
+        _matrix_cache[course_id] = (version, matrix)
+    return matrix
+
+
+def get_at_risk_students(course_ids, threshold=AT_RISK_THRESHOLD, streak=AT_RISK_STREAK, student_id=None):
+    """Return students at or near the absence limit across the given courses.
+
+    A student is at risk when absences >= threshold * max_absences, or when
+    they missed each of the course's last `streak` sessions. One vectorized
+    pass covers every course, so a whole department can be checked at once.
+    `sessions_left` counts the sessions still to come this term.
+    """
+    catalog = get_catalog()
+    courses = [catalog.get_course(c) for c in course_ids]
+    courses = [c for c in courses if c is not None]
+    matrices = [get_course_matrix(c["id"]) for c in courses]
+    stacked = StackedMatrix(matrices, {c["id"]: c["max_absences"] for c in courses})
+
+    absences = stacked.counts("Absent")
+    missed_streak = stacked.missed_last(streak)
+    at_risk = (absences >= stacked.max_absences * threshold) | missed_streak
+    if student_id is not None:
+        at_risk &= stacked.student_ids == student_id
+
+    rows = np.flatnonzero(at_risk)
+    last_attended = stacked.last_attended()[rows]
+    return pd.DataFrame({
+        "student_id": stacked.student_ids[rows],
+        "course_id": stacked.course_ids[rows],
+        "absences": absences[rows],
+        "max_absences": stacked.max_absences[rows],
+        "missed_last_sessions": missed_streak[rows],
+        "last_attended": [day_to_date(day) if day >= 0 else None for day in last_attended],
+        "sessions_left": remaining_sessions(stacked.course_ids[rows]),
+    })
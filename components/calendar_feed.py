@@ -0,0 +1,229 @@
+# Calendar feed component
+#
+# Per-user iCalendar (.ics) feeds of the class schedule and the academic
+# calendar. A feed is assembled from cached blocks: one VEVENT per section (a
+# weekly RRULE over the current term, with EXDATEs for sessions that fall in
+# breaks) and one block of all-day academic calendar events per year. A block
+# is re-rendered only when its inputs change, and a user's assembled feed is
+# kept with its content hash as the ETag, so a subscription poll is a few
+# dict lookups and, when the client already has the feed, a 304.
+#
+# Feed URLs carry an HMAC of the user so they can be shared with a calendar
+# client without logging in:
+#
+#   /calendar/{role}/{user_id}.ics?token={signature}
+
+import base64
+import hashlib
+import hmac
+import secrets
+import threading
+from datetime import date, timedelta
+
+import numpy as np
+
+from components.catalog import get_catalog
+from components.geolocation import format_location
+from components.schedule import DAY_NAMES, meeting_pattern
+from components.sessions import get_session_table
+from config import APP_NAME, CALENDAR_HOST, CALENDAR_PORT, CALENDAR_SECRET
+from utils.time_utils import academic_calendar, current_term, weekday_of
+
+SIGNATURE_BYTES = 12
+
+_secret = CALENDAR_SECRET.encode("utf-8") if CALENDAR_SECRET else secrets.token_bytes(32)
+_mac = hmac.new(_secret, digestmod=hashlib.sha256)  # keyed once, copied per token
+_EPOCH = date(1970, 1, 1)
+_BYDAY = ["MO", "TU", "WE", "TH", "FR", "SA", "SU"]
+
+
+def feed_token(role, user_id):
+    """Return the URL-safe signature that authorizes a user's feed"""
+    mac = _mac.copy()
+    mac.update(f"{role}:{int(user_id)}".encode("ascii"))
+    return base64.urlsafe_b64encode(mac.digest()[:SIGNATURE_BYTES]).decode("ascii")
+
+
+def verify_feed_token(role, user_id, token):
+    """Return True if the token matches the user's feed"""
+    return hmac.compare_digest(feed_token(role, user_id).encode("ascii"), token.encode("utf-8"))
+
+
+def feed_path(role, user_id):
+    """Return the path (with token) of a user's feed"""
+    return f"/calendar/{role}/{int(user_id)}.ics?token={feed_token(role, user_id)}"
+
+
+def feed_url(role, user_id, host=CALENDAR_HOST, port=CALENDAR_PORT):
+    """Return the subscription URL of a user's feed"""
+    return f"http://{host}:{port}{feed_path(role, user_id)}"
+
+
+def _escape(text):
+    """Escape a TEXT value (RFC 5545 3.3.11)"""
+    return text.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+
+
+def _fold(line):
+    """Fold a content line to 75 octets per physical line"""
+    data = line.encode("utf-8")
+    if len(data) <= 75:
+        return line
+    parts, start, limit = [], 0, 75
+    while start < len(data):
+        end = min(start + limit, len(data))
+        while end < len(data) and (data[end] & 0xC0) == 0x80:  # don't split a UTF-8 sequence
+            end -= 1
+        parts.append(data[start:end].decode("utf-8"))
+        start, limit = end, 74  # continuation lines start with a space
+    return "\r\n ".join(parts)
+
+
+def _lines(*lines):
+    """Join content lines with CRLF, folded"""
+    return "".join(_fold(line) + "\r\n" for line in lines)
+
+
+def _day(value):
+    """Convert days since the epoch to a date"""
+    return _EPOCH + timedelta(days=int(value))
+
+
+def _stamp(day, minutes=None):
+    """Format a date (and minutes after midnight) as an iCalendar DATE or local DATE-TIME"""
+    if minutes is None:
+        return f"{day:%Y%m%d}"
+    return f"{day:%Y%m%d}T{minutes // 60:02d}{minutes % 60:02d}00"
+
+
+def render_section(course, term, session_days):
+    """Render one section's weekly meetings over a term as a VEVENT"""
+    if not len(session_days):
+        return ""
+    pattern = meeting_pattern(course)
+    first, last = _day(session_days[0]), _day(session_days[-1])
+
+    # Pattern days between the first and last session that aren't sessions fall in breaks
+    span = np.arange(session_days[0], session_days[-1] + 1)
+    candidates = span[np.isin(weekday_of(span), pattern["days"])]
+    skipped = np.setdiff1d(candidates, session_days)
+
+    byday = ",".join(_BYDAY[day] for day in pattern["days"])
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:section-{course['id']}-{term['start']:%Y%m%d}@{APP_NAME.lower()}",
+        f"DTSTAMP:{term['start']:%Y%m%d}T000000Z",
+        f"DTSTART:{_stamp(first, pattern['start'])}",
+        f"DTEND:{_stamp(first, pattern['end'])}",
+        f"RRULE:FREQ=WEEKLY;BYDAY={byday};UNTIL={_stamp(last)}T235959",
+    ]
+    if len(skipped):
+        lines.append("EXDATE:" + ",".join(_stamp(_day(d), pattern["start"]) for d in skipped))
+    lines += [
+        f"SUMMARY:{_escape(course['code'] + ': ' + course['title'])}",
+        f"LOCATION:{_escape(format_location(course))}",
+        f"DESCRIPTION:{_escape(term['period'] + ', ' + '/'.join(DAY_NAMES[d][:3] for d in pattern['days']))}",
+        "END:VEVENT",
+    ]
+    return _lines(*lines)
+
+
+def render_academic_calendar(year):
+    """Render a year's academic calendar entries as all-day VEVENTs"""
+    blocks = []
+    for entry in academic_calendar(year):
+        blocks.append(_lines(
+            "BEGIN:VEVENT",
+            f"UID:calendar-{entry['start']:%Y%m%d}-{entry['kind']}@{APP_NAME.lower()}",
+            f"DTSTAMP:{year}0101T000000Z",
+            f"DTSTART;VALUE=DATE:{_stamp(entry['start'])}",
+            f"DTEND;VALUE=DATE:{_stamp(entry['end'] + timedelta(days=1))}",
+            f"SUMMARY:{_escape(entry['period'])}",
+            "TRANSP:TRANSPARENT",
+            "END:VEVENT",
+        ))
+    return "".join(blocks)
+
+
+def _wrap(name, blocks):
+    """Wrap rendered VEVENT blocks in a VCALENDAR"""
+    head = _lines(
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:-//{APP_NAME}//Class Schedule//EN",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{_escape(name)}",
+    )
+    return head + "".join(blocks) + _lines("END:VCALENDAR")
+
+
+class FeedCache:
+    """Cached section blocks, calendar blocks and assembled feeds with their ETags."""
+
+    def __init__(self, catalog, session_table_for=get_session_table):
+        self.catalog = catalog
+        self.session_table_for = session_table_for
+        self._sections = {}   # course_id -> (inputs, version, rendered VEVENT)
+        self._calendars = {}  # year -> rendered VEVENTs
+        self._feeds = {}      # (role, user_id) -> (block keys, etag, body)
+        self._version = 0
+        self._lock = threading.Lock()
+        self.stats = {"feeds_rendered": 0, "sections_rendered": 0, "feeds_reused": 0}
+
+    def _section(self, course, term):
+        """Return a section's VEVENT, re-rendering it only if its schedule or term changed"""
+        inputs = (term["start"], term["end"], course["code"], course["title"], tuple(meeting_pattern(course).items()))
+        cached = self._sections.get(course["id"])
+        if cached is not None and cached[0] == inputs:
+            return cached
+        days = self.session_table_for(term["start"].year).days_for(course["id"], term["start"], term["end"])
+        self._version += 1
+        cached = self._sections[course["id"]] = (inputs, self._version, render_section(course, term, days))
+        self.stats["sections_rendered"] += 1
+        return cached
+
+    def _calendar(self, year):
+        """Return a year's academic calendar block"""
+        if year not in self._calendars:
+            self._calendars[year] = render_academic_calendar(year)
+        return self._calendars[year]
+
+    def feed(self, role, user_id, day=None):
+        """Return (etag, body bytes) of a user's feed for the term containing a date"""
+        term = current_term(day or date.today())
+        courses = self.catalog.courses_for_user(role, user_id)
+        with self._lock:
+            sections = [self._section(course, term) for course in courses]
+            keys = (term["start"], tuple(version for _, version, _ in sections))
+            cached = self._feeds.get((role, user_id))
+            if cached is not None and cached[0] == keys:
+                self.stats["feeds_reused"] += 1
+                return cached[1], cached[2]
+
+            name = f"{APP_NAME} - {term['period']} {term['start'].year}"
+            blocks = [block for _, _, block in sections] + [self._calendar(term["start"].year)]
+            body = _wrap(name, blocks).encode("utf-8")
+            etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+            self._feeds[(role, user_id)] = (keys, etag, body)
+            self.stats["feeds_rendered"] += 1
+            return etag, body
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_feed_cache():
+    """Return the process-wide calendar feed cache"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = FeedCache(get_catalog())
+    return _cache
+
+
+def get_calendar_feed(role, user_id):
+    """Return (etag, body bytes) of a user's .ics feed"""
+    return get_feed_cache().feed(role, user_id)
@@ -0,0 +1,141 @@
+# Calendar feed HTTP server
+#
+# A small threaded HTTP endpoint that serves the per-user .ics feeds to
+# calendar clients (Google, Outlook, Apple). Feeds come from the feed cache,
+# so most polls never render anything: the response carries the feed's ETag
+# and a client that sends it back in If-None-Match gets an empty 304.
+#
+#   GET /calendar/{role}/{user_id}.ics?token=...   text/calendar feed (HEAD too)
+#   GET /health                                    feed cache and response counters
+#
+# Usage:
+#   python -m components.calendar_server --port 8503
+# or set CLASSTRACKER_CALENDAR_SERVER=1 to start it inside the Streamlit process.
+
+import argparse
+import json
+import logging
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from components.calendar_feed import get_feed_cache, verify_feed_token
+from config import CALENDAR_FEED_MAX_AGE, CALENDAR_HOST, CALENDAR_PORT
+
+logger = logging.getLogger(__name__)
+
+_FEED_PATH = re.compile(r"^/calendar/(student|professor)/(\d+)\.ics$")
+
+
+def _etag_matches(header, etag):
+    """Return True if an If-None-Match header names the current ETag"""
+    if not header:
+        return False
+    tags = [tag.strip() for tag in header.split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+
+class CalendarHandler(BaseHTTPRequestHandler):
+    """Serve .ics feeds with ETag revalidation."""
+
+    protocol_version = "HTTP/1.1"   # keep-alive, so pollers reuse connections
+    disable_nagle_algorithm = True  # headers and body go out as separate writes
+    cache = None                    # FeedCache, set by make_server
+    counts = None                   # status code -> responses
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    def _send(self, status, body=b"", headers=(), send_body=True):
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if send_body and body:
+            self.wfile.write(body)
+        self.counts[status] = self.counts.get(status, 0) + 1
+
+    def _json(self, status, data, send_body=True):
+        self._send(status, json.dumps(data).encode("utf-8"), [("Content-Type", "application/json")], send_body)
+
+    def _feed(self, send_body):
+        url = urlsplit(self.path)
+        if url.path == "/health":
+            return self._json(200, {"feeds": self.cache.stats, "responses": self.counts}, send_body)
+        match = _FEED_PATH.match(url.path)
+        if not match:
+            return self._json(404, {"error": "not found"}, send_body)
+        role, user_id = match.group(1), int(match.group(2))
+        token = parse_qs(url.query).get("token", [""])[0]
+        if not verify_feed_token(role, user_id, token):
+            return self._json(403, {"error": "invalid feed token"}, send_body)
+
+        etag, body = self.cache.feed(role, user_id)
+        headers = [("ETag", etag), ("Cache-Control", f"private, max-age={CALENDAR_FEED_MAX_AGE}")]
+        if _etag_matches(self.headers.get("If-None-Match"), etag):
+            return self._send(304, headers=headers, send_body=False)
+        headers.append(("Content-Type", "text/calendar; charset=utf-8"))
+        headers.append(("Content-Disposition", f'inline; filename="{role}-{user_id}.ics"'))
+        self._send(200, body, headers, send_body)
+
+    def do_GET(self):
+        self._feed(send_body=True)
+
+    def do_HEAD(self):
+        self._feed(send_body=False)
+
+
+def make_server(host=CALENDAR_HOST, port=CALENDAR_PORT, cache=None):
+    """Return a ThreadingHTTPServer serving feeds from a feed cache"""
+    handler = type("Handler", (CalendarHandler,), {"cache": cache or get_feed_cache(), "counts": {}})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+_server_thread = None
+_server_lock = threading.Lock()
+
+
+def start_calendar_server(host=CALENDAR_HOST, port=CALENDAR_PORT):
+    """Start the calendar feed server on a background thread once per process"""
+    global _server_thread
+    with _server_lock:
+        if _server_thread is not None:
+            return _server_thread
+
+        def run():
+            try:
+                server = make_server(host, port)
+            except OSError as e:
+                logger.warning("Calendar server not started: %s", e)
+                return
+            logger.info("Calendar server listening on %s:%s", host, port)
+            server.serve_forever()
+
+        _server_thread = threading.Thread(target=run, name="calendar-server", daemon=True)
+        _server_thread.start()
+        return _server_thread
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve ClassTracker calendar feeds")
+    parser.add_argument("--host", default=CALENDAR_HOST)
+    parser.add_argument("--port", type=int, default=CALENDAR_PORT)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    server = make_server(args.host, args.port)
+    logger.info("Calendar server listening on %s:%s", args.host, args.port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
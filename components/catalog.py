@@ -0,0 +1,93 @@
+# Course catalog component
+#
+# Indexes the course, student and professor records once so views can look
+# things up by id and follow enrollments without scanning the full lists. The
+# catalog is built a single time per process and shared by every session.
+
+import threading
+
+from config import DATASET_DIR, DEMO_COURSES, DEMO_PROFESSORS, DEMO_STUDENTS
+from utils.data_generator import load_university_catalog
+
+
+class Catalog:
+    """Hash indexes over courses, students and professors plus enrollment lookups."""
+
+    def __init__(self, courses, students, professors):
+        self.courses = courses
+        self.students = students
+        self.professors = professors
+
+        # id -> record
+        self.courses_by_id = {c["id"]: c for c in courses}
+        self.students_by_id = {s["id"]: s for s in students}
+        self.professors_by_id = {p["id"]: p for p in professors}
+
+        # Enrollment: course -> students (inverted) and student -> courses
+        self._course_students = {course_id: [] for course_id in self.courses_by_id}
+        self._student_courses = {}
+        for student in students:
+            enrolled = []
+            for course_id in student["courses"]:
+                course = self.courses_by_id.get(course_id)
+                if course is not None:
+                    enrolled.append(course)
+                    self._course_students[course_id].append(student)
+            self._student_courses[student["id"]] = enrolled
+
+        # Teaching assignments
+        self._professor_courses = {
+            p["id"]: [self.courses_by_id[c] for c in p["courses"] if c in self.courses_by_id]
+            for p in professors
+        }
+
+    def get_course(self, course_id):
+        """Return a course by id, or None"""
+        return self.courses_by_id.get(course_id)
+
+    def get_student(self, student_id):
+        """Return a student by id, or None"""
+        return self.students_by_id.get(student_id)
+
+    def get_professor(self, professor_id):
+        """Return a professor by id, or None"""
+        return self.professors_by_id.get(professor_id)
+
+    def students_in_course(self, course_id):
+        """Return the students enrolled in a course"""
+        return self._course_students.get(course_id, [])
+
+    def enrollment_count(self, course_id):
+        """Return the number of students enrolled in a course"""
+        return len(self._course_students.get(course_id, []))
+
+    def courses_for_student(self, student_id):
+        """Return the courses a student is enrolled in"""
+        return self._student_courses.get(student_id, [])
+
+    def courses_for_professor(self, professor_id):
+        """Return the courses a professor teaches"""
+        return self._professor_courses.get(professor_id, [])
+
+    def courses_for_user(self, role, user_id):
+        """Return the courses for a student or professor"""
+        if role == "student":
+            return self.courses_for_student(user_id)
+        return self.courses_for_professor(user_id)
+
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+
+def get_catalog():
+    """Return the process-wide catalog shared by all sessions"""
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                if DATASET_DIR:
+                    _catalog = Catalog(*load_university_catalog(DATASET_DIR))
+                else:
+                    _catalog = Catalog(DEMO_COURSES, DEMO_STUDENTS, DEMO_PROFESSORS)
+    return _catalog
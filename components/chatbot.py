@@ -1,18 +1,23 @@
 import os
 import streamlit as st
-from langchain.prompts import ChatPromptTemplate
-from langchain.memory import ConversationBufferMemory
-from langchain_openai import ChatOpenAI
 from datetime import datetime
 
+from components.policies import get_policy_corpus
+from components.policy_index import retrieve_policy_sections
+from config import POLICIES_DIR, POLICY_TOP_K
+
+# langchain and langchain_openai are imported inside the methods that use them,
+# so importing this module stays cheap until the assistant is actually asked.
+
 class AttendancePolicyAssistant:
     """A streamlined RAG-based chatbot for answering questions about attendance policy."""
     
-    def __init__(self, policy_dir="docs/university_policies"):
+    def __init__(self, policy_dir=POLICIES_DIR):
         """Initialize the chatbot with policies from the specified directory."""
         self.policy_dir = policy_dir
         self.model = None
         self.memory = None
+        self.prompt = None
         self.is_initialized = False
         
         # System prompt template for the assistant
@@ -24,7 +29,7 @@ class AttendancePolicyAssistant:
         
         # User prompt template with policy context
         self.user_prompt = """
-        Attendance Policy:
+        Relevant Policy Sections:
         {policy_data}
         
         Chat History:
@@ -45,6 +50,9 @@ class AttendancePolicyAssistant:
             if not api_key:
                 return False, "OpenAI API key not found. Please set the OPENAI_API_KEY environment variable."
             
+            from langchain.memory import ConversationBufferMemory
+            from langchain_openai import ChatOpenAI
+
             # Initialize the LLM
             self.model = ChatOpenAI(
                 api_key=api_key,
@@ -67,13 +75,10 @@ class AttendancePolicyAssistant:
     def _load_policy_document(self):
         """Load the attendance policy document."""
         try:
-            # Look for attendance policy files
-            if os.path.exists(self.policy_dir):
-                for filename in os.listdir(self.policy_dir):
-                    if "attendance" in filename.lower() and filename.endswith((".txt", ".md")):
-                        file_path = os.path.join(self.policy_dir, filename)
-                        with open(file_path, "r", encoding="utf-8") as file:
-                            return file.read()
+            # Attendance policy files, from the shared corpus (re-read only when they change)
+            policy_text = get_policy_corpus(self.policy_dir).text("attendance")
+            if policy_text:
+                return policy_text
             
             # Fallback to hardcoded policy if file isn't found
             return """
@@ -120,6 +125,23 @@ class AttendancePolicyAssistant:
             print(f"Error loading policy document: {str(e)}")
             return self._get_fallback_policy()
     
+    def _retrieve_policy(self, question):
+        """Return the policy sections most relevant to a question, labelled for citation."""
+        try:
+            sections = retrieve_policy_sections(question, POLICY_TOP_K, self.policy_dir)
+            if sections:
+                blocks = []
+                for section in sections:
+                    label = section["title"] or section["document"]
+                    if section["section"]:
+                        label += f", Section {section['section']}"
+                    blocks.append(f"[{label}]\n{section['text']}")
+                return "\n\n".join(blocks)
+        except Exception as e:
+            print(f"Error retrieving policy sections: {str(e)}")
+        # Nothing indexed or nothing matched: send the attendance policy itself
+        return self._load_policy_document()
+    
     def _get_fallback_policy(self):
         """Return a fallback policy text in case of errors."""
         return """
@@ -156,18 +178,20 @@ class AttendancePolicyAssistant:
             if not self.is_initialized:
                 return self._get_fallback_response(question)
             
-            # Load policy text
-            policy_text = self._load_policy_document()
+            # Retrieve the policy sections relevant to this question
+            policy_text = self._retrieve_policy(question)
             
-            # Create the prompt with ChatPromptTemplate
-            prompt = ChatPromptTemplate.from_messages([
-                ("system", self.system_prompt),
-                ("human", self.user_prompt)
-            ])
+            # Create the prompt with ChatPromptTemplate once; only its inputs change per question
+            if self.prompt is None:
+                from langchain.prompts import ChatPromptTemplate
+                self.prompt = ChatPromptTemplate.from_messages([
+                    ("system", self.system_prompt),
+                    ("human", self.user_prompt)
+                ])
             
             # Format the prompt with our context
             current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            formatted_prompt = prompt.format(
+            formatted_prompt = self.prompt.format(
                 current_time=current_time,
                 policy_data=policy_text,
                 chat_history=str(self.memory.chat_memory.messages) if self.memory and hasattr(self.memory, 'chat_memory') else "",
@@ -0,0 +1,199 @@
+# Check-in ingestion component
+#
+# Turns scanned check-in QR codes into attendance marks. A scan names a student
+# and carries the signed, rotating token shown on the projector (see
+# utils.checkin_tokens). Tokens are verified without touching storage, then
+# scans are validated against the catalog and the session's check-in
+# window, repeat scans of the same session are dropped, and accepted check-ins
+# go through the bounded check-in queue, which writes them to the attendance
+# store in batches instead of one store write per scan.
+
+import threading
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from components.attendance import STATUS_CODES, date_to_day
+from components.catalog import get_catalog
+from components.checkin_queue import get_checkin_queue
+from components.schedule import session_start
+from config import (
+    CHECKIN_CLOSE_AFTER_MINUTES,
+    CHECKIN_LATE_AFTER_MINUTES,
+    CHECKIN_OPEN_BEFORE_MINUTES,
+)
+from utils.checkin_tokens import verify_checkin_token
+
+# Outcomes of a submitted check-in
+ACCEPTED = "accepted"
+DUPLICATE = "duplicate"
+REJECTED = "rejected"
+BUSY = "busy"
+
+
+def session_window(course, session_date):
+    """Return (opens, late_after, closes) as Unix timestamps for a session's check-in"""
+    start = session_start(course, session_date)
+    return (
+        (start - timedelta(minutes=CHECKIN_OPEN_BEFORE_MINUTES)).timestamp(),
+        (start + timedelta(minutes=CHECKIN_LATE_AFTER_MINUTES)).timestamp(),
+        (start + timedelta(minutes=CHECKIN_CLOSE_AFTER_MINUTES)).timestamp(),
+    )
+
+
+class CheckinIngestor:
+    """Validates and dedupes check-ins before handing them to the check-in queue."""
+
+    def __init__(self, catalog, queue, clock=time.time):
+        self.catalog = catalog
+        self.queue = queue
+        self.clock = clock
+        self.counts = {ACCEPTED: 0, DUPLICATE: 0, REJECTED: 0, BUSY: 0}
+
+        self._seen = {}      # session day -> {(student_id, course_id)} already checked in
+        self._windows = {}   # (course_id, session day) -> session_window(...)
+        self._oldest_day = None
+        self._classrooms = None  # ClassroomIndex, built on the first location check-in
+        self._lock = threading.Lock()
+
+    def _window(self, course, session_date):
+        """Return the (cached) check-in window for a course session"""
+        key = (course["id"], session_date.toordinal())
+        window = self._windows.get(key)
+        if window is None:
+            window = self._windows[key] = session_window(course, session_date)
+        return window
+
+    def submit(self, student_id, payload, timestamp=None):
+        """Validate one scan and queue it; return (outcome, message)"""
+        timestamp = self.clock() if timestamp is None else timestamp
+        try:
+            course_id, session_date = verify_checkin_token(payload, timestamp)
+        except ValueError as e:
+            return self._reject(str(e))
+
+        course = self.catalog.get_course(course_id)
+        if course is None:
+            return self._reject("Unknown course")
+        if not any(c["id"] == course_id for c in self.catalog.courses_for_student(student_id)):
+            return self._reject("Student is not enrolled in this course")
+
+        opens, late_after, closes = self._window(course, session_date)
+        if not opens <= timestamp <= closes:
+            return self._reject("Check-in is closed for this session")
+
+        status = STATUS_CODES["Present"] if timestamp <= late_after else STATUS_CODES["Late"]
+        return self._queue(student_id, course_id, date_to_day(session_date), status, timestamp)
+
+    def submit_geo(self, student_ids, course_ids, lats, lons, timestamps, max_skew=None):
+        """Validate a batch of location check-ins in one pass and queue the valid ones.
+
+        With max_skew, rows whose timestamp is more than that many seconds from
+        the ingestor's clock are rejected (for timestamps sent by clients).
+        Returns one (outcome, message) per row.
+        """
+        from components.geolocation import GEO_OK, GEO_REASONS, ClassroomIndex  # geolocation imports this module
+
+        if self._classrooms is None:
+            self._classrooms = ClassroomIndex(self.catalog.courses)
+        reasons, _ = self._classrooms.validate(course_ids, lats, lons, timestamps)
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        skewed = np.zeros(len(timestamps), dtype=bool)
+        if max_skew is not None:
+            skewed = np.abs(timestamps - int(self.clock())) > max_skew
+        results = []
+        rows = zip(student_ids, course_ids, timestamps.tolist(), reasons.tolist(), skewed.tolist())
+        for student_id, course_id, timestamp, reason, skew in rows:
+            student_id, course_id, timestamp = int(student_id), int(course_id), int(timestamp)
+            if skew:
+                results.append(self._reject("Check-in time does not match the server clock"))
+                continue
+            if reason != GEO_OK:
+                results.append(self._reject(GEO_REASONS[reason]))
+                continue
+            if not any(c["id"] == course_id for c in self.catalog.courses_for_student(student_id)):
+                results.append(self._reject("Student is not enrolled in this course"))
+                continue
+            session_date = datetime.fromtimestamp(timestamp).date()
+            _, late_after, _ = self._window(self.catalog.get_course(course_id), session_date)
+            status = STATUS_CODES["Present"] if timestamp <= late_after else STATUS_CODES["Late"]
+            results.append(self._queue(student_id, course_id, date_to_day(session_date), status, timestamp))
+        return results
+
+    def check_in(self, student_id, course_id, timestamp=None, wait=0.0):
+        """Check a student in to a course's session now (e.g. from the dashboard)"""
+        timestamp = self.clock() if timestamp is None else timestamp
+        course = self.catalog.get_course(course_id)
+        if course is None:
+            return self._reject("Unknown course")
+        if not any(c["id"] == course_id for c in self.catalog.courses_for_student(student_id)):
+            return self._reject("Student is not enrolled in this course")
+
+        session_date = datetime.fromtimestamp(timestamp).date()
+        opens, late_after, closes = self._window(course, session_date)
+        if not opens <= timestamp <= closes:
+            return self._reject("Check-in is closed for this session")
+        status = STATUS_CODES["Present"] if timestamp <= late_after else STATUS_CODES["Late"]
+        return self._queue(student_id, course_id, date_to_day(session_date), status, timestamp, wait)
+
+    def _queue(self, student_id, course_id, day, status, timestamp, wait=0.0):
+        """Hand a validated check-in to the queue unless the student already checked in"""
+        key = (student_id, course_id)
+        with self._lock:
+            seen = self._seen.setdefault(day, set())
+            if key in seen:
+                self.counts[DUPLICATE] += 1
+                return DUPLICATE, "Already checked in"
+            seen.add(key)
+            if self._oldest_day is None or day > self._oldest_day + 1:
+                self._prune(day - 1)
+
+        if not self.queue.put(student_id, course_id, day, status, timestamp, timeout=wait):
+            # Pushed back: forget the scan so the retry is not treated as a duplicate
+            with self._lock:
+                self._seen[day].discard(key)
+                self.counts[BUSY] += 1
+            return BUSY, "Check-in is busy, please try again"
+
+        with self._lock:
+            self.counts[ACCEPTED] += 1
+        return ACCEPTED, "Checked in"
+
+    def _reject(self, message):
+        with self._lock:
+            self.counts[REJECTED] += 1
+        return REJECTED, message
+
+    def flush(self, timeout=None):
+        """Block until every accepted check-in has been written to the store"""
+        return self.queue.flush(timeout)
+
+    def _prune(self, oldest_day):
+        """Forget dedupe state and windows for sessions before `oldest_day`"""
+        for day in [d for d in self._seen if d < oldest_day]:
+            del self._seen[day]
+        self._oldest_day = oldest_day
+        if len(self._windows) > 100000:
+            self._windows.clear()
+
+    def stats(self):
+        """Return outcome counters together with the queue's metrics"""
+        with self._lock:
+            counts = dict(self.counts)
+        counts["queue"] = self.queue.metrics()
+        return counts
+
+
+_ingestor = None
+_ingestor_lock = threading.Lock()
+
+
+def get_checkin_ingestor():
+    """Return the process-wide check-in ingestor"""
+    global _ingestor
+    if _ingestor is None:
+        with _ingestor_lock:
+            if _ingestor is None:
+                _ingestor = CheckinIngestor(get_catalog(), get_checkin_queue())
+    return _ingestor
@@ -0,0 +1,166 @@
+# Check-in queue component
+#
+# A bounded in-process queue between check-in producers (QR scans, location
+# check-ins, the student dashboard button) and the attendance store. A single
+# committer thread drains it with group commit: whatever has queued up while the
+# previous write ran goes into the next store append (optionally after waiting
+# up to CHECKIN_FLUSH_INTERVAL for a fuller batch). When the queue is full,
+# producers are pushed back (put returns False) instead of growing memory
+# without bound.
+
+import atexit
+import logging
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from components.attendance import get_attendance_store
+from config import CHECKIN_BATCH_SIZE, CHECKIN_FLUSH_INTERVAL, CHECKIN_LATENCY_SAMPLES, CHECKIN_QUEUE_SIZE
+
+logger = logging.getLogger(__name__)
+
+
+class CheckinQueue:
+    """Bounded check-in queue with a group-commit writer thread and metrics."""
+
+    def __init__(self, store, maxsize=CHECKIN_QUEUE_SIZE, max_batch=CHECKIN_BATCH_SIZE,
+                 max_delay=CHECKIN_FLUSH_INTERVAL):
+        self.store = store
+        self.maxsize = maxsize
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+
+        self._items = deque()  # (student, course, day, status code, timestamp, enqueued at)
+        self._cond = threading.Condition()
+        self._inflight = 0
+        self._idle = False
+        self._closed = False
+        self._thread = None
+
+        self.counts = {"enqueued": 0, "committed": 0, "failed": 0, "rejected": 0, "batches": 0}
+        self.max_depth = 0
+        self._latencies = deque(maxlen=CHECKIN_LATENCY_SAMPLES)  # ms from enqueue to commit
+
+    def put(self, student_id, course_id, day, status, timestamp, timeout=0.0):
+        """Queue one check-in; return False if the queue stayed full for `timeout` seconds"""
+        with self._cond:
+            if len(self._items) >= self.maxsize and timeout:
+                self._cond.wait_for(lambda: len(self._items) < self.maxsize or self._closed, timeout)
+            if len(self._items) >= self.maxsize or self._closed:
+                self.counts["rejected"] += 1
+                return False
+
+            self._items.append((student_id, course_id, day, status, int(timestamp), time.perf_counter()))
+            self.counts["enqueued"] += 1
+            self.max_depth = max(self.max_depth, len(self._items))
+            # Only wake the committer when it is idle or a full batch is ready
+            if self._idle or len(self._items) >= self.max_batch:
+                self._cond.notify_all()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="checkin-committer", daemon=True)
+                self._thread.start()
+        return True
+
+    def _next_batch(self):
+        """Wait for work and take up to max_batch items; None once closed and drained"""
+        with self._cond:
+            self._idle = True
+            self._cond.wait_for(lambda: self._items or self._closed)
+            self._idle = False
+            if not self._items:
+                return None
+
+            # Give a burst a moment to fill the batch, bounded by the oldest item's wait
+            deadline = self._items[0][5] + self.max_delay
+            while len(self._items) < self.max_batch and not self._closed:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+
+            count = min(len(self._items), self.max_batch)
+            batch = [self._items.popleft() for _ in range(count)]
+            self._inflight = count
+            self._cond.notify_all()  # room for blocked producers
+            return batch
+
+    def _run(self):
+        """Committer thread: write batches to the store until closed"""
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+
+            students, courses, days, statuses, timestamps, enqueued = zip(*batch)
+            outcome = "committed"
+            try:
+                self.store.append(
+                    np.array(students, dtype=np.int32),
+                    np.array(courses, dtype=np.int32),
+                    np.array(days, dtype=np.int32),
+                    np.array(statuses, dtype=np.int8),
+                    np.array(timestamps, dtype=np.int64),
+                )
+            except Exception:
+                logger.exception("Failed to commit %d check-ins", len(batch))
+                outcome = "failed"
+
+            committed = time.perf_counter()
+            with self._cond:
+                self._inflight = 0
+                self.counts[outcome] += len(batch)
+                self.counts["batches"] += 1
+                self._latencies.extend((committed - t) * 1000 for t in enqueued)
+                self._cond.notify_all()
+
+    def flush(self, timeout=None):
+        """Block until everything queued so far has been committed"""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._items and not self._inflight, timeout)
+
+    def close(self, timeout=5.0):
+        """Stop accepting check-ins, commit what is queued and stop the thread"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def depth(self):
+        """Return the number of check-ins waiting to be committed"""
+        with self._cond:
+            return len(self._items)
+
+    def metrics(self):
+        """Return queue depth, throughput counters and commit latency percentiles"""
+        with self._cond:
+            latencies = np.fromiter(self._latencies, dtype=np.float64)
+            metrics = dict(
+                self.counts,
+                depth=len(self._items),
+                max_depth=self.max_depth,
+                capacity=self.maxsize,
+            )
+        batches = metrics["batches"]
+        metrics["mean_batch"] = metrics["committed"] / batches if batches else 0.0
+        metrics["p50_commit_ms"] = float(np.percentile(latencies, 50)) if len(latencies) else 0.0
+        metrics["p99_commit_ms"] = float(np.percentile(latencies, 99)) if len(latencies) else 0.0
+        return metrics
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_checkin_queue():
+    """Return the process-wide check-in queue feeding the attendance store"""
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                _queue = CheckinQueue(get_attendance_store())
+                # Registered after the store's snapshot hook, so it drains first
+                atexit.register(_queue.close)
+    return _queue
@@ -0,0 +1,185 @@
+# Check-in HTTP server
+#
+# A small asyncio HTTP/1.1 endpoint that runs next to the Streamlit app and feeds
+# scans into the check-in ingestor. Connections are kept alive and requests are
+# handled concurrently on one event loop; store writes happen on the check-in
+# queue's committer thread, and a full queue answers 503 so clients back off.
+#
+#   POST /checkin       {"student_id": 1, "payload": "<token from the projector QR code>"}
+#   POST /checkin/geo   {"checkins": [{"student_id": 1, "course_id": 1, "lat": .., "lon": .., "timestamp": ..}]}
+#   GET  /health        ingestor counters and queue metrics
+#
+# Usage:
+#   python -m components.checkin_server --port 8502
+# or set CLASSTRACKER_CHECKIN_SERVER=1 to start it inside the Streamlit process.
+
+import argparse
+import asyncio
+import json
+import logging
+import threading
+
+from components.checkin import ACCEPTED, BUSY, DUPLICATE, get_checkin_ingestor
+from config import CHECKIN_CLOCK_SKEW_SECONDS, CHECKIN_HOST, CHECKIN_PORT
+
+logger = logging.getLogger(__name__)
+
+_REASONS = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    422: "Unprocessable Entity", 503: "Service Unavailable",
+}
+_MAX_BODY = 1024 * 1024
+
+
+def _response(status, body, keep_alive=True):
+    """Encode a JSON HTTP response"""
+    payload = json.dumps(body).encode("utf-8")
+    head = (
+        f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+        f"Content-Type: application/json\r\n"
+        f"Content-Length: {len(payload)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return head.encode("ascii") + payload
+
+
+def handle_request(ingestor, method, path, body):
+    """Route one request and return (status, response body)"""
+    if path == "/health":
+        return 200, ingestor.stats()
+    if path not in ("/checkin", "/checkin/geo"):
+        return 404, {"error": "not found"}
+    if method != "POST":
+        return 405, {"error": "use POST"}
+    if path == "/checkin/geo":
+        return _handle_geo(ingestor, body)
+
+    try:
+        data = json.loads(body)
+        student_id = int(data["student_id"])
+        payload = str(data["payload"])
+    except (ValueError, KeyError, TypeError):
+        return 400, {"error": "expected JSON with student_id and payload"}
+
+    outcome, message = ingestor.submit(student_id, payload)
+    if outcome in (ACCEPTED, DUPLICATE):
+        status = 200
+    else:
+        status = 503 if outcome == BUSY else 422
+    return status, {"status": outcome, "message": message}
+
+
+def _handle_geo(ingestor, body):
+    """Validate a batch of location check-ins in one pass"""
+    try:
+        checkins = json.loads(body)["checkins"]
+        now = int(ingestor.clock())
+        columns = [
+            [int(c["student_id"]) for c in checkins],
+            [int(c["course_id"]) for c in checkins],
+            [float(c["lat"]) for c in checkins],
+            [float(c["lon"]) for c in checkins],
+            [int(c.get("timestamp", now)) for c in checkins],
+        ]
+    except (ValueError, KeyError, TypeError):
+        return 400, {"error": "expected JSON with a checkins list"}
+
+    # The endpoint has no token, so the window and Present/Late are judged on
+    # server time; a client scan time is only kept within a small clock skew
+    results = ingestor.submit_geo(*columns, max_skew=CHECKIN_CLOCK_SKEW_SECONDS)
+    return 200, {"results": [{"status": outcome, "message": message} for outcome, message in results]}
+
+
+async def _serve_connection(ingestor, reader, writer):
+    """Handle keep-alive requests on one connection until the client closes it"""
+    try:
+        while True:
+            try:
+                head = await reader.readuntil(b"\r\n\r\n")
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+                break
+
+            lines = head.decode("latin-1").split("\r\n")
+            try:
+                method, path, _ = lines[0].split(" ", 2)
+            except ValueError:
+                writer.write(_response(400, {"error": "bad request line"}, keep_alive=False))
+                break
+            headers = {}
+            for line in lines[1:]:
+                name, sep, value = line.partition(":")
+                if sep:
+                    headers[name.strip().lower()] = value.strip()
+
+            try:
+                length = int(headers.get("content-length", "0") or 0)
+            except ValueError:
+                length = -1
+            if length < 0:
+                writer.write(_response(400, {"error": "bad Content-Length"}, keep_alive=False))
+                break
+            if length > _MAX_BODY:
+                writer.write(_response(400, {"error": "body too large"}, keep_alive=False))
+                break
+            body = await reader.readexactly(length) if length else b""
+
+            keep_alive = headers.get("connection", "").lower() != "close"
+            status, response = handle_request(ingestor, method, path.split("?", 1)[0], body)
+            writer.write(_response(status, response, keep_alive))
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(host=CHECKIN_HOST, port=CHECKIN_PORT, ingestor=None):
+    """Run the check-in server until cancelled"""
+    ingestor = ingestor or get_checkin_ingestor()
+    server = await asyncio.start_server(
+        lambda r, w: _serve_connection(ingestor, r, w), host, port, backlog=1024
+    )
+    logger.info("Check-in server listening on %s:%s", host, port)
+    async with server:
+        await server.serve_forever()
+
+
+_server_thread = None
+_server_lock = threading.Lock()
+
+
+def start_checkin_server(host=CHECKIN_HOST, port=CHECKIN_PORT):
+    """Start the check-in server on a background thread once per process"""
+    global _server_thread
+    with _server_lock:
+        if _server_thread is not None:
+            return _server_thread
+
+        def run():
+            try:
+                asyncio.run(serve(host, port))
+            except OSError as e:
+                logger.warning("Check-in server not started: %s", e)
+
+        _server_thread = threading.Thread(target=run, name="checkin-server", daemon=True)
+        _server_thread.start()
+        return _server_thread
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the ClassTracker check-in endpoint")
+    parser.add_argument("--host", default=CHECKIN_HOST)
+    parser.add_argument("--port", type=int, default=CHECKIN_PORT)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+# Schedule conflict component
+#
+# Finds overlapping sections for every student, room and professor at once. A
+# sweep line over all weekly meetings (sorted by minute of the week) pairs each
+# meeting with the ones that start before it ends, which yields every pair of
+# sections that overlap anywhere in the week as a sorted array of pair keys.
+# Each population is then a list of (owner, section) rows; pairs of sections
+# sharing an owner are generated group by group and kept when their key is in
+# the overlap set, so 100k students cost a few vectorized passes.
+#
+# Moving one section is re-checked incrementally: its meetings are taken out
+# of and put back into the sorted arrays, its overlaps are found with two
+# binary searches per meeting and kept as a neighbour set beside the swept
+# pairs, and only the conflicts of its students, rooms and professors are
+# recomputed.
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+from components.catalog import get_catalog
+from components.schedule import MINUTES_PER_DAY, meeting_pattern
+
+KINDS = ("student", "room", "professor")
+
+
+def _room_key(pattern):
+    """Return one integer per (building, room)"""
+    return pattern["building"] * 10000 + pattern["room"]
+
+
+def _meetings(pattern):
+    """Return a pattern's weekly meetings as (start, end) minutes of the week"""
+    return [(day * MINUTES_PER_DAY + pattern["start"], day * MINUTES_PER_DAY + pattern["end"])
+            for day in pattern["days"]]
+
+
+def _owner_pairs(owners, sections):
+    """Return (owner, a, b) for every pair of sections a < b sharing an owner"""
+    order = np.lexsort((sections, owners))
+    owners, sections = owners[order], sections[order]
+    found_owner, found_a, found_b = [], [], []
+    # Rows of one owner are adjacent, so pair each row with the next d rows for growing d
+    d = 1
+    while d < len(owners):
+        same = owners[d:] == owners[:-d]
+        if not same.any():
+            break
+        rows = np.flatnonzero(same)
+        found_owner.append(owners[rows])
+        found_a.append(sections[rows])
+        found_b.append(sections[rows + d])
+        d += 1
+    if not found_owner:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, empty
+    a, b = np.concatenate(found_a), np.concatenate(found_b)
+    keep = a != b
+    return np.concatenate(found_owner)[keep], a[keep], b[keep]
+
+
+def _csr(keys, values, size):
+    """Group values by key: return (offsets, values sorted by key)"""
+    order = np.argsort(keys, kind="stable")
+    offsets = np.concatenate([[0], np.cumsum(np.bincount(keys, minlength=size))])
+    return offsets, values[order]
+
+
+def _gather(offsets, values, keys):
+    """Return (key, value) rows for the given keys of a grouped array"""
+    keys = keys[keys < len(offsets) - 1]
+    lo, hi = offsets[keys], offsets[keys + 1]
+    counts = hi - lo
+    within = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    return np.repeat(keys, counts), values[np.repeat(lo, counts) + within]
+
+
+class ConflictEngine:
+    """Overlapping sections across all students, rooms and professors."""
+
+    def __init__(self, courses, students, professors):
+        self.courses_by_id = {c["id"]: c for c in courses}
+        self._size = max(self.courses_by_id, default=0) + 1
+        self._patterns = {c["id"]: meeting_pattern(c) for c in courses}
+
+        # Weekly meetings sorted by start, as in the schedule index
+        sections, starts, ends = [], [], []
+        for course_id, pattern in self._patterns.items():
+            for start, end in _meetings(pattern):
+                sections.append(course_id)
+                starts.append(start)
+                ends.append(end)
+        order = np.argsort(np.asarray(starts, dtype=np.int64), kind="stable")
+        self.sections = np.asarray(sections, dtype=np.int64)[order]
+        self.starts = np.asarray(starts, dtype=np.int64)[order]
+        self.ends = np.asarray(ends, dtype=np.int64)[order]
+
+        # (owner, section) rows per population, grouped both ways for incremental re-checks
+        self._rooms = np.zeros(self._size, dtype=np.int64)
+        for course_id, pattern in self._patterns.items():
+            self._rooms[course_id] = _room_key(pattern)
+        self._members = {
+            "student": [(s["id"], c) for s in students for c in s["courses"]],
+            "professor": [(p["id"], c) for p in professors for c in p["courses"]],
+        }
+        self._by_section, self._by_owner = {}, {}
+        for kind, rows in self._members.items():
+            rows = np.asarray(rows, dtype=np.int64).reshape(-1, 2)
+            owners, sections_of = rows[:, 0], rows[:, 1]
+            self._members[kind] = (owners, sections_of)
+            self._by_section[kind] = _csr(sections_of, owners, self._size)
+            self._by_owner[kind] = _csr(owners, sections_of, int(owners.max()) + 1 if len(owners) else 1)
+
+        self._pairs = self._sweep()
+        self._moved = {}  # section moved since the sweep -> sections it overlaps now
+        self.conflicts = {kind: self._check(kind) for kind in KINDS}
+
+    def _key(self, a, b):
+        """Pack section pairs into one int64, smaller id first"""
+        return np.minimum(a, b) * self._size + np.maximum(a, b)
+
+    def _sweep(self):
+        """Return the sorted keys of every pair of sections with overlapping meetings"""
+        # Meeting i overlaps every later-starting meeting j that starts before i ends
+        hi = np.searchsorted(self.starts, self.ends, side="left")
+        counts = np.maximum(hi - np.arange(len(hi)) - 1, 0)
+        first = np.repeat(np.arange(len(hi)), counts)
+        second = first + 1 + np.arange(len(first)) - np.repeat(np.cumsum(counts) - counts, counts)
+        a, b = self.sections[first], self.sections[second]
+        keep = a != b
+        keys = np.sort(self._key(a[keep], b[keep]))
+        return keys[np.concatenate([[True], keys[1:] != keys[:-1]])] if len(keys) else keys
+
+    def _overlaps(self, a, b):
+        """Return True where the sections of each pair overlap"""
+        # Searching in key order keeps the binary searches cache-friendly
+        keys = self._key(a, b)
+        order = np.argsort(keys)
+        pos = np.minimum(np.searchsorted(self._pairs, keys[order]), max(len(self._pairs) - 1, 0))
+        hit = np.zeros(len(keys), dtype=bool)
+        if len(self._pairs):
+            hit[order] = self._pairs[pos] == keys[order]
+        if self._moved:
+            moved = np.fromiter(self._moved, dtype=np.int64)
+            for row in np.flatnonzero(np.isin(a, moved) | np.isin(b, moved)).tolist():
+                first, second = int(a[row]), int(b[row])
+                hit[row] = second in self._moved[first] if first in self._moved else first in self._moved[second]
+        return hit
+
+    def _rows(self, kind, course_id=None):
+        """Return (owner, section) rows of a population, or only those of the owners of one section"""
+        if kind == "room":
+            sections = np.asarray(list(self._patterns), dtype=np.int64)
+            if course_id is not None:
+                sections = sections[self._rooms[sections] == self._rooms[course_id]]
+            return self._rooms[sections], sections
+        if course_id is None:
+            return self._members[kind]
+        offsets, owners = self._by_section[kind]
+        return _gather(*self._by_owner[kind], owners[offsets[course_id]:offsets[course_id + 1]])
+
+    def _check(self, kind, course_id=None):
+        """Return a population's conflicts (or those involving one section) as (owner, a, b), a < b"""
+        owner, a, b = _owner_pairs(*self._rows(kind, course_id))
+        if course_id is not None:
+            involved = (a == course_id) | (b == course_id)
+            owner, a, b = owner[involved], a[involved], b[involved]
+        hit = self._overlaps(a, b)
+        return owner[hit], np.minimum(a[hit], b[hit]), np.maximum(a[hit], b[hit])
+
+    def move_section(self, course):
+        """Re-check after a section's meeting pattern or room changes; return (added, removed) conflicts"""
+        course_id = course["id"]
+        pattern = meeting_pattern(course)
+        self.courses_by_id[course_id] = course
+        self._patterns[course_id] = pattern
+        self._rooms[course_id] = _room_key(pattern)
+
+        # Take the section's meetings out of the sorted arrays and insert the new ones in place
+        keep = self.sections != course_id
+        self.sections, self.starts, self.ends = self.sections[keep], self.starts[keep], self.ends[keep]
+        for start, end in _meetings(pattern):
+            pos = np.searchsorted(self.starts, start, side="right")
+            self.sections = np.insert(self.sections, pos, course_id)
+            self.starts = np.insert(self.starts, pos, start)
+            self.ends = np.insert(self.ends, pos, end)
+
+        # Its overlaps now: meetings starting in (start - max_length, end) that end after start
+        max_length = int((self.ends - self.starts).max())
+        found = [np.empty(0, dtype=np.int64)]
+        for start, end in _meetings(pattern):
+            lo = np.searchsorted(self.starts, start - max_length, side="right")
+            hi = np.searchsorted(self.starts, end, side="left")
+            rows = np.arange(lo, hi)
+            found.append(self.sections[rows[self.ends[rows] > start]])
+        others = np.unique(np.concatenate(found))
+        others = others[others != course_id]
+
+        # The swept pairs stay as they are; moved sections answer from their own neighbour sets
+        others = set(others.tolist())
+        for section, neighbours in self._moved.items():
+            if section in others:
+                neighbours.add(course_id)
+            else:
+                neighbours.discard(course_id)
+        self._moved[course_id] = others
+
+        # Only conflicts involving the moved section can change
+        added, removed = [], []
+        for kind in KINDS:
+            owner, a, b = self.conflicts[kind]
+            involved = (a == course_id) | (b == course_id)
+            fresh = self._check(kind, course_id)
+            before = set(zip(owner[involved].tolist(), a[involved].tolist(), b[involved].tolist()))
+            after = set(zip(*(column.tolist() for column in fresh)))
+            self.conflicts[kind] = tuple(
+                np.concatenate([column[~involved], new]) for column, new in zip((owner, a, b), fresh)
+            )
+            added.extend((kind, *row) for row in sorted(after - before))
+            removed.extend((kind, *row) for row in sorted(before - after))
+        return _frame(added), _frame(removed)
+
+    def counts(self):
+        """Return the number of conflicts per population"""
+        return {kind: len(self.conflicts[kind][0]) for kind in KINDS}
+
+    def table(self, kind):
+        """Return a population's conflicts as a DataFrame (owner, section_a, section_b)"""
+        return _frame([(kind, *row) for row in zip(*(column.tolist() for column in self.conflicts[kind]))])
+
+    def overlap(self, a, b):
+        """Return the first overlap of two sections as (day, start, end) minutes, or None"""
+        for start_a, end_a in _meetings(self._patterns[a]):
+            for start_b, end_b in _meetings(self._patterns[b]):
+                if start_a < end_b and start_b < end_a:
+                    start, end = max(start_a, start_b), min(end_a, end_b)
+                    return start // MINUTES_PER_DAY, start % MINUTES_PER_DAY, end % MINUTES_PER_DAY
+        return None
+
+    def for_owner(self, kind, owner_id):
+        """Return one owner's conflicts as dicts with both courses and where they overlap"""
+        owner, a, b = self.conflicts[kind]
+        rows = np.flatnonzero(owner == owner_id)
+        conflicts = []
+        for first, second in zip(a[rows].tolist(), b[rows].tolist()):
+            day, start, end = self.overlap(first, second)
+            conflicts.append({
+                "course_a": self.courses_by_id[first],
+                "course_b": self.courses_by_id[second],
+                "day": day,
+                "start": start,
+                "end": end,
+            })
+        return sorted(conflicts, key=lambda c: (c["day"], c["start"]))
+
+    def for_sections(self, course_ids):
+        """Return room and professor conflicts touching any of the given sections"""
+        conflicts = []
+        for kind in ("room", "professor"):
+            owner, a, b = self.conflicts[kind]
+            rows = np.flatnonzero(np.isin(a, course_ids) | np.isin(b, course_ids))
+            for row in rows.tolist():
+                first, second = int(a[row]), int(b[row])
+                day, start, end = self.overlap(first, second)
+                conflicts.append({
+                    "kind": kind,
+                    "owner": int(owner[row]),
+                    "course_a": self.courses_by_id[first],
+                    "course_b": self.courses_by_id[second],
+                    "day": day,
+                    "start": start,
+                    "end": end,
+                })
+        return conflicts
+
+
+def _frame(rows):
+    """Turn (kind, owner, a, b) tuples into a DataFrame"""
+    return pd.DataFrame(rows, columns=["kind", "owner", "section_a", "section_b"])
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_conflict_engine():
+    """Return the process-wide conflict engine over the catalog"""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                catalog = get_catalog()
+                _engine = ConflictEngine(catalog.courses, catalog.students, catalog.professors)
+    return _engine
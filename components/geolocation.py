@@ -0,0 +1,164 @@
+# Geolocation check-in component
+#
+# Classroom locations for every course plus a uniform grid index over the
+# campus. Cells are CHECKIN_RADIUS_METERS wide, so a scan can only be within the
+# radius of a room whose cell is the scan's own cell or one of its eight
+# neighbours. Batch validation uses that as an integer prefilter and then runs
+# a vectorized haversine only on the remaining rows, together with the
+# +/- window around each session's start. A scan only has a session to check
+# in to if the section meets that day: its weekday, inside the term and
+# outside breaks, as listed by the session table (components.sessions).
+
+from datetime import datetime
+
+import numpy as np
+
+from components.attendance import date_to_day, day_to_date
+from components.checkin import session_window
+from components.schedule import meeting_pattern
+from components.sessions import get_session_table
+from config import CAMPUS_BUILDING_SPACING_METERS, CAMPUS_BUILDINGS, CAMPUS_CENTER, CHECKIN_RADIUS_METERS
+
+EARTH_RADIUS_METERS = 6371008.8
+
+# Validation outcome codes, per row
+GEO_OK = 0
+GEO_UNKNOWN_ROOM = 1
+GEO_OUT_OF_RANGE = 2
+GEO_OUTSIDE_WINDOW = 3
+GEO_REASONS = {
+    GEO_OK: "Checked in",
+    GEO_UNKNOWN_ROOM: "No classroom location for this course",
+    GEO_OUT_OF_RANGE: "Too far from the classroom",
+    GEO_OUTSIDE_WINDOW: "Check-in is closed for this session",
+}
+
+
+def building_location(building):
+    """Return (lat, lon) of a numbered building on the campus grid"""
+    per_row = int(np.ceil(np.sqrt(CAMPUS_BUILDINGS)))
+    row, col = divmod(building - 1, per_row)
+    north = (row - (per_row - 1) / 2) * CAMPUS_BUILDING_SPACING_METERS
+    east = (col - (per_row - 1) / 2) * CAMPUS_BUILDING_SPACING_METERS
+    lat0, lon0 = CAMPUS_CENTER
+    lat = lat0 + np.degrees(north / EARTH_RADIUS_METERS)
+    lon = lon0 + np.degrees(east / (EARTH_RADIUS_METERS * np.cos(np.radians(lat0))))
+    return float(lat), float(lon)
+
+
+def classroom_for_course(course):
+    """Return the classroom record (building, room, lat, lon) for a course"""
+    pattern = meeting_pattern(course)
+    building, room = pattern["building"], pattern["room"]
+    lat, lon = building_location(building)
+    return {
+        "building": building,
+        "room": room,
+        "lat": course.get("lat", lat),
+        "lon": course.get("lon", lon),
+    }
+
+
+def format_location(course):
+    """Return the "Building N, Room M" label for a course"""
+    room = classroom_for_course(course)
+    return f"Building {room['building']}, Room {room['room']}"
+
+
+def haversine_meters(lat1, lon1, lat2, lon2):
+    """Great-circle distance in meters, element-wise over arrays"""
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_METERS * np.arcsin(np.sqrt(a))
+
+
+class ClassroomIndex:
+    """Per-course classroom coordinates with a grid index over the campus."""
+
+    def __init__(self, courses, radius=CHECKIN_RADIUS_METERS, table_for=get_session_table):
+        self.radius = radius
+        self.table_for = table_for
+        self.courses_by_id = {c["id"]: c for c in courses}
+
+        # Dense per-course arrays so a batch is resolved with one fancy-index
+        size = max(self.courses_by_id, default=0) + 1
+        self.known = np.zeros(size, dtype=bool)
+        self.lat = np.zeros(size)
+        self.lon = np.zeros(size)
+        for course in courses:
+            room = classroom_for_course(course)
+            self.known[course["id"]] = True
+            self.lat[course["id"]] = room["lat"]
+            self.lon[course["id"]] = room["lon"]
+
+        # Grid cells of radius width on a local equirectangular projection
+        self._lat0, self._lon0 = CAMPUS_CENTER
+        self._meters_per_lon = np.radians(1) * EARTH_RADIUS_METERS * np.cos(np.radians(self._lat0))
+        self._meters_per_lat = np.radians(1) * EARTH_RADIUS_METERS
+        self.cell_x, self.cell_y = self.cells(self.lat, self.lon)
+
+        self._grid = {}  # (cell x, cell y) -> course ids with a classroom in that cell
+        for course_id in np.flatnonzero(self.known):
+            key = (int(self.cell_x[course_id]), int(self.cell_y[course_id]))
+            self._grid.setdefault(key, []).append(int(course_id))
+
+    def cells(self, lats, lons):
+        """Return the grid cell (x, y) of each point"""
+        x = (np.asarray(lons) - self._lon0) * self._meters_per_lon / self.radius
+        y = (np.asarray(lats) - self._lat0) * self._meters_per_lat / self.radius
+        return np.floor(x).astype(np.int64), np.floor(y).astype(np.int64)
+
+    def validate(self, course_ids, lats, lons, timestamps):
+        """Check a batch of check-ins against their course's room and session window.
+
+        Returns (reasons, distances): a GEO_* code per row and the distance in
+        meters to the room (NaN where the grid prefilter already ruled it out).
+        """
+        course_ids = np.asarray(course_ids, dtype=np.int64)
+        lats = np.asarray(lats, dtype=np.float64)
+        lons = np.asarray(lons, dtype=np.float64)
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        n = len(course_ids)
+
+        reasons = np.full(n, GEO_OK, dtype=np.int8)
+        distances = np.full(n, np.nan)
+        in_range = (course_ids >= 0) & (course_ids < len(self.known))
+        known = np.zeros(n, dtype=bool)
+        known[in_range] = self.known[course_ids[in_range]]
+        reasons[~known] = GEO_UNKNOWN_ROOM
+        course_ids = np.where(known, course_ids, 0)
+
+        # Grid prefilter: the room must be in the scan's cell or a neighbouring one
+        cx, cy = self.cells(lats, lons)
+        near = known & (np.abs(cx - self.cell_x[course_ids]) <= 1) & (np.abs(cy - self.cell_y[course_ids]) <= 1)
+        reasons[known & ~near] = GEO_OUT_OF_RANGE
+
+        rows = np.flatnonzero(near)
+        distances[rows] = haversine_meters(lats[rows], lons[rows], self.lat[course_ids[rows]], self.lon[course_ids[rows]])
+        reasons[rows[distances[rows] > self.radius]] = GEO_OUT_OF_RANGE
+
+        # Session and its window, computed once per (course, day) in the batch
+        rows = np.flatnonzero(reasons == GEO_OK)
+        if len(rows):
+            days = _local_days(timestamps[rows])
+            pairs, inverse = np.unique((course_ids[rows] << 16) | days, return_inverse=True)
+            inverse = inverse.ravel()
+            dates = [day_to_date(pair & 0xFFFF) for pair in pairs]
+            held = np.array([
+                self.table_for(day.year).count([int(pair >> 16)], day, day)[0] > 0 for pair, day in zip(pairs, dates)
+            ])
+            windows = np.array([
+                session_window(self.courses_by_id[int(pair >> 16)], day)[::2] for pair, day in zip(pairs, dates)
+            ])
+            opens, closes = windows[inverse, 0], windows[inverse, 1]
+            ts = timestamps[rows]
+            reasons[rows[~held[inverse] | (ts < opens) | (ts > closes)]] = GEO_OUTSIDE_WINDOW
+        return reasons, distances
+
+
+def _local_days(timestamps):
+    """Return the local calendar day (days since epoch) of each Unix timestamp"""
+    hours, inverse = np.unique(timestamps // 3600, return_inverse=True)
+    days = np.array([date_to_day(datetime.fromtimestamp(int(h) * 3600)) for h in hours], dtype=np.int64)
+    return days[inverse.ravel()]
+
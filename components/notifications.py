@@ -1,11 +1,593 @@
-# Notifications component - placeholder for future implementation
+# Notifications component
+#
+# Class reminders are planned ahead from the materialized session dates (so
+# none go out during breaks) and each user's notification preferences (lead
+# time, quiet hours, weekends), then kept in a min-heap ordered by fire time.
+# Every tick pops only the reminders that are due, so the cost of a tick does
+# not depend on how many are pending. Changing a user's preferences bumps their
+# generation number and re-plans just that user; the heap entries planned under
+# the old generation are skipped when they come up.
+#
+# Sent notifications land in a per-user inbox in SQLite. Pages are read newest
+# first with an id cursor, so each page is one index range scan no matter how
+# long the inbox is, and unread counts are kept in their own table, updated in
+# the same transaction as every insert and mark-read.
+#
+# Before anything is stored, a coalescing stage keyed on (user, kind, course)
+# catches repeats within a per-kind window: an identical repeat is dropped and a
+# changed one is merged into the notification already delivered (its text is
+# updated and it becomes unread again). Only fresh notifications come back from
+# send_notifications, so email fan-out skips the repeats too. The windows are
+# kept in memory and reopened from the inbox's recent rows when the process
+# starts, so a restart doesn't send everything again.
 
-def send_notification(user_id, title, message):
-    """Placeholder for sending notifications"""
-    # In a real implementation, this would add a notification to the database
-    return True
+import heapq
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
 
-def get_user_notifications(user_id):
-    """Placeholder for retrieving notifications"""
-    # In a real implementation, this would query the database
-    return []
+import numpy as np
+
+from components.catalog import get_catalog
+from components.schedule import meeting_pattern
+from components.sessions import SessionTable, session_days
+from config import (
+    NOTIFICATION_COALESCE_SECONDS,
+    NOTIFICATION_COALESCE_WINDOWS,
+    NOTIFICATION_DB_PATH,
+    NOTIFICATION_DEFAULTS,
+    NOTIFICATION_PAGE_SIZE,
+    REMINDER_HORIZON_HOURS,
+    REMINDER_TICK_SECONDS,
+)
+from utils.time_utils import get_times_until, midnight_timestamps, weekday_of
+
+_preferences = {}  # (role, user_id) -> preferences saved by the user
+_preferences_lock = threading.Lock()
+
+
+def get_notification_preferences(role, user_id):
+    """Return a user's notification preferences, filled in with the defaults"""
+    with _preferences_lock:
+        return dict(NOTIFICATION_DEFAULTS, **_preferences.get((role, user_id), {}))
+
+
+def set_notification_preferences(role, user_id, preferences):
+    """Save a user's notification preferences and re-plan their reminders"""
+    unknown = set(preferences) - set(NOTIFICATION_DEFAULTS)
+    if unknown:
+        raise ValueError(f"Unknown notification preferences: {', '.join(sorted(unknown))}")
+    with _preferences_lock:
+        _preferences[(role, user_id)] = dict(_preferences.get((role, user_id), {}), **preferences)
+    if _scheduler is not None:
+        _scheduler.reschedule_user(role, user_id)
+
+
+def _minutes(value):
+    """Return minutes after midnight for an "HH:MM" string or a time"""
+    if isinstance(value, str):
+        value = datetime.strptime(value, "%H:%M").time()
+    return value.hour * 60 + value.minute
+
+
+class ReminderScheduler:
+    """Min-heap of pending class reminders with per-user preferences."""
+
+    def __init__(self, catalog, horizon_hours=REMINDER_HORIZON_HOURS):
+        self.catalog = catalog
+        self.horizon = horizon_hours * 3600
+        self.planned_until = None  # reminders firing before this time are in the heap
+
+        self._heap = []          # (fire_at, role, user_id, course_id, class starts, generation)
+        self._generation = {}    # (role, user_id) -> current generation
+        self._pending = {}       # (role, user_id) -> live entries in the heap
+        self._session_tables = {}  # year -> SessionTable over the catalog
+        self._stale = 0
+        self._lock = threading.Lock()
+        self._plan_lock = threading.Lock()  # held while planned_until is read, planned and moved
+        self._thread = None
+
+    def __len__(self):
+        return len(self._heap) - self._stale
+
+    def _session_table(self, year):
+        """Return the session table of this scheduler's catalog for a year"""
+        table = self._session_tables.get(year)
+        if table is None:
+            table = self._session_tables[year] = SessionTable(self.catalog.courses, year)
+        return table
+
+    def _enrollments(self, users=None):
+        """Return (roles, user ids, course ids) for every user/course pair to remind"""
+        pairs = []
+        if users is None:
+            for student in self.catalog.students:
+                pairs.extend(("student", student["id"], c) for c in student["courses"])
+            for professor in self.catalog.professors:
+                pairs.extend(("professor", professor["id"], c) for c in professor["courses"])
+        else:
+            for role, user_id in users:
+                pairs.extend((role, user_id, c["id"]) for c in self.catalog.courses_for_user(role, user_id))
+        return pairs
+
+    def plan(self, start, end, users=None):
+        """Add reminders firing in [start, end) (Unix times) for all users or the given ones"""
+        pairs = self._enrollments(users)
+        if not pairs:
+            return 0
+        with _preferences_lock:
+            saved = dict(_preferences)
+
+        # Sessions per course that could have a reminder in the window, flattened by course
+        leads = [p["reminder_lead_minutes"] for p in saved.values() if "reminder_lead_minutes" in p]
+        lead_max = max([NOTIFICATION_DEFAULTS["reminder_lead_minutes"]] + leads)
+        first, last = datetime.fromtimestamp(start), datetime.fromtimestamp(end) + timedelta(minutes=lead_max)
+        pair_courses = np.array([course_id for _, _, course_id in pairs], dtype=np.int64)
+        course_ids = np.unique(pair_courses)
+        owner, days = session_days(course_ids, first.date(), last.date(), self._session_table)
+        course_start = np.array(
+            [meeting_pattern(c)["start"] if (c := self.catalog.get_course(i)) else 0 for i in course_ids.tolist()],
+            dtype=np.int64
+        )
+        session_minute = course_start[owner]
+        session_ts = midnight_timestamps(days) + session_minute * 60
+        keep = (session_ts >= first.timestamp()) & (session_ts < last.timestamp())
+        if not keep.any():
+            return 0
+        owner, session_ts, session_minute = owner[keep], session_ts[keep], session_minute[keep]
+        session_weekday = weekday_of(days[keep])
+        counts = np.zeros(course_ids.max() + 1, dtype=np.int64)
+        counts[course_ids] = np.bincount(owner, minlength=len(course_ids))
+        offsets = np.zeros_like(counts)
+        offsets[course_ids] = np.cumsum(counts[course_ids]) - counts[course_ids]
+
+        # One row per (user, course, session)
+        per_pair = counts[pair_courses]
+        pair_idx = np.repeat(np.arange(len(pairs)), per_pair)
+        within = np.arange(len(pair_idx)) - np.repeat(np.cumsum(per_pair) - per_pair, per_pair)
+        session_idx = offsets[pair_courses[pair_idx]] + within
+        starts = session_ts[session_idx].astype(np.int64)
+        start_minute = session_minute[session_idx]
+        weekday = session_weekday[session_idx]
+
+        # Preferences per pair: defaults, overridden for users who saved their own
+        defaults = NOTIFICATION_DEFAULTS
+        lead = np.full(len(pairs), defaults["reminder_lead_minutes"])
+        weekends = np.full(len(pairs), defaults["notify_weekends"])
+        quiet = np.full(len(pairs), defaults["quiet_hours"])
+        quiet_start = np.full(len(pairs), _minutes(defaults["quiet_start"]))
+        quiet_end = np.full(len(pairs), _minutes(defaults["quiet_end"]))
+        if saved:
+            for i, (role, user_id, _) in enumerate(pairs):
+                if (role, user_id) in saved:
+                    prefs = dict(defaults, **saved[(role, user_id)])
+                    lead[i] = prefs["reminder_lead_minutes"]
+                    weekends[i] = prefs["notify_weekends"]
+                    quiet[i] = prefs["quiet_hours"]
+                    quiet_start[i] = _minutes(prefs["quiet_start"])
+                    quiet_end[i] = _minutes(prefs["quiet_end"])
+        lead, weekends, quiet = lead[pair_idx], weekends[pair_idx], quiet[pair_idx]
+        quiet_start, quiet_end = quiet_start[pair_idx], quiet_end[pair_idx]
+
+        fire = starts - lead * 60
+        fire_minute = (start_minute - lead) % 1440
+        fire_weekday = (weekday - (start_minute < lead)) % 7
+
+        # Quiet hours push the reminder to the end of the quiet period, if still before class
+        wraps = quiet_start > quiet_end
+        in_quiet = quiet & np.where(
+            wraps,
+            (fire_minute >= quiet_start) | (fire_minute < quiet_end),
+            (fire_minute >= quiet_start) & (fire_minute < quiet_end),
+        )
+        shift = np.where(in_quiet, (quiet_end - fire_minute) % 1440, 0)
+        fire = fire + shift * 60
+        fire_weekday = (fire_weekday + (fire_minute + shift) // 1440) % 7  # the day it fires after the shift
+        keep = (fire < starts) & (weekends | (fire_weekday < 5)) & (fire >= start) & (fire < end)
+
+        with self._lock:
+            generation, pending = self._generation, self._pending
+            entries = [
+                (f, pairs[i][0], pairs[i][1], pairs[i][2], s, generation.get(pairs[i][:2], 0))
+                for f, i, s in zip(fire[keep].tolist(), pair_idx[keep].tolist(), starts[keep].tolist())
+            ]
+            if len(entries) > len(self._heap):
+                self._heap.extend(entries)
+                heapq.heapify(self._heap)
+            else:
+                for entry in entries:
+                    heapq.heappush(self._heap, entry)
+            for entry in entries:
+                key = entry[1:3]
+                pending[key] = pending.get(key, 0) + 1
+        return len(entries)
+
+    def advance(self, now):
+        """Plan reminders up to now + horizon, continuing from what is already planned"""
+        with self._plan_lock:
+            start = now if self.planned_until is None else self.planned_until
+            end = now + self.horizon
+            if end > start:
+                self.plan(start, end)
+                self.planned_until = end
+
+    def reschedule_user(self, role, user_id, now=None):
+        """Drop a user's pending reminders and plan them again with their current preferences"""
+        now = time.time() if now is None else now
+        # Waits for a plan in progress, so its entries for this user are dropped and replanned too
+        with self._plan_lock:
+            with self._lock:
+                key = (role, user_id)
+                self._generation[key] = self._generation.get(key, 0) + 1
+                self._stale += self._pending.pop(key, 0)
+                self._compact()
+            if self.planned_until is not None and self.planned_until > now:
+                self.plan(now, self.planned_until, users=[(role, user_id)])
+
+    def _compact(self):
+        """Rebuild the heap without stale entries once they make up half of it"""
+        if self._stale * 2 > len(self._heap):
+            generation = self._generation
+            self._heap = [e for e in self._heap if e[5] == generation.get(e[1:3], 0)]
+            heapq.heapify(self._heap)
+            self._stale = 0
+
+    def pop_due(self, now):
+        """Remove and return the reminders due at `now`, earliest first"""
+        due = []
+        with self._lock:
+            heap, generation, pending = self._heap, self._generation, self._pending
+            while heap and heap[0][0] <= now:
+                entry = heapq.heappop(heap)
+                key = entry[1:3]
+                if entry[5] != generation.get(key, 0):
+                    self._stale -= 1
+                    continue
+                if pending[key] > 1:
+                    pending[key] -= 1
+                else:
+                    del pending[key]
+                fire_at, role, user_id, course_id, starts, _ = entry
+                due.append({
+                    "role": role,
+                    "user_id": user_id,
+                    "course_id": course_id,
+                    "fire_at": fire_at,
+                    "class_starts": starts,
+                })
+        return due
+
+    def fire_due(self, now):
+        """Send every due reminder as a notification and return how many were sent"""
+        due = self.pop_due(now)
+        # Countdowns from the minute the reminder fires, so a late tick doesn't show "29m" for a 30-minute lead
+        countdowns = get_times_until([r["class_starts"] for r in due], now=60 * round(now / 60))
+        notifications = []
+        for reminder, countdown in zip(due, countdowns):
+            course = self.catalog.get_course(reminder["course_id"])
+            notifications.append({
+                "user_id": reminder["user_id"],
+                "role": reminder["role"],
+                "title": "Class Reminder",
+                "message": f"Your {course['code']} class starts in {countdown}.",
+                "kind": "class_reminder",
+                "course_id": reminder["course_id"],
+            })
+        if notifications:
+            send_notifications(notifications)
+        return len(due)
+
+    def run(self, stop, tick=REMINDER_TICK_SECONDS):
+        """Scheduler loop: fire due reminders each tick and keep the horizon planned"""
+        while not stop.is_set():
+            now = time.time()
+            if self.planned_until is None or self.planned_until - now < self.horizon / 2:
+                self.advance(now)
+            self.fire_due(now)
+            stop.wait(tick)
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+_scheduler_stop = threading.Event()
+
+
+def get_reminder_scheduler():
+    """Return the process-wide reminder scheduler"""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = ReminderScheduler(get_catalog())
+    return _scheduler
+
+
+def start_reminder_scheduler():
+    """Start the reminder scheduler thread once per process"""
+    scheduler = get_reminder_scheduler()
+    with _scheduler_lock:
+        if scheduler._thread is None:
+            scheduler._thread = threading.Thread(
+                target=scheduler.run, args=(_scheduler_stop,), name="reminder-scheduler", daemon=True
+            )
+            scheduler._thread.start()
+    return scheduler
+
+
+_INBOX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS notifications (
+    id INTEGER PRIMARY KEY,
+    role TEXT NOT NULL,
+    user_id INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    course_id INTEGER,
+    title TEXT NOT NULL,
+    message TEXT NOT NULL,
+    created REAL NOT NULL,
+    read INTEGER NOT NULL DEFAULT 0,
+    repeats INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS notifications_inbox ON notifications (role, user_id, id);
+CREATE INDEX IF NOT EXISTS notifications_created ON notifications (created);
+CREATE TABLE IF NOT EXISTS unread_counts (
+    role TEXT NOT NULL,
+    user_id INTEGER NOT NULL,
+    unread INTEGER NOT NULL,
+    PRIMARY KEY (role, user_id)
+) WITHOUT ROWID;
+"""
+
+
+class NotificationInbox:
+    """Per-user notification inboxes with cursor pages and maintained unread counts."""
+
+    def __init__(self, path=NOTIFICATION_DB_PATH):
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_INBOX_SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(notifications)")}
+        if "repeats" not in columns:
+            self._conn.execute("ALTER TABLE notifications ADD COLUMN repeats INTEGER NOT NULL DEFAULT 0")
+        self._lock = threading.Lock()
+
+    def add(self, notifications, now=None):
+        """Store notifications (dicts with user_id, role, title, message, kind, course_id); return their ids"""
+        now = time.time() if now is None else now
+        rows, added = [], {}
+        for n in notifications:
+            key = (n.get("role", "student"), n["user_id"])
+            rows.append((*key, n.get("kind", "general"), n.get("course_id"), n["title"], n["message"],
+                         n.get("created", now), n.get("repeats", 0)))
+            added[key] = added.get(key, 0) + 1
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO notifications (role, user_id, kind, course_id, title, message, created, repeats)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            # Rows inserted in one transaction by the only writer get consecutive ids
+            last = self._conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+            self._conn.executemany(
+                "INSERT INTO unread_counts (role, user_id, unread) VALUES (?, ?, ?)"
+                " ON CONFLICT (role, user_id) DO UPDATE SET unread = unread + excluded.unread",
+                [(*key, count) for key, count in added.items()],
+            )
+        return list(range(last - len(rows) + 1, last + 1)) if rows else []
+
+    def merge(self, updates, now=None):
+        """Fold repeats into delivered notifications: (id, new message) pairs, each made unread again"""
+        now = time.time() if now is None else now
+        with self._lock, self._conn:
+            for notification_id, message in updates:
+                row = self._conn.execute(
+                    "SELECT role, user_id, read FROM notifications WHERE id = ?", (notification_id,)
+                ).fetchone()
+                if row is None:
+                    continue
+                self._conn.execute(
+                    "UPDATE notifications SET message = ?, created = ?, repeats = repeats + 1, read = 0"
+                    " WHERE id = ?",
+                    (message, now, notification_id),
+                )
+                if row[2]:
+                    self._conn.execute(
+                        "UPDATE unread_counts SET unread = unread + 1 WHERE role = ? AND user_id = ?", row[:2]
+                    )
+
+    def recent(self, since):
+        """Return (id, role, user_id, kind, course_id, message, created) of rows created after a time, by id"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT id, role, user_id, kind, course_id, message, created FROM notifications"
+                " WHERE created > ? ORDER BY id",
+                (since,),
+            ).fetchall()
+
+    def page(self, role, user_id, limit=NOTIFICATION_PAGE_SIZE, cursor=None):
+        """Return (notifications newest first, cursor for the next page or None)"""
+        query = (
+            "SELECT id, kind, course_id, title, message, created, read, repeats FROM notifications"
+            " WHERE role = ? AND user_id = ?"
+        )
+        params = [role, user_id]
+        if cursor is not None:
+            query += " AND id < ?"
+            params.append(cursor)
+        query += " ORDER BY id DESC LIMIT ?"
+        params.append(limit + 1)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+
+        items = [
+            {
+                "id": row[0],
+                "kind": row[1],
+                "course_id": row[2],
+                "title": row[3],
+                "message": row[4],
+                "time": datetime.fromtimestamp(row[5]),
+                "read": bool(row[6]),
+                "repeats": row[7],
+            }
+            for row in rows[:limit]
+        ]
+        return items, (items[-1]["id"] if len(rows) > limit else None)
+
+    def unread_count(self, role, user_id):
+        """Return how many of a user's notifications are unread"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT unread FROM unread_counts WHERE role = ? AND user_id = ?", (role, user_id)
+            ).fetchone()
+        return row[0] if row else 0
+
+    def mark_read(self, role, user_id, ids=None):
+        """Mark the given notifications (or all of them) read; return how many changed"""
+        with self._lock, self._conn:
+            if ids is None:
+                changed = self._conn.execute(
+                    "UPDATE notifications SET read = 1 WHERE role = ? AND user_id = ? AND read = 0",
+                    (role, user_id),
+                ).rowcount
+            else:
+                ids = list(ids)
+                changed = 0
+                # Chunked to stay under SQLite's bound-parameter limit
+                for start in range(0, len(ids), 500):
+                    chunk = ids[start:start + 500]
+                    changed += self._conn.execute(
+                        "UPDATE notifications SET read = 1 WHERE role = ? AND user_id = ? AND read = 0"
+                        f" AND id IN ({', '.join('?' * len(chunk))})",
+                        (role, user_id, *chunk),
+                    ).rowcount
+            if changed:
+                self._conn.execute(
+                    "UPDATE unread_counts SET unread = unread - ? WHERE role = ? AND user_id = ?",
+                    (changed, role, user_id),
+                )
+        return changed
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+
+class NotificationCoalescer:
+    """Drops or merges repeats of recent notifications per (user, kind, course)."""
+
+    def __init__(self, inbox, default_window=NOTIFICATION_COALESCE_SECONDS, windows=NOTIFICATION_COALESCE_WINDOWS):
+        self.inbox = inbox
+        self.default_window = default_window
+        self.windows = windows
+        self._recent = {}  # key -> [window ends, inbox id, message]
+        self._sweep_at = 1024
+        self._lock = threading.Lock()
+        self.counts = {"delivered": 0, "merged": 0, "dropped": 0}
+        self._seed(time.time())
+
+    def _seed(self, now):
+        """Reopen the windows of notifications already in the inbox, so a restart doesn't resend them"""
+        longest = max([self.default_window, *self.windows.values()])
+        for notification_id, role, user_id, kind, course_id, message, created in self.inbox.recent(now - longest):
+            # A merged row's created is the time of its last repeat, so its window may run a little long
+            ends = created + self.windows.get(kind, self.default_window)
+            if ends > now:
+                self._recent[(role, user_id, kind, course_id)] = [ends, notification_id, message]
+        self._sweep_at = max(1024, 2 * len(self._recent))
+
+    def _sweep(self, now):
+        """Forget keys whose window has closed, once the table has doubled since the last sweep"""
+        if len(self._recent) >= self._sweep_at:
+            self._recent = {key: entry for key, entry in self._recent.items() if entry[0] > now}
+            self._sweep_at = max(1024, 2 * len(self._recent))
+
+    def send(self, notifications, now=None):
+        """Store the fresh notifications, fold repeats into delivered ones and return the fresh ones"""
+        now = time.time() if now is None else now
+        with self._lock:
+            fresh, merges, pending = [], {}, {}
+            for n in notifications:
+                n = dict(n, role=n.get("role", "student"), kind=n.get("kind", "general"), course_id=n.get("course_id"))
+                key = (n["role"], n["user_id"], n["kind"], n["course_id"])
+                if key in pending:
+                    # Repeat inside this batch: the latest text wins
+                    merged = fresh[pending[key]]
+                    merged["message"] = n["message"]
+                    merged["repeats"] = merged.get("repeats", 0) + 1
+                    self.counts["merged"] += 1
+                    continue
+                entry = self._recent.get(key)
+                if entry is None or entry[0] <= now:
+                    pending[key] = len(fresh)
+                    fresh.append(n)
+                elif entry[2] == n["message"]:
+                    self.counts["dropped"] += 1
+                else:
+                    entry[2] = n["message"]
+                    merges[entry[1]] = n["message"]
+                    self.counts["merged"] += 1
+
+            ids = self.inbox.add(fresh, now=now)
+            if merges:
+                self.inbox.merge(merges.items(), now=now)
+            for (key, position), notification_id in zip(pending.items(), ids):
+                window = self.windows.get(key[2], self.default_window)
+                self._recent[key] = [now + window, notification_id, fresh[position]["message"]]
+            self.counts["delivered"] += len(fresh)
+            self._sweep(now)
+        return fresh
+
+
+_inbox = None
+_coalescer = None
+_inbox_lock = threading.Lock()
+
+
+def get_notification_inbox():
+    """Return the process-wide notification inbox"""
+    global _inbox, _coalescer
+    if _inbox is None:
+        with _inbox_lock:
+            if _inbox is None:
+                _coalescer = NotificationCoalescer(NotificationInbox())
+                _inbox = _coalescer.inbox
+    return _inbox
+
+
+def get_notification_coalescer():
+    """Return the coalescing stage in front of the process-wide inbox"""
+    get_notification_inbox()
+    return _coalescer
+
+
+def send_notifications(notifications):
+    """Deliver notifications to their users' inboxes; return the ones that were not repeats"""
+    return get_notification_coalescer().send(notifications)
+
+
+def send_notification(user_id, title, message, role="student", kind="general", course_id=None):
+    """Deliver a notification to a user's inbox; return False if it was folded into a recent one"""
+    return bool(send_notifications([{
+        "user_id": user_id, "role": role, "title": title, "message": message, "kind": kind, "course_id": course_id,
+    }]))
+
+
+def get_user_notifications(user_id, role="student", limit=NOTIFICATION_PAGE_SIZE, cursor=None):
+    """Return one page of a user's notifications, newest first, and the cursor for the next page"""
+    return get_notification_inbox().page(role, user_id, limit, cursor)
+
+
+def get_unread_count(user_id, role="student"):
+    """Return how many notifications a user has not read"""
+    return get_notification_inbox().unread_count(role, user_id)
+
+
+def mark_notifications_read(user_id, ids=None, role="student"):
+    """Mark some (or all) of a user's notifications read; return how many changed"""
+    return get_notification_inbox().mark_read(role, user_id, ids)
@@ -0,0 +1,90 @@
+# Policy corpus component
+#
+# Keeps the policy library in memory for every session of the process instead
+# of scanning and reading docs/university_policies on each question. The
+# directory's file names, modification times and sizes are re-checked at most
+# every POLICY_RECHECK_SECONDS; when they change, the documents are reloaded
+# and hashed, and the corpus version only moves when the content actually
+# differs (a touched but unchanged file keeps everything derived from it).
+
+import hashlib
+import os
+import threading
+import time
+
+from config import POLICIES_DIR, POLICY_RECHECK_SECONDS
+from utils.pdf_processor import load_policy_documents, policy_files
+
+
+class PolicyCorpus:
+    """The policy documents of one directory, reloaded when the files change."""
+
+    def __init__(self, directory, recheck_seconds=POLICY_RECHECK_SECONDS):
+        self.directory = directory
+        self.recheck_seconds = recheck_seconds
+        self.documents = []
+        self.version = None     # content hash of the loaded documents
+        self._signature = None  # (name, path, mtime_ns, size) of each file when loaded
+        self._checked = None    # monotonic time of the last directory check
+        self._texts = {}        # keyword -> joined text of the matching documents
+        self._lock = threading.Lock()
+        self.stats = {"checks": 0, "loads": 0}
+
+    def _refresh(self):
+        """Reload the documents if the directory changed since the last check"""
+        now = time.monotonic()
+        if self._checked is not None and now - self._checked < self.recheck_seconds:
+            return
+        with self._lock:
+            if self._checked is not None and now - self._checked < self.recheck_seconds:
+                return
+            self.stats["checks"] += 1
+            signature = policy_files(self.directory)
+            if signature != self._signature:
+                documents = load_policy_documents(self.directory)
+                self.stats["loads"] += 1
+                digest = hashlib.blake2b(digest_size=16)
+                for document in documents:
+                    digest.update(document["name"].encode("utf-8") + b"\0" + document["text"].encode("utf-8") + b"\0")
+                if digest.hexdigest() != self.version:
+                    self.documents = documents
+                    self.version = digest.hexdigest()
+                    self._texts = {}
+                self._signature = signature
+            self._checked = now
+
+    def get_documents(self):
+        """Return the current policy documents"""
+        self._refresh()
+        return self.documents
+
+    def snapshot(self):
+        """Return (version, documents) of the current load together"""
+        self._refresh()
+        with self._lock:
+            return self.version, self.documents
+
+    def text(self, keyword=None):
+        """Return the text of the documents whose name contains a keyword, joined ("" if none)"""
+        self._refresh()
+        texts = self._texts
+        if keyword not in texts:
+            matching = [d["text"] for d in self.documents if keyword is None or keyword in d["name"].lower()]
+            texts[keyword] = "\n\n".join(matching)
+        return texts[keyword]
+
+
+_corpora = {}  # absolute directory -> PolicyCorpus
+_corpora_lock = threading.Lock()
+
+
+def get_policy_corpus(directory=POLICIES_DIR):
+    """Return the process-wide policy corpus of a directory"""
+    directory = os.path.abspath(directory)
+    corpus = _corpora.get(directory)
+    if corpus is None:
+        with _corpora_lock:
+            corpus = _corpora.get(directory)
+            if corpus is None:
+                corpus = _corpora[directory] = PolicyCorpus(directory)
+    return corpus
@@ -0,0 +1,171 @@
+# Policy retrieval component
+#
+# A local vector index over the sections of the policy library, so the
+# assistant sends the model the few sections that answer a question instead
+# of every document. Sections come from utils.pdf_processor.split_sections and
+# are embedded without a model or network access: words and word pairs are
+# weighted by TF-IDF and hashed into POLICY_EMBEDDING_DIM signed buckets, and
+# rows are L2-normalized so a matrix-vector product gives cosine similarity.
+#
+# The "numpy" backend keeps the matrix in memory and takes the top k with
+# argpartition. The "chroma" backend puts the same embeddings in an in-process
+# chromadb collection; if chromadb can't be imported it falls back to NumPy.
+# Indexes are rebuilt only when the policy corpus version changes.
+
+import hashlib
+import logging
+import math
+import re
+import threading
+from collections import Counter
+from functools import lru_cache
+
+import numpy as np
+
+from components.policies import get_policy_corpus
+from config import POLICIES_DIR, POLICY_EMBEDDING_DIM, POLICY_INDEX_BACKEND, POLICY_TOP_K
+from utils.pdf_processor import split_sections
+
+logger = logging.getLogger(__name__)
+
+INDEX_BACKENDS = ("numpy", "chroma")
+
+_WORD = re.compile(r"[a-z0-9]+(?:-[a-z0-9]+)*")
+_STOPWORDS = frozenset(
+    "a an and are as at be by can do does for from has have how i if in is it its may me my of on or "
+    "that the their there this to was what when where which who will with you your".split()
+)
+_SUFFIXES = ("ing", "ed", "ure", "ly", "e")
+
+
+def _stem(word):
+    """Strip common English suffixes so "absences"/"absence" and "failure"/"fail" match"""
+    if word.endswith("ies") and len(word) > 4:
+        return word[:-3] + "y"
+    if word.endswith("s") and not word.endswith("ss") and len(word) > 3:
+        word = word[:-1]
+    for suffix in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 4:
+            return word[:-len(suffix)]
+    return word
+
+
+def tokenize(text):
+    """Return the stemmed words of a text, lower-cased, without stopwords"""
+    return [_stem(word) for word in _WORD.findall(text.lower()) if word not in _STOPWORDS]
+
+
+def features(text):
+    """Return the word and word-pair features of a text with their counts"""
+    words = tokenize(text)
+    return Counter(words + [f"{a} {b}" for a, b in zip(words, words[1:])])
+
+
+@lru_cache(maxsize=1 << 16)
+def _bucket(feature, dim):
+    """Return (bucket, sign) of a feature; stable across processes, unlike hash()"""
+    value = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+    return value % dim, 1.0 if (value >> 63) & 1 else -1.0
+
+
+class PolicyIndex:
+    """Hashed TF-IDF embeddings of policy sections with top-k cosine search."""
+
+    def __init__(self, chunks, dim=POLICY_EMBEDDING_DIM, backend="numpy", version=None):
+        if backend not in INDEX_BACKENDS:
+            raise ValueError(f"Unknown policy index backend: {backend}")
+        self.chunks = chunks
+        self.dim = dim
+        self.version = version
+        counts = [features(f"{c['title']}\n{c['text']}") for c in chunks]
+
+        # Smoothed inverse document frequency
+        document_frequency = Counter(feature for count in counts for feature in count)
+        self.idf = {f: math.log((1 + len(chunks)) / (1 + df)) + 1 for f, df in document_frequency.items()}
+
+        self.matrix = np.zeros((len(chunks), dim), dtype=np.float32)
+        for row, count in enumerate(counts):
+            self.matrix[row] = self._embed(count)
+
+        self.backend = backend
+        self._collection = None
+        if backend == "chroma":
+            self._collection = self._chroma_collection()
+            if self._collection is None:
+                self.backend = "numpy"
+
+    def __len__(self):
+        return len(self.chunks)
+
+    def _embed(self, count):
+        """Embed feature counts as one L2-normalized hashed TF-IDF vector"""
+        buckets, weights = [], []
+        for feature, tf in count.items():
+            bucket, sign = _bucket(feature, self.dim)
+            buckets.append(bucket)
+            weights.append(sign * (1 + math.log(tf)) * self.idf[feature])
+        vector = np.bincount(np.asarray(buckets, dtype=np.int64), weights=weights, minlength=self.dim)
+        norm = np.linalg.norm(vector)
+        return (vector / norm if norm else vector).astype(np.float32)
+
+    def _chroma_collection(self):
+        """Load the embeddings into an in-process chromadb collection, or return None"""
+        try:
+            import chromadb
+        except ImportError:
+            logger.warning("chromadb is not installed; using the NumPy policy index")
+            return None
+        client = chromadb.EphemeralClient()
+        collection = client.get_or_create_collection(f"policies-{self.version or 'local'}",
+                                                     metadata={"hnsw:space": "cosine"})
+        if len(self.chunks) and collection.count() != len(self.chunks):
+            collection.add(ids=[str(row) for row in range(len(self.chunks))],
+                           embeddings=self.matrix.tolist(),
+                           documents=[c["text"] for c in self.chunks])
+        return collection
+
+    def search(self, question, k=POLICY_TOP_K):
+        """Return up to k sections sharing features with the question, best first, with a "score" each"""
+        k = min(k, len(self.chunks))
+        if k == 0:
+            return []
+        # Features no section has can't raise a score, only collide with ones that do
+        query = self._embed({f: tf for f, tf in features(question).items() if f in self.idf})
+        if self._collection is not None:
+            found = self._collection.query(query_embeddings=[query.tolist()], n_results=k)
+            rows = [int(row) for row in found["ids"][0]]
+            scores = [1.0 - distance for distance in found["distances"][0]]
+        else:
+            similarity = self.matrix @ query
+            top = np.argpartition(-similarity, k - 1)[:k]
+            top = top[np.argsort(-similarity[top], kind="stable")]
+            rows, scores = top.tolist(), similarity[top].tolist()
+        return [dict(self.chunks[row], score=score) for row, score in zip(rows, scores) if score > 1e-6]
+
+
+def build_policy_index(documents, backend=POLICY_INDEX_BACKEND, version=None):
+    """Split documents into sections and index them"""
+    chunks = [chunk for document in documents for chunk in split_sections(document)]
+    return PolicyIndex(chunks, backend=backend, version=version)
+
+
+_indexes = {}  # absolute directory -> PolicyIndex of the corpus version it was built from
+_indexes_lock = threading.Lock()
+
+
+def get_policy_index(directory=POLICIES_DIR):
+    """Return the process-wide index of a policy directory, rebuilt when its documents change"""
+    corpus = get_policy_corpus(directory)
+    version, documents = corpus.snapshot()
+    index = _indexes.get(corpus.directory)
+    if index is None or index.version != version:
+        with _indexes_lock:
+            index = _indexes.get(corpus.directory)
+            if index is None or index.version != version:
+                index = _indexes[corpus.directory] = build_policy_index(documents, version=version)
+    return index
+
+
+def retrieve_policy_sections(question, k=POLICY_TOP_K, directory=POLICIES_DIR):
+    """Return the k policy sections most relevant to a question"""
+    return get_policy_index(directory).search(question, k)
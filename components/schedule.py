@@ -0,0 +1,164 @@
+# Class schedule component
+#
+# Every section has a weekly meeting pattern: the weekdays it meets, start and
+# end times and a room. Patterns are read from the course record
+# ("meeting_days", "start_time", "end_time", "building", "room"), with
+# deterministic placeholders for records that lack them. The ScheduleIndex
+# flattens every pattern into one row per weekly meeting, keyed by minute of the
+# week and sorted by start, so "what meets during this interval" is two binary
+# searches and a filter, and a section's meetings are one slice.
+
+import threading
+from datetime import datetime, time
+
+import numpy as np
+
+from components.catalog import get_catalog
+from config import CAMPUS_BUILDINGS, SCHEDULE_DEFAULT_MINUTES
+
+DAY_NAMES = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+WEEKDAYS = (0, 1, 2, 3, 4)  # sections without "meeting_days" meet every weekday
+MINUTES_PER_DAY = 24 * 60
+
+
+def _parse_minutes(value):
+    """Return minutes after midnight for an "HH:MM" string"""
+    hours, minutes = value.split(":")
+    return int(hours) * 60 + int(minutes)
+
+
+def format_minutes(minutes):
+    """Format minutes after midnight as "09:00 AM\""""
+    return time(minutes // 60, minutes % 60).strftime("%I:%M %p")
+
+
+def meeting_pattern(course):
+    """Return a section's weekly meeting pattern (days, start/end minutes, building, room)"""
+    if "start_time" in course:
+        start = _parse_minutes(course["start_time"])
+    else:
+        start = (9 + (course["id"] * 2) % 10) * 60  # placeholder slot inside the school day
+    end = _parse_minutes(course["end_time"]) if "end_time" in course else start + SCHEDULE_DEFAULT_MINUTES
+    return {
+        "days": tuple(course.get("meeting_days", WEEKDAYS)),
+        "start": start,
+        "end": end,
+        "building": course.get("building", (course["id"] - 1) % CAMPUS_BUILDINGS + 1),
+        "room": course.get("room", 101 + ((course["id"] - 1) // CAMPUS_BUILDINGS) % 30),
+    }
+
+
+def session_start(course, session_date):
+    """Return the start time of a course's session on a given date"""
+    start = meeting_pattern(course)["start"]
+    return datetime.combine(session_date, time(start // 60, start % 60))
+
+
+def session_end(course, session_date):
+    """Return the end time of a course's session on a given date"""
+    end = meeting_pattern(course)["end"]
+    return datetime.combine(session_date, time(end // 60, end % 60))
+
+
+def format_meeting_time(course):
+    """Return a section's time slot as "09:00 AM - 10:30 AM\""""
+    pattern = meeting_pattern(course)
+    return f"{format_minutes(pattern['start'])} - {format_minutes(pattern['end'])}"
+
+
+def format_meeting_days(course):
+    """Return a section's meeting days as "Mon/Wed/Fri\""""
+    return "/".join(DAY_NAMES[day][:3] for day in meeting_pattern(course)["days"])
+
+
+class ScheduleIndex:
+    """Weekly meetings of every section, sorted by minute of the week."""
+
+    def __init__(self, courses):
+        self.courses_by_id = {c["id"]: c for c in courses}
+        sections, days, starts, ends = [], [], [], []
+        for course in courses:
+            pattern = meeting_pattern(course)
+            for day in pattern["days"]:
+                sections.append(course["id"])
+                days.append(day)
+                starts.append(day * MINUTES_PER_DAY + pattern["start"])
+                ends.append(day * MINUTES_PER_DAY + pattern["end"])
+
+        order = np.argsort(np.asarray(starts, dtype=np.int32), kind="stable")
+        self.sections = np.asarray(sections, dtype=np.int32)[order]
+        self.days = np.asarray(days, dtype=np.int8)[order]
+        self.starts = np.asarray(starts, dtype=np.int32)[order]   # minute of the week
+        self.ends = np.asarray(ends, dtype=np.int32)[order]
+        self.max_length = int((self.ends - self.starts).max()) if len(order) else 0
+
+        # Rows of each section: a slice of a section-sorted permutation
+        self._by_section = np.argsort(self.sections, kind="stable")
+        size = int(self.sections.max()) + 2 if len(order) else 1
+        counts = np.bincount(self.sections, minlength=size)
+        self._offsets = np.concatenate([[0], np.cumsum(counts)])
+
+    def __len__(self):
+        return len(self.starts)
+
+    def rows_for(self, course_ids):
+        """Return the meeting rows of the given sections, in week order"""
+        course_ids = [c for c in course_ids if 0 <= c < len(self._offsets) - 1]
+        if not course_ids:
+            return np.empty(0, dtype=np.int64)
+        rows = np.concatenate([self._by_section[self._offsets[c]:self._offsets[c + 1]] for c in course_ids])
+        return np.sort(rows)
+
+    def overlapping(self, start, end):
+        """Return the rows of every meeting overlapping [start, end) minutes of the week"""
+        # A meeting is at most max_length long, so only starts in (start - max_length, end) can overlap
+        lo = np.searchsorted(self.starts, start - self.max_length, side="right")
+        hi = np.searchsorted(self.starts, end, side="left")
+        rows = np.arange(lo, hi)
+        return rows[self.ends[rows] > start]
+
+    def meeting_now(self, when):
+        """Return the ids of sections in session at a datetime"""
+        minute = when.weekday() * MINUTES_PER_DAY + when.hour * 60 + when.minute
+        return self.sections[self.overlapping(minute, minute + 1)].tolist()
+
+    def _records(self, rows, on_date=None):
+        """Turn meeting rows into dicts (with datetimes when a date is given)"""
+        meetings = []
+        for row in rows.tolist():
+            start = int(self.starts[row]) % MINUTES_PER_DAY
+            end = int(self.ends[row]) % MINUTES_PER_DAY
+            meeting = {
+                "course": self.courses_by_id[int(self.sections[row])],
+                "day": int(self.days[row]),
+                "start": start,
+                "end": end,
+            }
+            if on_date is not None:
+                meeting["start_time"] = datetime.combine(on_date, time(start // 60, start % 60))
+                meeting["end_time"] = datetime.combine(on_date, time(end // 60, end % 60))
+            meetings.append(meeting)
+        return meetings
+
+    def week(self, course_ids):
+        """Return the weekly meetings of the given sections, Monday morning first"""
+        return self._records(self.rows_for(course_ids))
+
+    def on_date(self, course_ids, day):
+        """Return the meetings of the given sections on a date, earliest first"""
+        rows = self.rows_for(course_ids)
+        return self._records(rows[self.days[rows] == day.weekday()], on_date=day)
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_schedule_index():
+    """Return the process-wide schedule index over the catalog's sections"""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = ScheduleIndex(get_catalog().courses)
+    return _index
@@ -0,0 +1,220 @@
+# Class sessions component
+#
+# Materializes the concrete date of every session of every section for an
+# academic year: the year's term days minus breaks (utils.time_utils), kept
+# where the weekday is one of the section's meeting days. Sections sharing a
+# weekday pattern are expanded together with one mask and a repeat/tile, and
+# rows are stored sorted by (section, day) with per-section offsets, so "the
+# sessions of these sections between two dates" is a pair of binary searches.
+# Tables are built once per year and shared by attendance history, stats,
+# reminders and at-risk checks.
+#
+# For dashboards, UpcomingSessions keeps one user's sessions for the next few
+# days as start/end Unix times sorted by start, so "next class", "in progress"
+# and "rest of today" are bisections into the sorted start times.
+
+import threading
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, time, timedelta
+
+import numpy as np
+
+from components.catalog import get_catalog
+from components.schedule import meeting_pattern
+from config import SCHEDULE_UPCOMING_DAYS
+from utils.time_utils import class_days, current_term, midnight_timestamps, weekday_of
+
+_EPOCH = date(1970, 1, 1)
+_SPAN = 1 << 32  # packs (section, day) into one sortable int64
+
+
+def _day(value):
+    """Convert a date to days since the epoch"""
+    return (value - _EPOCH).days
+
+
+class SessionTable:
+    """Session days of every section in one academic year, grouped by section."""
+
+    def __init__(self, courses, year):
+        self.year = year
+        days = class_days(date(year, 1, 1), date(year, 12, 31))
+        weekdays = weekday_of(days)
+
+        patterns = {}
+        for course in courses:
+            patterns.setdefault(meeting_pattern(course)["days"], []).append(course["id"])
+        sections, section_days = [], []
+        for pattern, course_ids in patterns.items():
+            pattern_days = days[np.isin(weekdays, pattern)]
+            sections.append(np.repeat(np.asarray(course_ids, dtype=np.int64), len(pattern_days)))
+            section_days.append(np.tile(pattern_days, len(course_ids)))
+        sections = np.concatenate(sections) if sections else np.empty(0, dtype=np.int64)
+        section_days = np.concatenate(section_days) if section_days else np.empty(0, dtype=np.int32)
+
+        # Each pattern's days are already sorted, so a stable sort by section keeps them in order
+        order = np.argsort(sections, kind="stable")
+        self.days = section_days[order]
+        self._keys = sections[order] * _SPAN + self.days
+        size = int(sections.max()) + 2 if len(sections) else 1
+        self._offsets = np.concatenate([[0], np.cumsum(np.bincount(sections, minlength=size))])
+
+    def __len__(self):
+        return len(self.days)
+
+    def _bounds(self, course_ids, first=None, last=None):
+        """Return the [lo, hi) row range of each section, clipped to [first, last]"""
+        course_ids = np.asarray(course_ids, dtype=np.int64)
+        known = (course_ids >= 0) & (course_ids < len(self._offsets) - 1)
+        ids = np.where(known, course_ids, 0)
+        lo = np.where(known, self._offsets[ids], 0)
+        hi = np.where(known, self._offsets[ids + 1], 0)
+        if first is not None:
+            lo = np.maximum(lo, np.searchsorted(self._keys, ids * _SPAN + _day(first), side="left"))
+        if last is not None:
+            hi = np.minimum(hi, np.searchsorted(self._keys, ids * _SPAN + _day(last), side="right"))
+        return lo, np.maximum(hi, lo)
+
+    def count(self, course_ids, first=None, last=None):
+        """Return the number of sessions of each section in [first, last]"""
+        lo, hi = self._bounds(course_ids, first, last)
+        return hi - lo
+
+    def expand(self, course_ids, first=None, last=None):
+        """Return (position in course_ids, session day) for every session in [first, last]"""
+        lo, hi = self._bounds(course_ids, first, last)
+        counts = hi - lo
+        owner = np.repeat(np.arange(len(counts)), counts)
+        within = np.arange(len(owner)) - np.repeat(np.cumsum(counts) - counts, counts)
+        return owner, self.days[lo[owner] + within]
+
+    def days_for(self, course_id, first=None, last=None):
+        """Return a section's session days in [first, last], earliest first"""
+        return self.expand([course_id], first, last)[1]
+
+
+_tables = {}  # year -> SessionTable
+_tables_lock = threading.Lock()
+
+
+def get_session_table(year=None):
+    """Return the (cached) session table of the catalog's sections for a year"""
+    year = year or date.today().year
+    table = _tables.get(year)
+    if table is None:
+        with _tables_lock:
+            table = _tables.get(year)
+            if table is None:
+                table = _tables[year] = SessionTable(get_catalog().courses, year)
+    return table
+
+
+def session_days(course_ids, first, last, table_for=get_session_table):
+    """Return (position in course_ids, session day) for sessions between two dates, grouped by position"""
+    owners, days = [], []
+    for year in range(first.year, last.year + 1):
+        owner, found = table_for(year).expand(course_ids, first, last)
+        owners.append(owner)
+        days.append(found)
+    owner, days = np.concatenate(owners), np.concatenate(days)
+    order = np.argsort(owner, kind="stable")
+    return owner[order], days[order]
+
+
+def term_sessions(course_ids, until=None):
+    """Return (position in course_ids, session day) for the current term's sessions up to a date"""
+    until = until or date.today()
+    term = current_term(until)
+    return session_days(course_ids, term["start"], min(until, term["end"]))
+
+
+def remaining_sessions(course_ids, after=None):
+    """Return the number of sessions left in the current term after a date, per section"""
+    after = after or date.today()
+    term = current_term(after)
+    if after >= term["end"]:
+        return np.zeros(len(course_ids), dtype=np.int64)
+    first = date.fromordinal(after.toordinal() + 1)
+    return get_session_table(term["end"].year).count(course_ids, first, term["end"])
+
+
+class UpcomingSessions:
+    """One user's sessions from a date on, as start/end Unix times sorted by start."""
+
+    def __init__(self, courses, first, days=SCHEDULE_UPCOMING_DAYS, table_for=get_session_table):
+        self.first = first
+        self.courses = list(courses)
+        course_ids = np.array([c["id"] for c in self.courses], dtype=np.int64)
+        last = first + timedelta(days=days - 1)
+        owner, session_dates = session_days(course_ids, first, last, table_for)
+        patterns = [meeting_pattern(c) for c in self.courses]
+        start_minute = np.array([p["start"] for p in patterns], dtype=np.int64)
+        end_minute = np.array([p["end"] for p in patterns], dtype=np.int64)
+        midnights = midnight_timestamps(session_dates)
+        starts = midnights + start_minute[owner] * 60
+        ends = midnights + end_minute[owner] * 60
+
+        # Sorted once with NumPy; a user has few sessions, so queries bisect plain lists
+        order = np.argsort(starts, kind="stable")
+        self.owner = owner[order].tolist()
+        self.course_ids = course_ids[owner[order]].tolist()
+        self.starts = starts[order].tolist()
+        self.ends = ends[order].tolist()
+        self.max_length = max((e - s for s, e in zip(self.starts, self.ends)), default=0)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def _records(self, rows, now):
+        """Turn session rows into dicts with datetimes and an in-progress flag"""
+        return [
+            {
+                "course": self.courses[self.owner[row]],
+                "start_time": datetime.fromtimestamp(self.starts[row]),
+                "end_time": datetime.fromtimestamp(self.ends[row]),
+                "in_progress": self.starts[row] <= now,
+            }
+            for row in rows
+        ]
+
+    def _running(self, now, until):
+        """Return the rows starting before `until` that have not ended at `now`"""
+        # Sessions are at most max_length long, so anything starting earlier has ended
+        lo = bisect_right(self.starts, now - self.max_length)
+        hi = bisect_left(self.starts, until)
+        return [row for row in range(lo, hi) if self.ends[row] > now]
+
+    def next_class(self, when, course_id=None):
+        """Return the first session (of one course, if given) starting after a datetime, or None"""
+        now = when.timestamp()
+        for row in range(bisect_right(self.starts, now), len(self.starts)):
+            if course_id is None or self.course_ids[row] == course_id:
+                return self._records([row], now)[0]
+        return None
+
+    def in_progress(self, when):
+        """Return the sessions running at a datetime"""
+        now = when.timestamp()
+        return self._records(self._running(now, now + 1), now)
+
+    def remaining_today(self, when):
+        """Return the sessions on the datetime's date that have not ended yet, earliest first"""
+        now = when.timestamp()
+        midnight = datetime.combine(when.date() + timedelta(days=1), time()).timestamp()
+        return self._records(self._running(now, midnight), now)
+
+
+_upcoming = {}  # (role, user_id) -> UpcomingSessions built for today
+_upcoming_lock = threading.Lock()
+
+
+def get_upcoming_sessions(role, user_id):
+    """Return a user's (cached) upcoming sessions, rebuilt once a day"""
+    today = date.today()
+    key = (role, user_id)
+    upcoming = _upcoming.get(key)
+    if upcoming is None or upcoming.first != today:
+        upcoming = UpcomingSessions(get_catalog().courses_for_user(role, user_id), today)
+        with _upcoming_lock:
+            _upcoming[key] = upcoming
+    return upcoming
@@ -14,14 +14,22 @@ APP_VERSION = "1.0.0 (Demo)"
 
 # Dummy data settings
 DEMO_COURSES = [
-    {"id": 1, "code": "CS101", "title": "Introduction to Computer Science", "max_absences": 3},
-    {"id": 2, "code": "MATH201", "title": "Calculus II", "max_absences": 4},
-    {"id": 3, "code": "ENG105", "title": "Technical Writing", "max_absences": 3},
-    {"id": 4, "code": "PHYS101", "title": "Introduction to Physics", "max_absences": 3},
-    {"id": 5, "code": "CHEM110", "title": "General Chemistry", "max_absences": 4},
-    {"id": 6, "code": "BIO120", "title": "Introduction to Biology", "max_absences": 3},
-    {"id": 7, "code": "CS201", "title": "Data Structures", "max_absences": 3},
-    {"id": 8, "code": "HIST101", "title": "World History", "max_absences": 4},
+    {"id": 1, "code": "CS101", "title": "Introduction to Computer Science", "max_absences": 3,
+     "meeting_days": [0, 2, 4], "start_time": "09:00", "end_time": "10:30"},
+    {"id": 2, "code": "MATH201", "title": "Calculus II", "max_absences": 4,
+     "meeting_days": [1, 3], "start_time": "11:00", "end_time": "12:30"},
+    {"id": 3, "code": "ENG105", "title": "Technical Writing", "max_absences": 3,
+     "meeting_days": [0, 2], "start_time": "14:00", "end_time": "15:30"},
+    {"id": 4, "code": "PHYS101", "title": "Introduction to Physics", "max_absences": 3,
+     "meeting_days": [1, 3], "start_time": "10:00", "end_time": "11:30"},
+    {"id": 5, "code": "CHEM110", "title": "General Chemistry", "max_absences": 4,
+     "meeting_days": [0, 2, 4], "start_time": "12:00", "end_time": "13:30"},
+    {"id": 6, "code": "BIO120", "title": "Introduction to Biology", "max_absences": 3,
+     "meeting_days": [1, 4], "start_time": "13:00", "end_time": "14:30"},
+    {"id": 7, "code": "CS201", "title": "Data Structures", "max_absences": 3,
+     "meeting_days": [0, 2], "start_time": "15:00", "end_time": "16:30"},
+    {"id": 8, "code": "HIST101", "title": "World History", "max_absences": 4,
+     "meeting_days": [1, 3], "start_time": "16:00", "end_time": "17:30"},
 ]
 
 DEMO_STUDENTS = [
@@ -47,8 +55,137 @@ DEMO_PROFESSORS = [
     {"id": 7, "name": "Dr. Amanda Williams", "department": "History", "courses": [8]},
 ]
 
+# Admin settings
+ADMIN_MODE = os.getenv("CLASSTRACKER_ADMIN", "") == "1"
+PROFILER_BUFFER_SIZE = 200  # reruns kept per session
+
 # AI settings
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 
 # Path settings
-POLICIES_DIR = BASE_DIR / "docs" / "university_policies"
\ No newline at end of file
+POLICIES_DIR = BASE_DIR / "docs" / "university_policies"
+POLICY_RECHECK_SECONDS = 2.0  # how often the policy corpus checks the directory for edits
+
+# Policy retrieval settings. The assistant sends the model only the policy
+# sections closest to the question. "numpy" keeps the index in memory and
+# works offline; "chroma" stores the same embeddings in an in-process
+# chromadb collection.
+POLICY_INDEX_BACKEND = os.getenv("CLASSTRACKER_POLICY_INDEX", "numpy")
+POLICY_EMBEDDING_DIM = 1024   # hashed feature dimensions per section
+POLICY_CHUNK_CHARS = 1500     # longer sections are split at paragraph breaks
+POLICY_TOP_K = 4              # sections included in each prompt
+
+# Data settings
+DATA_DIR = BASE_DIR / "data"
+DEMO_SEED = 42
+
+# Directory written by utils.data_generator; when set it replaces the demo data
+DATASET_DIR = os.getenv("CLASSTRACKER_DATASET", "")
+
+# Attendance store settings
+ATTENDANCE_SNAPSHOT_PATH = (Path(DATASET_DIR) if DATASET_DIR else DATA_DIR) / "attendance_snapshot.npz"
+ATTENDANCE_SNAPSHOT_EVERY = int(os.getenv("CLASSTRACKER_ATTENDANCE_SNAPSHOT_EVERY", "10000"))
+
+# Schedule settings. Sections without "start_time"/"end_time" in their record
+# get a placeholder slot between 9 AM and 5 PM of this length.
+SCHEDULE_DEFAULT_MINUTES = 90
+SCHEDULE_UPCOMING_DAYS = 14  # days of sessions kept per user for "next class" lookups
+
+# Academic calendar as (month, day) ranges, repeated every year. Sections meet
+# on "term" days outside any "break"; other kinds are listed but hold no
+# classes. The Schedule page's Academic Calendar tab shows the same entries.
+ACADEMIC_CALENDAR = [
+    {"period": "Spring Semester", "kind": "term", "start": (1, 15), "end": (5, 30)},
+    {"period": "Spring Break", "kind": "break", "start": (3, 10), "end": (3, 14)},
+    {"period": "Final Exams", "kind": "exams", "start": (6, 2), "end": (6, 13)},
+    {"period": "Summer Session", "kind": "term", "start": (6, 24), "end": (8, 15)},
+    {"period": "Fall Semester", "kind": "term", "start": (9, 2), "end": (12, 19)},
+]
+
+# Check-in QR code settings
+QR_FORMAT = os.getenv("CLASSTRACKER_QR_FORMAT", "png")  # "png" or "svg"
+QR_CACHE_MAX_BYTES = 16 * 1024 * 1024  # rendered images kept across sessions
+
+# Check-in ingestion settings
+CHECKIN_SERVER_ENABLED = os.getenv("CLASSTRACKER_CHECKIN_SERVER", "") == "1"
+CHECKIN_HOST = os.getenv("CLASSTRACKER_CHECKIN_HOST", "127.0.0.1")
+CHECKIN_PORT = int(os.getenv("CLASSTRACKER_CHECKIN_PORT", "8502"))
+CHECKIN_OPEN_BEFORE_MINUTES = 15   # scans accepted this long before class starts
+CHECKIN_CLOSE_AFTER_MINUTES = 15   # ... and until this long after
+CHECKIN_LATE_AFTER_MINUTES = 5     # scans after this are marked Late
+CHECKIN_CLOCK_SKEW_SECONDS = 30    # client scan times further than this from server time are rejected
+CHECKIN_BATCH_SIZE = 512           # most check-ins committed in one store write
+CHECKIN_FLUSH_INTERVAL = 0.0       # extra wait for a fuller batch (seconds); 0 commits whatever has queued
+CHECKIN_QUEUE_SIZE = 20000         # check-ins buffered before producers are pushed back
+CHECKIN_LATENCY_SAMPLES = 10000    # recent commit latencies kept for percentiles
+
+# Check-in token settings. Set CLASSTRACKER_CHECKIN_SECRET when the check-in
+# server runs in a different process from the app; otherwise each process
+# picks its own random secret at startup.
+CHECKIN_SECRET = os.getenv("CLASSTRACKER_CHECKIN_SECRET", "")
+CHECKIN_TOKEN_PERIOD = 30  # seconds per QR rotation
+CHECKIN_TOKEN_GRACE = 1    # previous periods still accepted (covers slow scans)
+
+# Calendar feed settings. Each user gets a private .ics URL signed with
+# CLASSTRACKER_CALENDAR_SECRET; set it so subscription URLs survive restarts.
+CALENDAR_SERVER_ENABLED = os.getenv("CLASSTRACKER_CALENDAR_SERVER", "") == "1"
+CALENDAR_HOST = os.getenv("CLASSTRACKER_CALENDAR_HOST", "127.0.0.1")
+CALENDAR_PORT = int(os.getenv("CLASSTRACKER_CALENDAR_PORT", "8503"))
+CALENDAR_SECRET = os.getenv("CLASSTRACKER_CALENDAR_SECRET", "")
+CALENDAR_FEED_MAX_AGE = 900  # seconds clients may reuse a feed before polling again
+
+# Geolocation check-in settings. Classrooms are laid out building by building on
+# a grid around the campus center unless a course record carries its own
+# "lat"/"lon".
+CAMPUS_CENTER = (40.7295, -73.9965)
+CAMPUS_BUILDINGS = 24
+CAMPUS_BUILDING_SPACING_METERS = 250
+CHECKIN_RADIUS_METERS = 100
+
+# Notification settings. Users start with these preferences until they save
+# their own on the Settings page.
+NOTIFICATION_DEFAULTS = {
+    "reminder_lead_minutes": 30,
+    "notify_weekends": False,
+    "quiet_hours": True,
+    "quiet_start": "22:00",
+    "quiet_end": "07:00",
+}
+REMINDER_HORIZON_HOURS = 24   # how far ahead class reminders are planned
+REMINDER_TICK_SECONDS = 1.0   # how often the scheduler thread checks for due reminders
+NOTIFICATION_DB_PATH = DATA_DIR / "notifications.sqlite3"
+NOTIFICATION_PAGE_SIZE = 5    # notifications per inbox page (the dashboard shows the first)
+
+# Repeats of a notification (same user, kind and course) within the window are
+# merged into the one already delivered instead of being sent again.
+NOTIFICATION_COALESCE_SECONDS = 600
+NOTIFICATION_COALESCE_WINDOWS = {  # per kind, overriding the default above
+    "class_reminder": 1800,
+    "attendance_warning": 6 * 3600,
+    "announcement": 300,
+}
+
+# Email settings. Without CLASSTRACKER_SMTP_HOST, queued emails are logged
+# instead of sent (demo mode). `python -m utils.smtp_sink` runs a local SMTP
+# server that accepts and counts messages for development.
+EMAIL_SMTP_HOST = os.getenv("CLASSTRACKER_SMTP_HOST", "")
+EMAIL_SMTP_PORT = int(os.getenv("CLASSTRACKER_SMTP_PORT", "25"))
+EMAIL_SMTP_USER = os.getenv("CLASSTRACKER_SMTP_USER", "")
+EMAIL_SMTP_PASSWORD = os.getenv("CLASSTRACKER_SMTP_PASSWORD", "")
+EMAIL_SMTP_STARTTLS = os.getenv("CLASSTRACKER_SMTP_STARTTLS", "") == "1"
+EMAIL_FROM = os.getenv("CLASSTRACKER_EMAIL_FROM", "classtracker@university.edu")
+EMAIL_STUDENT_DOMAIN = "students.university.edu"
+EMAIL_STAFF_DOMAIN = "university.edu"
+EMAIL_OUTBOX_PATH = DATA_DIR / "email_outbox.sqlite3"
+EMAIL_WORKERS = 4                     # sender threads, each with its own SMTP connection
+EMAIL_BATCH_SIZE = 100                # outbox rows claimed by a worker at a time
+EMAIL_MESSAGES_PER_CONNECTION = 1000  # reconnect after this many messages
+EMAIL_IDLE_DISCONNECT = 30.0          # seconds an idle worker keeps its connection open
+EMAIL_DOMAIN_RATE = 50.0              # messages per second to any one recipient domain
+EMAIL_DOMAIN_BURST = 100              # ... allowing bursts of this many
+EMAIL_MAX_ATTEMPTS = 5                # delivery attempts before a message is marked failed
+EMAIL_RETRY_BASE = 2.0                # first retry waits up to this long (seconds), doubling after
+EMAIL_RETRY_MAX = 300.0               # longest wait between attempts
+EMAIL_SMTP_TIMEOUT = 30.0             # seconds per SMTP call (connect, STARTTLS, login, send)
+EMAIL_LEASE_SECONDS = 300             # a claimed message returns to the queue if not settled by then
+EMAIL_LEASE_RENEW_SECONDS = 10.0      # a worker still sending a batch extends its lease this often
@@ -0,0 +1,57 @@
+# Check-in token utility
+#
+# Rotating, signed check-in tokens for the projector QR code. A token names a
+# course session and a time bucket of CHECKIN_TOKEN_PERIOD seconds and carries
+# an HMAC-SHA256 signature over both, so a scan can be authenticated from the
+# token alone: no store or catalog lookup, and a photo of the code stops working
+# shortly after the code rotates.
+#
+#   classtrack:checkin:{course_id}:{YYYY-MM-DD}:{bucket}:{signature}
+
+import base64
+import hashlib
+import hmac
+import secrets
+import time
+from datetime import date
+
+from config import CHECKIN_SECRET, CHECKIN_TOKEN_GRACE, CHECKIN_TOKEN_PERIOD
+
+CHECKIN_PREFIX = "classtrack:checkin:"
+SIGNATURE_BYTES = 12
+
+_secret = CHECKIN_SECRET.encode("utf-8") if CHECKIN_SECRET else secrets.token_bytes(32)
+_mac = hmac.new(_secret, digestmod=hashlib.sha256)  # keyed once, copied per token
+
+
+def current_bucket(now=None):
+    """Return the rotation bucket for a Unix timestamp (default: now)"""
+    return int((time.time() if now is None else now) // CHECKIN_TOKEN_PERIOD)
+
+
+def _sign(message):
+    """Return the truncated, URL-safe signature of a message"""
+    mac = _mac.copy()
+    mac.update(message.encode("ascii"))
+    return base64.urlsafe_b64encode(mac.digest()[:SIGNATURE_BYTES]).decode("ascii")
+
+
+def make_checkin_token(course_id, session_date, now=None):
+    """Return the signed check-in token for a course session at the current bucket"""
+    message = f"{int(course_id)}:{session_date}:{current_bucket(now)}"
+    return f"{CHECKIN_PREFIX}{message}:{_sign(message)}"
+
+
+def verify_checkin_token(token, now=None):
+    """Return (course_id, session_date) for a valid, unexpired token, or raise ValueError"""
+    if not token.startswith(CHECKIN_PREFIX):
+        raise ValueError("Not a ClassTracker check-in code")
+    message, _, signature = token[len(CHECKIN_PREFIX):].rpartition(":")
+    if not hmac.compare_digest(_sign(message).encode("ascii"), signature.encode("utf-8")):
+        raise ValueError("Invalid check-in code")
+
+    course_part, date_part, bucket_part = message.split(":")
+    age = current_bucket(now) - int(bucket_part)
+    if not 0 <= age <= CHECKIN_TOKEN_GRACE:
+        raise ValueError("Check-in code has expired")
+    return int(course_part), date.fromisoformat(date_part)
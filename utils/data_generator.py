@@ -0,0 +1,265 @@
+# Synthetic university generator
+#
+# Builds a deterministic, seeded institution with the same record shapes as
+# DEMO_COURSES / DEMO_STUDENTS / DEMO_PROFESSORS, plus attendance marks for the
+# sessions of the current term held so far (the same session dates the app
+# materializes in components.sessions). Marks are produced in per-section
+# batches so they can be streamed into an AttendanceStore or written to disk
+# without holding the whole term in memory.
+#
+# Usage:
+#   python -m utils.data_generator data/synthetic --students 100000 --sections 5000
+
+import argparse
+import json
+import os
+from datetime import date
+
+import numpy as np
+
+from config import DEMO_SEED
+from utils.time_utils import current_term, midnight_timestamps
+
+DEPARTMENTS = [
+    ("CS", "Computer Science"), ("MATH", "Mathematics"), ("ENG", "English"),
+    ("PHYS", "Physics"), ("CHEM", "Chemistry"), ("BIO", "Biology"),
+    ("HIST", "History"), ("ECON", "Economics"), ("PSYC", "Psychology"),
+    ("PHIL", "Philosophy"), ("ART", "Art"), ("MUS", "Music"),
+    ("POLS", "Political Science"), ("SOC", "Sociology"), ("LING", "Linguistics"),
+    ("STAT", "Statistics"), ("EE", "Electrical Engineering"), ("ME", "Mechanical Engineering"),
+    ("GEOL", "Geology"), ("NURS", "Nursing"),
+]
+
+TOPICS = [
+    "Introduction to", "Foundations of", "Topics in", "Advanced", "Applied",
+    "Principles of", "Seminar in", "Methods in", "Theory of", "Survey of",
+]
+
+FIRST_NAMES = [
+    "Alex", "Maria", "James", "Emma", "Liam", "Sophia", "Noah", "Olivia", "Ethan", "Ava",
+    "Mia", "Lucas", "Isabella", "Mason", "Amelia", "Logan", "Harper", "Elijah", "Evelyn", "Aiden",
+    "Chloe", "Daniel", "Grace", "Henry", "Zoe", "Jack", "Layla", "Owen", "Nora", "Samuel",
+]
+
+LAST_NAMES = [
+    "Johnson", "Garcia", "Wilson", "Davis", "Chen", "Kim", "Martinez", "Thompson", "Brown", "Robinson",
+    "Miller", "Lee", "Clark", "Rodriguez", "Williams", "Nguyen", "Patel", "Lopez", "Walker", "Young",
+    "Hall", "Allen", "Wright", "Scott", "Green", "Baker", "Adams", "Nelson", "Hill", "Rivera",
+]
+
+# Weekly meeting patterns as weekday numbers (Monday = 0), and the length of
+# one meeting for each so every pattern adds up to about 150 minutes a week
+MEETING_DAYS = [(0, 2, 4), (1, 3), (0, 2), (1, 4), (2,)]
+MEETING_MINUTES = [50, 75, 75, 75, 150]
+START_HOURS = list(range(8, 17))
+
+
+def _name(rng, count):
+    """Return `count` random full names"""
+    first = rng.integers(len(FIRST_NAMES), size=count)
+    last = rng.integers(len(LAST_NAMES), size=count)
+    return [f"{FIRST_NAMES[f]} {LAST_NAMES[l]}" for f, l in zip(first, last)]
+
+
+def _distinct_choices(rng, n_rows, n_options, per_row, weights):
+    """Pick up to `per_row[i]` distinct weighted options for every row, vectorized"""
+    width = int(per_row.max()) + 3
+    draws = np.sort(rng.choice(n_options, size=(n_rows, width), p=weights), axis=1)
+    fresh = np.ones_like(draws, dtype=bool)
+    fresh[:, 1:] = draws[:, 1:] != draws[:, :-1]
+
+    # Keep the first per_row[i] distinct draws of each row
+    rank = np.cumsum(fresh, axis=1)
+    keep = fresh & (rank <= per_row[:, None])
+    return [row[mask].tolist() for row, mask in zip(draws, keep)]
+
+
+def generate_university(students=100000, sections=5000, seed=DEMO_SEED):
+    """Return (courses, students, professors) lists shaped like the demo data in config"""
+    rng = np.random.default_rng(seed)
+
+    # Sections: department, topic, level and a popularity weight
+    dept_idx = rng.integers(len(DEPARTMENTS), size=sections)
+    topic_idx = rng.integers(len(TOPICS), size=sections)
+    levels = rng.choice([100, 200, 300, 400], size=sections, p=[0.4, 0.3, 0.2, 0.1])
+    numbers = levels + rng.integers(0, 100, size=sections)
+    popularity = rng.pareto(1.5, size=sections) + 1
+    popularity /= popularity.sum()
+
+    courses = [
+        {
+            "id": i + 1,
+            "code": f"{DEPARTMENTS[d][0]}{n}-{i + 1:04d}",
+            "title": f"{TOPICS[t]} {DEPARTMENTS[d][1]}",
+            "max_absences": int(rng.integers(3, 5)),
+            "department": DEPARTMENTS[d][1],
+            "meeting_days": list(MEETING_DAYS[rng.integers(len(MEETING_DAYS))]),
+        }
+        for i, (d, t, n) in enumerate(zip(dept_idx, topic_idx, numbers))
+    ]
+
+    # Time slots come from their own stream so the rest of the dataset is unchanged
+    slot_rng = np.random.default_rng([seed, 1])
+    hours = slot_rng.choice(START_HOURS, size=sections)
+    for course, hour in zip(courses, hours.tolist()):
+        length = MEETING_MINUTES[MEETING_DAYS.index(tuple(course["meeting_days"]))]
+        end = hour * 60 + length
+        course["start_time"] = f"{hour:02d}:00"
+        course["end_time"] = f"{end // 60:02d}:{end % 60:02d}"
+
+    # Professors teach two or three sections within their department
+    professors = []
+    for d, (_, dept_name) in enumerate(DEPARTMENTS):
+        dept_courses = [c["id"] for c, cd in zip(courses, dept_idx) if cd == d]
+        loads = []
+        while sum(loads) < len(dept_courses):
+            loads.append(int(rng.integers(2, 4)))
+        start = 0
+        for name, load in zip(_name(rng, len(loads)), loads):
+            professors.append({
+                "id": len(professors) + 1,
+                "name": f"Dr. {name}",
+                "department": dept_name,
+                "courses": dept_courses[start:start + load],
+            })
+            start += load
+
+    # Students take three to six sections, favouring popular ones
+    per_student = rng.integers(3, 7, size=students)
+    enrollments = _distinct_choices(rng, students, sections, per_student, popularity)
+    student_records = [
+        {
+            "id": i + 1,
+            "name": name,
+            "student_id": f"S{1001 + i}",
+            "courses": [c + 1 for c in enrolled],
+        }
+        for i, (name, enrolled) in enumerate(zip(_name(rng, students), enrollments))
+    ]
+
+    return courses, student_records, professors
+
+
+def iter_attendance_batches(courses, students, seed=DEMO_SEED, until=None):
+    """Yield one batch of attendance columns per section, covering the current term up to a date.
+
+    Each batch is a dict of NumPy arrays with the columns AttendanceStore.append
+    expects. Students have their own absence propensity, so a few are
+    chronically absent while most attend nearly every session.
+    """
+    # components.catalog imports this module, so the session helpers are imported here
+    from components.schedule import meeting_pattern
+    from components.sessions import SessionTable, session_days
+
+    until = until or date.today()
+    term = current_term(until)
+    owner, all_days = session_days(
+        [c["id"] for c in courses], term["start"], min(until, term["end"]),
+        table_for=lambda year: SessionTable(courses, year),
+    )
+    all_midnights = midnight_timestamps(all_days)
+    bounds = np.searchsorted(owner, np.arange(len(courses) + 1))
+
+    rng = np.random.default_rng(seed + 1)
+
+    roster = {c["id"]: [] for c in courses}
+    for student in students:
+        for course_id in student["courses"]:
+            roster[course_id].append(student["id"])
+    absence_rate = rng.beta(1.2, 12, size=len(students) + 1)
+
+    for position, course in enumerate(courses):
+        enrolled = np.asarray(roster[course["id"]], dtype=np.int32)
+        days = all_days[bounds[position]:bounds[position + 1]].astype(np.int32)
+        if len(enrolled) == 0 or len(days) == 0:
+            continue
+
+        n = len(enrolled) * len(days)
+        student_ids = np.repeat(enrolled, len(days))
+        p_absent = absence_rate[student_ids]
+        roll = rng.random(n)
+        # Status codes follow components.attendance.STATUSES
+        status = np.zeros(n, dtype=np.int8)
+        status[roll < p_absent * 1.6] = 2
+        status[roll < p_absent * 1.3] = 3
+        status[roll < p_absent] = 1
+
+        midnights = np.tile(all_midnights[bounds[position]:bounds[position + 1]], len(enrolled))
+        start = meeting_pattern(course)["start"] * 60
+        timestamps = midnights + start + rng.integers(-900, 900, size=n)
+        yield {
+            "student_ids": student_ids,
+            "course_ids": np.full(n, course["id"], dtype=np.int32),
+            "session_days": np.tile(days, len(enrolled)),
+            "status_codes": status,
+            "timestamps": timestamps,
+        }
+
+
+def load_into_store(store, courses, students, **kwargs):
+    """Stream a generated term of attendance into an AttendanceStore"""
+    total = 0
+    for batch in iter_attendance_batches(courses, students, **kwargs):
+        store.append(**batch)
+        total += len(batch["student_ids"])
+    return total
+
+
+def write_university(directory, students=100000, sections=5000, seed=DEMO_SEED):
+    """Write catalog.json and attendance part files for a generated institution"""
+    courses, student_records, professors = generate_university(students, sections, seed)
+
+    os.makedirs(os.path.join(directory, "attendance"), exist_ok=True)
+    with open(os.path.join(directory, "catalog.json"), "w", encoding="utf-8") as f:
+        json.dump({"courses": courses, "students": student_records, "professors": professors}, f)
+
+    # Group sections into part files of roughly a million marks
+    total, part, pending = 0, 0, []
+    batches = iter_attendance_batches(courses, student_records, seed=seed)
+    for batch in batches:
+        pending.append(batch)
+        if sum(len(b["student_ids"]) for b in pending) >= 1_000_000:
+            total += _write_part(directory, part, pending)
+            part, pending = part + 1, []
+    if pending:
+        total += _write_part(directory, part, pending)
+    return total
+
+
+def _write_part(directory, part, batches):
+    """Concatenate batches into one compressed part file"""
+    columns = {name: np.concatenate([b[name] for b in batches]) for name in batches[0]}
+    np.savez_compressed(os.path.join(directory, "attendance", f"part-{part:05d}.npz"), **columns)
+    return len(columns["student_ids"])
+
+
+def load_university_catalog(directory):
+    """Read (courses, students, professors) written by write_university"""
+    with open(os.path.join(directory, "catalog.json"), encoding="utf-8") as f:
+        data = json.load(f)
+    return data["courses"], data["students"], data["professors"]
+
+
+def iter_attendance_parts(directory):
+    """Yield attendance batches from the part files written by write_university"""
+    parts_dir = os.path.join(directory, "attendance")
+    for filename in sorted(os.listdir(parts_dir)):
+        if filename.endswith(".npz"):
+            with np.load(os.path.join(parts_dir, filename)) as data:
+                yield {name: data[name] for name in data.files}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic university dataset")
+    parser.add_argument("directory", help="Output directory")
+    parser.add_argument("--students", type=int, default=100000)
+    parser.add_argument("--sections", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=DEMO_SEED)
+    args = parser.parse_args()
+
+    marks = write_university(args.directory, args.students, args.sections, args.seed)
+    print(f"Wrote {args.students} students, {args.sections} sections and {marks} attendance marks to {args.directory}")
+
+
+if __name__ == "__main__":
+    main()
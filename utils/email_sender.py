@@ -1,7 +1,459 @@
-# Email sender utility - placeholder for future implementation
+# Email sender utility
+#
+# Emails are written to a durable SQLite outbox first and delivered in the
+# background by a small pool of worker threads. Each worker keeps its own SMTP
+# connection open and sends many messages over it instead of connecting per
+# email. Sends are rate limited per recipient domain with token buckets, and
+# temporary failures (4xx replies, dropped connections) are retried with
+# exponential backoff and full jitter until EMAIL_MAX_ATTEMPTS. A claimed
+# message carries a lease, so anything a crashed process was sending goes back
+# to the queue when the lease runs out; a live worker renews the lease on the
+# rest of its batch while it sends, so a slow server can't make another worker
+# reclaim (and send again) messages that are still in flight.
 
-def send_email(recipient, subject, body):
-    """Placeholder for sending emails"""
-    # In a real implementation, this would use SMTP to send an email
-    print(f"Would send email to {recipient} with subject '{subject}'")
+import atexit
+import logging
+import random
+import smtplib
+import sqlite3
+import threading
+import time
+from email.header import Header
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from pathlib import Path
+
+from config import (
+    EMAIL_BATCH_SIZE,
+    EMAIL_DOMAIN_BURST,
+    EMAIL_DOMAIN_RATE,
+    EMAIL_FROM,
+    EMAIL_IDLE_DISCONNECT,
+    EMAIL_LEASE_RENEW_SECONDS,
+    EMAIL_LEASE_SECONDS,
+    EMAIL_MAX_ATTEMPTS,
+    EMAIL_MESSAGES_PER_CONNECTION,
+    EMAIL_OUTBOX_PATH,
+    EMAIL_RETRY_BASE,
+    EMAIL_RETRY_MAX,
+    EMAIL_SMTP_HOST,
+    EMAIL_SMTP_PASSWORD,
+    EMAIL_SMTP_PORT,
+    EMAIL_SMTP_STARTTLS,
+    EMAIL_SMTP_TIMEOUT,
+    EMAIL_SMTP_USER,
+    EMAIL_STAFF_DOMAIN,
+    EMAIL_STUDENT_DOMAIN,
+    EMAIL_WORKERS,
+)
+
+logger = logging.getLogger(__name__)
+
+PENDING, SENDING, SENT, FAILED = "pending", "sending", "sent", "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY,
+    recipient TEXT NOT NULL,
+    domain TEXT NOT NULL,
+    subject TEXT NOT NULL,
+    body TEXT NOT NULL,
+    attachment_name TEXT,
+    attachment TEXT,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt REAL NOT NULL,
+    last_error TEXT,
+    created REAL NOT NULL,
+    sent_at REAL
+);
+CREATE INDEX IF NOT EXISTS outbox_due ON outbox (status, next_attempt);
+"""
+
+
+def student_email(student):
+    """Return a student's email address"""
+    return student.get("email") or f"{student['student_id'].lower()}@{EMAIL_STUDENT_DOMAIN}"
+
+
+def department_email(department):
+    """Return the shared mailbox of a department"""
+    return f"{department.lower().replace(' ', '-')}@{EMAIL_STAFF_DOMAIN}"
+
+
+def retry_delay(attempts, base=EMAIL_RETRY_BASE, cap=EMAIL_RETRY_MAX):
+    """Return a random wait before the next attempt (exponential backoff, full jitter)"""
+    return random.uniform(0, min(cap, base * 2 ** max(attempts - 1, 0)))
+
+
+class Outbox:
+    """Durable queue of outgoing emails in SQLite."""
+
+    def __init__(self, path=EMAIL_OUTBOX_PATH):
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def enqueue(self, messages, now=None):
+        """Add messages (dicts with recipient, subject, body and optional attachment) in one transaction"""
+        now = time.time() if now is None else now
+        rows = []
+        for message in messages:
+            recipient = message["recipient"]
+            attachment = message.get("attachment") or (None, None)
+            rows.append((
+                recipient, recipient.rpartition("@")[2].lower(), message["subject"], message["body"],
+                attachment[0], attachment[1], now, now,
+            ))
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO outbox (recipient, domain, subject, body, attachment_name, attachment,"
+                " next_attempt, created) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        return len(rows)
+
+    def claim(self, limit, lease=EMAIL_LEASE_SECONDS, now=None):
+        """Lease up to `limit` due messages to the caller and return them as dicts.
+
+        Messages left in "sending" after their lease ran out (the sender died)
+        are due again and get claimed like pending ones.
+        """
+        now = time.time() if now is None else now
+        with self._lock, self._conn:
+            rows = self._conn.execute(
+                "UPDATE outbox SET status = 'sending', next_attempt = ? WHERE id IN ("
+                " SELECT id FROM outbox WHERE status IN ('pending', 'sending') AND next_attempt <= ?"
+                " ORDER BY next_attempt LIMIT ?)"
+                " RETURNING id, recipient, domain, subject, body, attachment_name, attachment, attempts",
+                (now + lease, now, limit),
+            ).fetchall()
+        keys = ("id", "recipient", "domain", "subject", "body", "attachment_name", "attachment", "attempts")
+        return [dict(zip(keys, row)) for row in rows]
+
+    def renew(self, ids, lease=EMAIL_LEASE_SECONDS, now=None):
+        """Extend the lease of messages still being sent"""
+        now = time.time() if now is None else now
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE outbox SET next_attempt = ? WHERE id = ? AND status = 'sending'",
+                [(now + lease, message_id) for message_id in ids],
+            )
+
+    def settle(self, sent=(), retries=(), failures=(), deferred=(), now=None):
+        """Record the outcome of a claimed batch in one transaction.
+
+        `sent` is a list of ids, `retries` and `failures` lists of (id, error,
+        next attempt time) and (id, error), `deferred` a list of (id, next
+        attempt time) for messages put back without counting an attempt.
+        """
+        now = time.time() if now is None else now
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE outbox SET status = 'sent', attempts = attempts + 1, sent_at = ? WHERE id = ?",
+                [(now, message_id) for message_id in sent],
+            )
+            self._conn.executemany(
+                "UPDATE outbox SET status = 'pending', attempts = attempts + 1, last_error = ?,"
+                " next_attempt = ? WHERE id = ?",
+                [(error, until, message_id) for message_id, error, until in retries],
+            )
+            self._conn.executemany(
+                "UPDATE outbox SET status = 'failed', attempts = attempts + 1, last_error = ? WHERE id = ?",
+                [(error, message_id) for message_id, error in failures],
+            )
+            self._conn.executemany(
+                "UPDATE outbox SET status = 'pending', next_attempt = ? WHERE id = ?",
+                [(until, message_id) for message_id, until in deferred],
+            )
+
+    def counts(self):
+        """Return the number of messages in each status"""
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM outbox GROUP BY status").fetchall()
+        return dict({PENDING: 0, SENDING: 0, SENT: 0, FAILED: 0}, **dict(rows))
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+
+class DomainRateLimiter:
+    """Token bucket per recipient domain, shared by all sender workers."""
+
+    def __init__(self, rate=EMAIL_DOMAIN_RATE, burst=EMAIL_DOMAIN_BURST):
+        self.rate = rate
+        self.burst = burst
+        self._buckets = {}  # domain -> [tokens, last refill]
+        self._lock = threading.Lock()
+
+    def acquire(self, domain, now=None):
+        """Take a token for `domain`; return 0.0, or the seconds until one is available"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            bucket = self._buckets.get(domain)
+            if bucket is None:
+                bucket = self._buckets[domain] = [float(self.burst), now]
+            tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if tokens >= 1:
+                bucket[0] = tokens - 1
+                return 0.0
+            bucket[0] = tokens
+            return (1 - tokens) / self.rate
+
+
+class _LogTransport:
+    """Stands in for an SMTP connection when no SMTP host is configured."""
+
+    def sendmail(self, sender, recipients, message):
+        logger.info("Would send email to %s", ", ".join(recipients))
+        return {}
+
+    def quit(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def _connection_lost(exc):
+    """Return True if an error means the SMTP connection is unusable"""
+    # SMTPException derives from OSError, so a plain isinstance check is not enough
+    if isinstance(exc, smtplib.SMTPServerDisconnected):
+        return True
+    return isinstance(exc, OSError) and not isinstance(exc, smtplib.SMTPException)
+
+
+def _is_temporary(exc):
+    """Return True if an SMTP failure is worth retrying"""
+    if isinstance(exc, smtplib.SMTPRecipientsRefused):
+        codes = [code for code, _ in exc.recipients.values()]
+        return all(400 <= code < 500 for code in codes)
+    if isinstance(exc, smtplib.SMTPResponseException):
+        return 400 <= exc.smtp_code < 500
+    # Dropped connections, timeouts and refused connects
+    return _connection_lost(exc)
+
+
+def build_message(message, sender=EMAIL_FROM):
+    """Return the MIME message for an outbox row.
+
+    Uses the compat32 MIME classes: EmailMessage's header parsing costs about
+    1 ms per message, which caps a bulk send at a few hundred messages a second.
+    """
+    email = MIMEText(message["body"], "plain", "utf-8")
+    if message.get("attachment_name"):
+        body, email = email, MIMEMultipart()
+        email.attach(body)
+        attachment = MIMEText(message["attachment"], "plain", "utf-8")
+        attachment.add_header("Content-Disposition", "attachment", filename=message["attachment_name"])
+        email.attach(attachment)
+    email["From"] = sender
+    email["To"] = message["recipient"]
+    email["Subject"] = Header(message["subject"], "utf-8") if not message["subject"].isascii() else message["subject"]
+    return email
+
+
+class EmailSender:
+    """Worker pool delivering the outbox over persistent SMTP connections."""
+
+    def __init__(self, outbox, host=EMAIL_SMTP_HOST, port=EMAIL_SMTP_PORT, workers=EMAIL_WORKERS,
+                 limiter=None, batch_size=EMAIL_BATCH_SIZE,
+                 messages_per_connection=EMAIL_MESSAGES_PER_CONNECTION, max_attempts=EMAIL_MAX_ATTEMPTS,
+                 retry_base=EMAIL_RETRY_BASE, retry_max=EMAIL_RETRY_MAX):
+        self.outbox = outbox
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.limiter = limiter or DomainRateLimiter()
+        self.batch_size = batch_size
+        self.messages_per_connection = messages_per_connection
+        self.max_attempts = max_attempts
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+
+        self._cond = threading.Condition()
+        self._signal = 0  # bumped whenever new mail is queued
+        self._stopping = False
+        self._threads = []
+        self.counts = {"sent": 0, "retried": 0, "failed": 0, "deferred": 0, "connections": 0}
+
+    def _connect(self):
+        """Open a connection to the SMTP server (or the logging stand-in)"""
+        if not self.host:
+            return _LogTransport()
+        conn = smtplib.SMTP(self.host, self.port, timeout=EMAIL_SMTP_TIMEOUT)
+        if EMAIL_SMTP_STARTTLS:
+            conn.starttls()
+        if EMAIL_SMTP_USER:
+            conn.login(EMAIL_SMTP_USER, EMAIL_SMTP_PASSWORD)
+        with self._cond:
+            self.counts["connections"] += 1
+        return conn
+
+    @staticmethod
+    def _disconnect(conn):
+        """Close a connection, politely if it still works"""
+        try:
+            conn.quit()
+        except Exception:
+            conn.close()
+
+    def notify(self):
+        """Wake idle workers because new mail was queued"""
+        with self._cond:
+            self._signal += 1
+            self._cond.notify_all()
+
+    def _deliver(self, conn, sent_on_conn, batch):
+        """Send a claimed batch and settle it; return the connection to keep using and its message count"""
+        sent, retries, failures, deferred = [], [], [], []
+        renewed = time.monotonic()
+        for i, message in enumerate(batch):
+            # Messages already sent stay "sending" until the batch is settled, so renew them all
+            if time.monotonic() - renewed >= EMAIL_LEASE_RENEW_SECONDS:
+                self.outbox.renew([m["id"] for m in batch])
+                renewed = time.monotonic()
+
+            wait = self.limiter.acquire(message["domain"])
+            if wait > 0:
+                deferred.append((message["id"], time.time() + wait))
+                continue
+
+            try:
+                if conn is None:
+                    conn = self._connect()
+                    sent_on_conn = 0
+                conn.sendmail(EMAIL_FROM, [message["recipient"]], build_message(message).as_bytes())
+            except Exception as exc:
+                attempts = message["attempts"] + 1
+                error = f"{type(exc).__name__}: {exc}"[:500]
+                if not _is_temporary(exc) or attempts >= self.max_attempts:
+                    failures.append((message["id"], error))
+                else:
+                    retries.append((message["id"], error, time.time() + retry_delay(attempts, self.retry_base, self.retry_max)))
+                if _connection_lost(exc):
+                    # The connection is gone: put the rest of the batch back instead of
+                    # failing every message against a dead server
+                    if conn is not None:
+                        conn.close()
+                        conn = None
+                    until = time.time() + retry_delay(1, self.retry_base, self.retry_max)
+                    deferred.extend((m["id"], until) for m in batch[i + 1:])
+                    break
+                continue
+
+            sent.append(message["id"])
+            sent_on_conn += 1
+            if sent_on_conn >= self.messages_per_connection:
+                self._disconnect(conn)
+                conn = None
+
+        self.outbox.settle(sent, retries, failures, deferred)
+        with self._cond:
+            self.counts["sent"] += len(sent)
+            self.counts["retried"] += len(retries)
+            self.counts["failed"] += len(failures)
+            self.counts["deferred"] += len(deferred)
+        for message_id, error in failures:
+            logger.warning("Giving up on email %d: %s", message_id, error)
+        return conn, sent_on_conn
+
+    def _work(self):
+        """Worker loop: claim due messages and send them over one kept-open connection"""
+        conn, sent_on_conn, idle_since = None, 0, time.monotonic()
+        while True:
+            with self._cond:
+                if self._stopping:
+                    break
+                seen = self._signal
+            batch = self.outbox.claim(self.batch_size)
+            if batch:
+                conn, sent_on_conn = self._deliver(conn, sent_on_conn, batch)
+                idle_since = time.monotonic()
+                continue
+
+            if conn is not None and time.monotonic() - idle_since > EMAIL_IDLE_DISCONNECT:
+                self._disconnect(conn)
+                conn = None
+            # Retries come due on their own, so never sleep for long
+            with self._cond:
+                self._cond.wait_for(lambda: self._signal != seen or self._stopping, timeout=1.0)
+        if conn is not None:
+            self._disconnect(conn)
+
+    def start(self):
+        """Start the worker threads (once)"""
+        with self._cond:
+            if self._threads:
+                return
+            self._stopping = False
+            self._threads = [
+                threading.Thread(target=self._work, name=f"email-sender-{n}", daemon=True)
+                for n in range(self.workers)
+            ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout=5.0):
+        """Stop the workers; unsent mail stays in the outbox for the next start"""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def drain(self, timeout=None):
+        """Block until no message is waiting or being sent; return False on timeout"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            counts = self.outbox.counts()
+            if not counts[PENDING] and not counts[SENDING]:
+                return True
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            time.sleep(0.05)
+
+    def stats(self):
+        """Return outbox counts by status plus this process's delivery counters"""
+        with self._cond:
+            counts = dict(self.counts)
+        return {"outbox": self.outbox.counts(), **counts}
+
+
+_sender = None
+_sender_lock = threading.Lock()
+
+
+def get_email_sender():
+    """Return the process-wide email sender, starting its workers on first use"""
+    global _sender
+    if _sender is None:
+        with _sender_lock:
+            if _sender is None:
+                sender = EmailSender(Outbox())
+                sender.start()
+                atexit.register(sender.stop)
+                _sender = sender
+    return _sender
+
+
+def send_emails(messages):
+    """Queue many emails for delivery; return how many were queued"""
+    sender = get_email_sender()
+    count = sender.outbox.enqueue(messages)
+    sender.notify()
+    return count
+
+
+def send_email(recipient, subject, body, attachment=None):
+    """Queue one email for delivery; `attachment` is an optional (filename, text) pair"""
+    send_emails([{"recipient": recipient, "subject": subject, "body": body, "attachment": attachment}])
     return True
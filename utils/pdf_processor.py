@@ -1,11 +1,102 @@
-# PDF processor utility - placeholder for future implementation
+# Policy document loading utility
+#
+# Reads the university policy library: plain-text and Markdown files as they
+# are, PDFs through PyPDF2 (imported on first use). policy_files() lists the
+# documents with their modification times and sizes without reading them, so
+# callers can tell cheaply whether anything changed since the last load.
+#
+# split_sections() cuts a document into retrieval chunks along its own
+# structure: numbered headings ("3. Excused Absences") or Markdown headings
+# start a section, and sections longer than POLICY_CHUNK_CHARS are split at
+# paragraph breaks, each part keeping its heading.
+
+import os
+import re
+
+from config import POLICY_CHUNK_CHARS
+
+POLICY_EXTENSIONS = (".txt", ".md", ".pdf")
+
+_NUMBERED_HEADING = re.compile(r"^(\d+)\.\s+([A-Z][^.]{0,80})$")
+_MARKDOWN_HEADING = re.compile(r"^#{1,6}\s+(.+?)\s*#*$")
+
 
 def extract_text_from_pdf(file_path):
-    """Placeholder for extracting text from PDF files"""
-    # In a real implementation, this would use PyPDF2 or similar to extract text
-    return "Sample text extracted from PDF"
+    """Extract the text of every page of a PDF file"""
+    from PyPDF2 import PdfReader
+
+    reader = PdfReader(file_path)
+    return "\n\n".join(page.extract_text() or "" for page in reader.pages)
+
+
+def policy_files(directory):
+    """Return (name, path, mtime_ns, size) of each policy document, sorted by name"""
+    if not os.path.isdir(directory):
+        return []
+    files = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_file() and entry.name.lower().endswith(POLICY_EXTENSIONS):
+                stat = entry.stat()
+                files.append((entry.name, entry.path, stat.st_mtime_ns, stat.st_size))
+    return sorted(files)
+
 
 def load_policy_documents(directory):
-    """Placeholder for loading policy documents"""
-    # In a real implementation, this would load and process all PDFs in the directory
-    return []
+    """Load every policy document in a directory as {"name", "path", "text"} dicts"""
+    documents = []
+    for name, path, _, _ in policy_files(directory):
+        if name.lower().endswith(".pdf"):
+            text = extract_text_from_pdf(path)
+        else:
+            with open(path, "r", encoding="utf-8") as file:
+                text = file.read()
+        documents.append({"name": name, "path": path, "text": text})
+    return documents
+
+
+def _split_long(lines, max_chars):
+    """Split a section's body lines into parts of at most max_chars at blank lines"""
+    parts, current, size = [], [], 0
+    for paragraph in "\n".join(lines).split("\n\n"):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if current and size + len(paragraph) > max_chars:
+            parts.append("\n\n".join(current))
+            current, size = [], 0
+        current.append(paragraph)
+        size += len(paragraph) + 2
+    if current:
+        parts.append("\n\n".join(current))
+    return parts
+
+
+def split_sections(document, max_chars=POLICY_CHUNK_CHARS):
+    """Split a policy document into {"document", "title", "section", "heading", "text"} chunks"""
+    title, sections = "", []
+    heading, number, body = None, "", []
+
+    def close():
+        for part in _split_long(body, max_chars):
+            text = f"{heading_line}\n\n{part}" if heading_line else part
+            sections.append({"section": number, "heading": heading or title, "text": text})
+
+    heading_line = ""
+    for line in document["text"].splitlines():
+        stripped = line.strip()
+        numbered = _NUMBERED_HEADING.match(stripped)
+        markdown = _MARKDOWN_HEADING.match(stripped)
+        if numbered or markdown:
+            if not title and markdown and not sections and not any(b.strip() for b in body):
+                title = markdown.group(1)  # a leading Markdown heading names the document
+                continue
+            close()
+            number, heading = (numbered.group(1), numbered.group(2)) if numbered else ("", markdown.group(1))
+            heading_line, body = stripped, []
+        elif not title and heading is None and stripped and not any(b.strip() for b in body):
+            title = stripped  # the first line before any heading is the document title
+        else:
+            body.append(line)
+    close()
+    return [dict(chunk, document=document["name"], title=title) for chunk in sections]
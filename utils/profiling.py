@@ -0,0 +1,145 @@
+# Profiling utility
+#
+# Lightweight timing spans for the Streamlit rerun hot path. Each rerun collects
+# (name, milliseconds) spans; finished reruns go into a bounded ring buffer in
+# the session state, and an admin-only panel shows rolling percentiles per span
+# and the slowest recent reruns. Spans recorded outside a rerun are ignored.
+
+import functools
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from config import PROFILER_BUFFER_SIZE
+
+_current = threading.local()
+
+
+def start_rerun(label=""):
+    """Begin collecting spans for the current script run"""
+    _current.rerun = {"label": label, "started": time.time(), "start": time.perf_counter(), "spans": []}
+
+
+def finish_rerun():
+    """Close the current rerun and push it into the session's ring buffer"""
+    rerun = getattr(_current, "rerun", None)
+    if rerun is None:
+        return
+    _current.rerun = None
+    rerun["total_ms"] = (time.perf_counter() - rerun.pop("start")) * 1000
+
+    if "profiler_reruns" not in st.session_state:
+        st.session_state.profiler_reruns = deque(maxlen=PROFILER_BUFFER_SIZE)
+    st.session_state.profiler_reruns.append(rerun)
+
+
+def set_rerun_label(label):
+    """Name the current rerun (e.g. "student/Dashboard") for the slowest-reruns table"""
+    rerun = getattr(_current, "rerun", None)
+    if rerun is not None:
+        rerun["label"] = label
+
+
+def profiled_rerun(func):
+    """Decorator for the script entry point: every call is recorded as one rerun"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start_rerun()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            finish_rerun()
+    return wrapper
+
+
+@contextmanager
+def span(name):
+    """Time a block of code as part of the current rerun"""
+    rerun = getattr(_current, "rerun", None)
+    if rerun is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        rerun["spans"].append((name, (time.perf_counter() - start) * 1000))
+
+
+def timed(name=None):
+    """Decorator that records each call of a function as a span"""
+    def decorator(func):
+        span_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def rerun_percentiles(reruns):
+    """Return p50/p95/max per span name (and for whole reruns) as a DataFrame"""
+    samples = {"rerun (total)": [r["total_ms"] for r in reruns]}
+    for rerun in reruns:
+        for name, ms in rerun["spans"]:
+            samples.setdefault(name, []).append(ms)
+
+    rows = []
+    for name, values in samples.items():
+        values = np.asarray(values)
+        rows.append({
+            "Span": name,
+            "Count": len(values),
+            "p50 (ms)": np.percentile(values, 50),
+            "p95 (ms)": np.percentile(values, 95),
+            "Max (ms)": values.max(),
+        })
+    return pd.DataFrame(rows).sort_values("p95 (ms)", ascending=False)
+
+
+def slowest_reruns(reruns, limit=5):
+    """Return the slowest reruns with their three most expensive spans"""
+    rows = []
+    for rerun in sorted(reruns, key=lambda r: r["total_ms"], reverse=True)[:limit]:
+        top = sorted(rerun["spans"], key=lambda s: s[1], reverse=True)[:3]
+        rows.append({
+            "Time": time.strftime("%H:%M:%S", time.localtime(rerun["started"])),
+            "Page": rerun["label"],
+            "Total (ms)": rerun["total_ms"],
+            "Top spans": ", ".join(f"{name} {ms:.1f}ms" for name, ms in top),
+        })
+    return pd.DataFrame(rows)
+
+
+def show_profiler_panel():
+    """Render rolling rerun timings for this session (admin only)"""
+    reruns = list(st.session_state.get("profiler_reruns", []))
+    with st.expander("Performance (admin)"):
+        if not reruns:
+            st.caption("No reruns recorded yet.")
+            return
+        st.caption(f"Last {len(reruns)} reruns in this session")
+        st.dataframe(
+            rerun_percentiles(reruns),
+            column_config={
+                "p50 (ms)": st.column_config.NumberColumn(format="%.1f"),
+                "p95 (ms)": st.column_config.NumberColumn(format="%.1f"),
+                "Max (ms)": st.column_config.NumberColumn(format="%.1f"),
+            },
+            hide_index=True,
+            use_container_width=True
+        )
+        st.markdown("**Slowest reruns**")
+        st.dataframe(
+            slowest_reruns(reruns),
+            column_config={"Total (ms)": st.column_config.NumberColumn(format="%.1f")},
+            hide_index=True,
+            use_container_width=True
+        )
@@ -0,0 +1,124 @@
+# QR code utility
+#
+# Renders check-in QR codes once and serves the encoded image from a
+# process-wide LRU cache shared by every session. Entries are addressed by a
+# digest of the payload and render settings, and the cache is bounded by the
+# total size of the stored images rather than by entry count. Codes can be
+# rendered as PNG bytes or as a pre-rendered SVG document.
+
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+
+from config import QR_CACHE_MAX_BYTES
+from utils.checkin_tokens import make_checkin_token
+
+QR_FORMATS = ("png", "svg")
+
+
+def qr_digest(payload, fmt="png", box_size=10, border=4):
+    """Return the content address of a rendered QR code"""
+    key = f"{fmt}:{box_size}:{border}:{payload}"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def render_qr(payload, fmt="png", box_size=10, border=4):
+    """Encode a payload as a QR image and return PNG bytes or SVG bytes"""
+    import qrcode
+
+    if fmt not in QR_FORMATS:
+        raise ValueError(f"Unknown QR format: {fmt}")
+
+    qr = qrcode.QRCode(
+        version=1,
+        error_correction=qrcode.constants.ERROR_CORRECT_L,
+        box_size=box_size,
+        border=border,
+    )
+    qr.add_data(payload)
+    qr.make(fit=True)
+
+    buffer = io.BytesIO()
+    if fmt == "svg":
+        import qrcode.image.svg
+        qr.make_image(image_factory=qrcode.image.svg.SvgPathImage).save(buffer)
+    else:
+        qr.make_image(fill_color="white", back_color="black").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+class QRCodeCache:
+    """LRU cache of rendered QR images, bounded by total bytes."""
+
+    def __init__(self, max_bytes=QR_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # digest -> image bytes
+        self._lock = threading.Lock()
+
+    def get(self, payload, fmt="png", box_size=10, border=4):
+        """Return the rendered image for a payload, rendering it on a miss"""
+        digest = qr_digest(payload, fmt, box_size, border)
+        with self._lock:
+            image = self._entries.get(digest)
+            if image is not None:
+                self._entries.move_to_end(digest)
+                self.hits += 1
+                return image
+            self.misses += 1
+
+        # Render outside the lock; concurrent misses for one payload give identical bytes
+        image = render_qr(payload, fmt, box_size, border)
+        self._put(digest, image)
+        return image
+
+    def _put(self, digest, image):
+        """Store an image and evict least recently used entries over the byte limit"""
+        if len(image) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(digest, None)
+            if previous is not None:
+                self.total_bytes -= len(previous)
+            self._entries[digest] = image
+            self.total_bytes += len(image)
+            while self.total_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.total_bytes -= len(evicted)
+
+    def prerender(self, payloads, fmt="png"):
+        """Render a batch of payloads ahead of time (e.g. today's sessions)"""
+        for payload in payloads:
+            self.get(payload, fmt)
+
+    def stats(self):
+        """Return entry count, size and hit/miss counters"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.total_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+_qr_cache = None
+_qr_cache_lock = threading.Lock()
+
+
+def get_qr_cache():
+    """Return the process-wide QR code cache shared by all sessions"""
+    global _qr_cache
+    if _qr_cache is None:
+        with _qr_cache_lock:
+            if _qr_cache is None:
+                _qr_cache = QRCodeCache()
+    return _qr_cache
+
+
+def get_checkin_qr(course_id, session_date, fmt="png", now=None):
+    """Return the cached QR image of a course session's current check-in token"""
+    return get_qr_cache().get(make_checkin_token(course_id, session_date, now), fmt)
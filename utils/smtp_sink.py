@@ -0,0 +1,138 @@
+# Local SMTP stand-in
+#
+# A minimal asyncio SMTP server that accepts every message and throws it away,
+# for developing and benchmarking the email sender without a real mail server.
+# It can add a per-message delay and answer a fraction of messages with a
+# temporary 451 so retries get exercised.
+#
+# Usage:
+#   python -m utils.smtp_sink --port 2525 --fail-rate 0.05
+# then start the app with CLASSTRACKER_SMTP_HOST=127.0.0.1 CLASSTRACKER_SMTP_PORT=2525
+
+import argparse
+import asyncio
+import logging
+import random
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class SMTPSink:
+    """SMTP server that counts what it receives."""
+
+    def __init__(self, latency=0.0, fail_rate=0.0, seed=None):
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.counts = {"connections": 0, "messages": 0, "temp_failures": 0}
+        self.recipients = {}  # domain -> messages accepted
+        self._random = random.Random(seed)
+        self._server = None
+        self._loop = None
+
+    async def _handle(self, reader, writer):
+        """Speak just enough SMTP for smtplib: EHLO/HELO, MAIL, RCPT, DATA, RSET, NOOP, QUIT"""
+        self.counts["connections"] += 1
+
+        async def reply(line):
+            writer.write(line.encode("ascii") + b"\r\n")
+            await writer.drain()
+
+        recipients = []
+        try:
+            await reply("220 classtracker-sink ESMTP")
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                command = line.decode("utf-8", "replace").strip()
+                verb = command[:4].upper()
+                if verb == "EHLO":
+                    await reply("250-classtracker-sink\r\n250-8BITMIME\r\n250 SIZE 10485760")
+                elif verb == "HELO":
+                    await reply("250 classtracker-sink")
+                elif verb == "MAIL":
+                    recipients = []
+                    await reply("250 OK")
+                elif verb == "RCPT":
+                    recipients.append(command.partition(":")[2].strip().strip("<>"))
+                    await reply("250 OK")
+                elif verb == "DATA":
+                    await reply("354 End data with <CR><LF>.<CR><LF>")
+                    while (await reader.readline()) not in (b".\r\n", b""):
+                        pass
+                    if self.latency:
+                        await asyncio.sleep(self.latency)
+                    if self._random.random() < self.fail_rate:
+                        self.counts["temp_failures"] += 1
+                        await reply("451 Try again later")
+                    else:
+                        self.counts["messages"] += 1
+                        for recipient in recipients:
+                            domain = recipient.rpartition("@")[2].lower()
+                            self.recipients[domain] = self.recipients.get(domain, 0) + 1
+                        await reply("250 OK: queued")
+                elif verb in ("RSET", "NOOP"):
+                    recipients = []
+                    await reply("250 OK")
+                elif verb == "QUIT":
+                    await reply("221 Bye")
+                    break
+                else:
+                    await reply("502 Command not implemented")
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=2525):
+        """Serve on the running event loop until cancelled"""
+        self._server = await asyncio.start_server(self._handle, host, port)
+        logger.info("SMTP sink listening on %s:%d", host, self.port)
+        async with self._server:
+            await self._server.serve_forever()
+
+    @property
+    def port(self):
+        """Port the server is bound to (useful with port 0)"""
+        return self._server.sockets[0].getsockname()[1]
+
+    def start(self, host="127.0.0.1", port=0):
+        """Run the sink on a background thread and return the port it listens on"""
+        ready = threading.Event()
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            self._server = self._loop.run_until_complete(asyncio.start_server(self._handle, host, port))
+            ready.set()
+            self._loop.run_forever()
+
+        threading.Thread(target=run, name="smtp-sink", daemon=True).start()
+        ready.wait()
+        return self.port
+
+    def stop(self):
+        """Stop a sink started with start()"""
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._server.close)
+            self._loop.call_soon_threadsafe(self._loop.stop)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local SMTP server that discards mail")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=2525)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds to wait before accepting each message")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Fraction of messages answered with 451")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    sink = SMTPSink(args.latency, args.fail_rate)
+    try:
+        asyncio.run(sink.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        print(f"received {sink.counts['messages']} messages over {sink.counts['connections']} connections")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,20 @@
-# Time utilities - placeholder for future implementation
+# Time utilities
+#
+# Countdown formatting (one target, or a whole batch with NumPy) and the
+# academic calendar. The calendar in config is a template of (month, day)
+# ranges; academic_calendar() pins it to a year, and class_days() turns terms
+# minus breaks into an array of days since the epoch so session dates can be
+# expanded with NumPy instead of day-by-day loops.
+
+from datetime import date, datetime, time
+
+import numpy as np
+import pandas as pd
+
+from config import ACADEMIC_CALENDAR
+
+_EPOCH = date(1970, 1, 1)
 
-from datetime import datetime, timedelta
 
 def get_time_until(target_time):
     """Calculate and format the time until a target time"""
@@ -29,3 +43,83 @@ def get_time_until(target_time):
         return f"{hours}h {minutes}m"
     else:
         return f"{minutes}m"
+
+
+def get_times_until(targets, now=None):
+    """Format the time until many targets at once, like get_time_until.
+
+    Targets may be datetimes, "%Y-%m-%d %H:%M:%S" strings or Unix times; the
+    result is an array of strings in the same order.
+    """
+    now = now if now is not None else datetime.now()
+    if isinstance(now, datetime):
+        now = now.timestamp()
+    values = np.asarray(targets)
+    if values.dtype.kind in "iuf":
+        seconds = values.astype(np.float64) - now
+    else:
+        parsed = pd.to_datetime(pd.Series(values, dtype=object), format="%Y-%m-%d %H:%M:%S", errors="coerce")
+        seconds = ((parsed - pd.Timestamp.fromtimestamp(now)).dt.total_seconds()).to_numpy(dtype=np.float64)
+    invalid = np.isnan(seconds)
+    seconds = np.where(invalid, 0, seconds)
+    past = seconds < 0
+
+    total = np.maximum(seconds, 0).astype(np.int64)
+    days, hours, minutes = total // 86400, total % 86400 // 3600, total % 3600 // 60
+    result = np.array([
+        f"{d}d {h}h" if d > 0 else f"{h}h {m}m" if h > 0 else f"{m}m"
+        for d, h, m in zip(days.tolist(), hours.tolist(), minutes.tolist())
+    ], dtype=object)
+    result[past] = "Past"
+    result[invalid] = "Invalid time format"
+    return result
+
+
+def academic_calendar(year):
+    """Return the calendar entries for a year with concrete start/end dates"""
+    return [
+        dict(entry, start=date(year, *entry["start"]), end=date(year, *entry["end"]))
+        for entry in ACADEMIC_CALENDAR
+    ]
+
+
+def current_term(day=None):
+    """Return the term containing a date, or the last one to end before it"""
+    day = day or date.today()
+    terms = [
+        entry for year in (day.year - 1, day.year)
+        for entry in academic_calendar(year) if entry["kind"] == "term" and entry["start"] <= day
+    ]
+    return max(terms, key=lambda entry: entry["start"])
+
+
+def class_days(first, last):
+    """Return the term days outside breaks in [first, last] as days since the epoch"""
+    start = (first - _EPOCH).days
+    days = np.arange(start, (last - _EPOCH).days + 1, dtype=np.int32)
+    in_term = np.zeros(len(days), dtype=bool)
+    on_break = np.zeros(len(days), dtype=bool)
+    for year in range(first.year, last.year + 1):
+        for entry in academic_calendar(year):
+            lo = (entry["start"] - _EPOCH).days - start
+            hi = (entry["end"] - _EPOCH).days - start + 1
+            if entry["kind"] == "term":
+                in_term[max(lo, 0):max(hi, 0)] = True
+            elif entry["kind"] == "break":
+                on_break[max(lo, 0):max(hi, 0)] = True
+    return days[in_term & ~on_break]
+
+
+def weekday_of(days):
+    """Return the weekday (Monday = 0) of days since the epoch"""
+    return (np.asarray(days) + 3) % 7  # 1970-01-01 was a Thursday
+
+
+def midnight_timestamps(days):
+    """Return the local Unix time of midnight for each day since the epoch"""
+    unique, positions = np.unique(np.asarray(days), return_inverse=True)
+    midnights = np.array(
+        [datetime.combine(date.fromordinal(_EPOCH.toordinal() + int(d)), time()).timestamp() for d in unique],
+        dtype=np.int64
+    )
+    return midnights[positions]